@@ -0,0 +1,19 @@
+"""
+pytest configuration for the Django project
+
+Puts the bundled RAG-Anything package on the path and sets up Django so the
+backend's tests can import raganything and the models. Run from this directory
+with `python -m pytest rag_backend/tests`.
+"""
+
+import os
+import sys
+
+import django
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "rag_backend", "RAG-Anything")
+)
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "rag_project.settings")
+django.setup()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Query Load Test for the RAG backend
+
+Sends concurrent POST requests to /api/query_document/ and reports throughput
+and latency percentiles per concurrency level. Run it against the backend served
+under ASGI and under the development server to compare how concurrent queries
+are handled:
+
+    uvicorn rag_project.asgi:application --port 8000
+    python manage.py runserver 8000
+
+Usage:
+    python load_test_queries.py
+    python load_test_queries.py --url http://localhost:8000 --concurrency 1 4 16 --requests 64
+"""
+
+import argparse
+import asyncio
+import concurrent.futures
+import statistics
+import sys
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+DEFAULT_QUERIES = [
+    "What is the main topic of the documents?",
+    "Summarize the key findings.",
+    "Which tables are described in the documents?",
+    "What methods are mentioned?",
+]
+
+
+def send_query(url: str, query: str, mode: str, timeout: float) -> float:
+    """POST one query and return its latency in seconds"""
+    data = urllib.parse.urlencode({"query": query, "mode": mode}).encode()
+    started = time.perf_counter()
+    with urllib.request.urlopen(url, data=data, timeout=timeout) as response:
+        response.read()
+    return time.perf_counter() - started
+
+
+async def run_level(
+    url: str, queries: list, mode: str, concurrency: int, total: int, timeout: float
+) -> dict:
+    """Send `total` queries with at most `concurrency` in flight"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, errors = [], []
+
+    async def worker(index: int):
+        async with semaphore:
+            query = queries[index % len(queries)]
+            try:
+                latencies.append(
+                    await asyncio.to_thread(send_query, url, query, mode, timeout)
+                )
+            except (urllib.error.URLError, OSError) as e:
+                errors.append(str(e))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(total)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    result = {
+        "concurrency": concurrency,
+        "ok": len(latencies),
+        "errors": len(errors),
+        "elapsed": elapsed,
+        "throughput": len(latencies) / elapsed if elapsed else 0.0,
+        "first_error": errors[0] if errors else None,
+    }
+    if latencies:
+        result["p50"] = statistics.median(latencies)
+        result["p95"] = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        result["max"] = latencies[-1]
+    return result
+
+
+async def main_async(args) -> int:
+    url = args.url.rstrip("/") + "/api/query_document/"
+    queries = args.query or DEFAULT_QUERIES
+    # Requests block a worker thread each; size the pool for the highest level
+    asyncio.get_running_loop().set_default_executor(
+        concurrent.futures.ThreadPoolExecutor(max(args.concurrency))
+    )
+
+    # The first query builds the RAG instance; keep it out of the measurements
+    print(f"Warming up {url} ...")
+    try:
+        await asyncio.to_thread(send_query, url, queries[0], args.mode, args.timeout)
+    except (urllib.error.URLError, OSError) as e:
+        print(f"❌ Warm-up query failed: {e}")
+        return 1
+
+    print(
+        f"{'concurrency':>11} {'ok':>5} {'errors':>6} {'req/s':>8} "
+        f"{'p50 (s)':>8} {'p95 (s)':>8} {'max (s)':>8} {'speedup':>8}"
+    )
+    baseline = None
+    for concurrency in args.concurrency:
+        total = max(args.requests, concurrency)
+        result = await run_level(
+            url, queries, args.mode, concurrency, total, args.timeout
+        )
+        if not result["ok"]:
+            print(
+                f"{concurrency:>11} all {total} requests failed: {result['first_error']}"
+            )
+            continue
+        # Throughput relative to the first level; staying near 1.0x as
+        # concurrency grows means the server handles queries one at a time
+        baseline = baseline or result["throughput"]
+        print(
+            f"{concurrency:>11} {result['ok']:>5} {result['errors']:>6} "
+            f"{result['throughput']:>8.2f} {result['p50']:>8.2f} "
+            f"{result['p95']:>8.2f} {result['max']:>8.2f} "
+            f"{result['throughput'] / baseline:>7.1f}x"
+        )
+    return 0
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Load test the query endpoint")
+    parser.add_argument(
+        "--url", default="http://localhost:8000", help="Backend base URL"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        nargs="+",
+        default=[1, 4, 16],
+        help="Concurrency levels to measure",
+    )
+    parser.add_argument(
+        "--requests", type=int, default=32, help="Requests per concurrency level"
+    )
+    parser.add_argument("--mode", default="hybrid", help="Query mode")
+    parser.add_argument(
+        "--query", action="append", help="Query text (repeatable, cycled through)"
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=300.0, help="Per-request timeout in seconds"
+    )
+    args = parser.parse_args()
+    return asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
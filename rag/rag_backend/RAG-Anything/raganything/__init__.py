@@ -1,8 +1,32 @@
-from .raganything import RAGAnything as RAGAnything
-from .config import RAGAnythingConfig as RAGAnythingConfig
+from typing import TYPE_CHECKING
 
 __version__ = "1.2.8"
 __author__ = "Zirui Guo"
 __url__ = "https://github.com/HKUDS/RAG-Anything"
 
 __all__ = ["RAGAnything", "RAGAnythingConfig"]
+
+if TYPE_CHECKING:
+    from .raganything import RAGAnything as RAGAnything
+    from .config import RAGAnythingConfig as RAGAnythingConfig
+
+# Public names are imported on first access, so importing a submodule such as
+# raganything.parser does not load LightRAG and the processing pipeline
+_LAZY_IMPORTS = {
+    "RAGAnything": ".raganything",
+    "RAGAnythingConfig": ".config",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        import importlib
+
+        value = getattr(importlib.import_module(_LAZY_IMPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_IMPORTS))
@@ -0,0 +1,500 @@
+"""
+Cache helpers for RAGAnything
+
+Contains bookkeeping for the parse result cache, the persistent cache of
+multimodal descriptions and per-ingestion memos of derived chunk values
+"""
+
+import copy
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, Any, Callable, Hashable, List, Optional, Tuple, Union
+
+from lightrag.utils import logger, compute_mdhash_id
+
+
+@dataclass
+class ParseCacheStats:
+    """Hit/miss counters for the parse result cache"""
+
+    path_hits: int = 0
+    """Lookups answered by the path + mtime tier."""
+
+    content_hits: int = 0
+    """Lookups answered by the content hash tier."""
+
+    misses: int = 0
+    """Lookups that required a full parse."""
+
+    precheck_rejects: int = 0
+    """Content tier lookups rejected by the size + head/tail pre-check without hashing."""
+
+    hashed_bytes: int = 0
+    """Total bytes streamed through the content hasher."""
+
+    @property
+    def hits(self) -> int:
+        return self.path_hits + self.content_hits
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Export counters as a plain dictionary"""
+        stats = asdict(self)
+        stats["hits"] = self.hits
+        stats["hit_rate"] = self.hit_rate
+        return stats
+
+
+class DescriptionCache:
+    """
+    Persistent LRU cache of multimodal descriptions
+
+    Maps a key derived from the item content, the prompt and the model to the
+    (description, entity_info) pair a modal processor produced for it, so that
+    repeated logos, figures and boilerplate tables are described only once.
+    Entries expire after ttl_seconds and the least recently used entries are
+    evicted beyond max_entries. The cache is kept in memory and written to a JSON
+    file by flush().
+    """
+
+    def __init__(
+        self,
+        cache_file: Optional[Union[str, Path]] = None,
+        max_entries: int = 10000,
+        ttl_seconds: Optional[float] = None,
+        context_sensitive: bool = False,
+    ):
+        """
+        Initialize description cache
+
+        Args:
+            cache_file: JSON file the cache is loaded from and flushed to, None for memory only
+            max_entries: Maximum number of cached descriptions
+            ttl_seconds: Entry lifetime in seconds, None or 0 for no expiry
+            context_sensitive: Whether the extracted surrounding context is part of the key
+        """
+        self.cache_file = Path(cache_file) if cache_file else None
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds or None
+        self.context_sensitive = context_sensitive
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._dirty = False
+        self._load()
+
+    @staticmethod
+    def content_hash(content: Union[str, bytes]) -> str:
+        """Hash the content an item is described from (image bytes, table body, LaTeX)"""
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        return hashlib.sha256(content).hexdigest()
+
+    def make_key(
+        self,
+        content_hash: str,
+        prompt_fields: Dict[str, Any],
+        model_id: str,
+        context: str = "",
+    ) -> str:
+        """
+        Build the cache key of an item
+
+        Args:
+            content_hash: Hash of the described content
+            prompt_fields: Prompt template and its arguments, without file paths
+            model_id: Identifier of the model producing the description
+            context: Extracted surrounding context, only used when context_sensitive
+
+        Returns:
+            str: Cache key
+        """
+        payload = {
+            "content": content_hash,
+            "prompt": prompt_fields,
+            "model": model_id,
+            "context": context if self.context_sensitive else None,
+        }
+        return hashlib.sha256(
+            json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Look up a cached description
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Optional[Tuple[str, Dict[str, Any]]]: (description, entity_info) or None
+        """
+        entry = self._entries.get(key)
+        if entry is not None and self._expired(entry):
+            del self._entries[key]
+            self._dirty = True
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry["description"], copy.deepcopy(entry["entity_info"])
+
+    def put(self, key: str, description: str, entity_info: Dict[str, Any]) -> None:
+        """
+        Store a description, evicting the least recently used entries if full
+
+        Args:
+            key: Cache key
+            description: Generated description
+            entity_info: Generated entity information
+        """
+        self._entries[key] = {
+            "description": description,
+            "entity_info": copy.deepcopy(entity_info),
+            "created_at": time.time(),
+        }
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self._dirty = True
+
+    def snapshot(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Take the entries to persist, if the cache changed since the last snapshot
+
+        Call it from the thread using the cache; write() can then persist the
+        snapshot from another thread while the cache keeps changing.
+
+        Returns:
+            Optional[Dict[str, Dict[str, Any]]]: Unexpired entries, or None if
+            there is nothing to write
+        """
+        if not self._dirty or self.cache_file is None:
+            return None
+
+        # Drop expired entries rather than persisting them
+        for key in [k for k, v in self._entries.items() if self._expired(v)]:
+            del self._entries[key]
+
+        self._dirty = False
+        return dict(self._entries)
+
+    def write(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Write a snapshot to the cache file
+
+        Args:
+            entries: Entries returned by snapshot()
+        """
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.cache_file.with_suffix(self.cache_file.suffix + ".tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(entries, f, ensure_ascii=False)
+            os.replace(tmp_file, self.cache_file)
+        except Exception:
+            # Write the snapshot's entries with the next flush
+            self._dirty = True
+            raise
+
+    def flush(self) -> None:
+        """Write the cache to its file if it changed since the last flush"""
+        entries = self.snapshot()
+        if entries is not None:
+            self.write(entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache size and hit/miss counters"""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _expired(self, entry: Dict[str, Any]) -> bool:
+        return (
+            self.ttl_seconds is not None
+            and time.time() - entry.get("created_at", 0) > self.ttl_seconds
+        )
+
+    def _load(self) -> None:
+        if self.cache_file is None or not self.cache_file.exists():
+            return
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Could not load description cache {self.cache_file}: {e}")
+            return
+
+        # Entries are flushed in LRU order, least recently used first
+        for key, entry in entries.items():
+            if not self._expired(entry):
+                self._entries[key] = entry
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+@dataclass
+class ImageDedupStats:
+    """Counters for perceptual-hash deduplication of images"""
+
+    clustered_images: int = 0
+    """Images grouped into near-duplicate clusters within documents."""
+
+    clusters: int = 0
+    """Clusters whose representative was captioned."""
+
+    within_document_calls_saved: int = 0
+    """Caption calls skipped by fanning a representative's result out to its cluster."""
+
+    cross_document_calls_saved: int = 0
+    """Caption calls skipped by reusing a near-duplicate described earlier in the working dir."""
+
+    @property
+    def calls_saved(self) -> int:
+        return self.within_document_calls_saved + self.cross_document_calls_saved
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Export counters as a plain dictionary"""
+        stats = asdict(self)
+        stats["calls_saved"] = self.calls_saved
+        return stats
+
+
+class ImageHashIndex:
+    """
+    Nearest-neighbour index of 64-bit perceptual image hashes
+
+    Hashes are split into 8 bands of 8 bits (locality-sensitive hashing by
+    banding). Two hashes within Hamming distance 7 share at least one band, so
+    only images bucketed under a matching band are compared exactly. Each entry
+    carries a group key, and queries only match entries with the same key, plus a
+    payload such as the image's description. The index can be persisted to a JSON
+    file with flush().
+    """
+
+    BANDS = 8
+    BAND_BITS = 8
+
+    def __init__(
+        self,
+        index_file: Optional[Union[str, Path]] = None,
+        max_entries: int = 10000,
+    ):
+        """
+        Initialize image hash index
+
+        Args:
+            index_file: JSON file the index is loaded from and flushed to, None for memory only
+            max_entries: Maximum number of entries; the oldest are dropped beyond it
+        """
+        self.index_file = Path(index_file) if index_file else None
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._buckets: Dict[Tuple[int, int], set] = {}
+        self._next_id = 0
+        self._dirty = False
+        self._load()
+
+    def _bands(self, image_hash: int):
+        mask = (1 << self.BAND_BITS) - 1
+        for band in range(self.BANDS):
+            yield band, (image_hash >> (band * self.BAND_BITS)) & mask
+
+    def add(self, image_hash: int, group: str = "", payload: Any = None) -> int:
+        """
+        Add an image hash
+
+        Args:
+            image_hash: 64-bit perceptual hash
+            group: Key that queries must match, e.g. a hash of the prompt fields
+            payload: Data returned by matching queries
+
+        Returns:
+            int: Entry id
+        """
+        entry_id = self._next_id
+        self._next_id += 1
+        self._entries[entry_id] = {
+            "hash": image_hash,
+            "group": group,
+            "payload": payload,
+            "created_at": time.time(),
+        }
+        for band in self._bands(image_hash):
+            self._buckets.setdefault(band, set()).add(entry_id)
+
+        while len(self._entries) > self.max_entries:
+            old_id, old_entry = self._entries.popitem(last=False)
+            for band in self._bands(old_entry["hash"]):
+                self._buckets.get(band, set()).discard(old_id)
+        self._dirty = True
+        return entry_id
+
+    def query(
+        self, image_hash: int, max_distance: int, group: str = ""
+    ) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """
+        Find the closest indexed hash within max_distance
+
+        Args:
+            image_hash: 64-bit perceptual hash
+            max_distance: Maximum Hamming distance of a match
+            group: Only entries added with this group key match
+
+        Returns:
+            Optional[Tuple[int, Dict[str, Any]]]: (entry id, entry) of the closest match, or None
+        """
+        if max_distance < self.BANDS:
+            candidates = set()
+            for band in self._bands(image_hash):
+                candidates |= self._buckets.get(band, set())
+        else:
+            # Banding only guarantees recall below BANDS differing bits
+            candidates = set(self._entries)
+
+        best = None
+        best_distance = max_distance + 1
+        for entry_id in candidates:
+            entry = self._entries[entry_id]
+            if entry["group"] != group:
+                continue
+            distance = bin(entry["hash"] ^ image_hash).count("1")
+            if distance < best_distance:
+                best, best_distance = entry_id, distance
+        return (best, self._entries[best]) if best is not None else None
+
+    def snapshot(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        Take the entries to persist, if the index changed since the last snapshot
+
+        Like DescriptionCache.snapshot(), call it from the thread using the index.
+
+        Returns:
+            Optional[List[Dict[str, Any]]]: Entries, or None if there is nothing to write
+        """
+        if not self._dirty or self.index_file is None:
+            return None
+        self._dirty = False
+        return list(self._entries.values())
+
+    def write(self, entries: List[Dict[str, Any]]) -> None:
+        """
+        Write a snapshot to the index file
+
+        Args:
+            entries: Entries returned by snapshot()
+        """
+        try:
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.index_file.with_suffix(self.index_file.suffix + ".tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(entries, f, ensure_ascii=False)
+            os.replace(tmp_file, self.index_file)
+        except Exception:
+            self._dirty = True
+            raise
+
+    def flush(self) -> None:
+        """Write the index to its file if it changed since the last flush"""
+        entries = self.snapshot()
+        if entries is not None:
+            self.write(entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _load(self) -> None:
+        if self.index_file is None or not self.index_file.exists():
+            return
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Could not load image hash index {self.index_file}: {e}")
+            return
+        for entry in entries:
+            entry_id = self.add(
+                entry["hash"], entry.get("group", ""), entry.get("payload")
+            )
+            self._entries[entry_id]["created_at"] = entry.get("created_at", 0)
+        self._dirty = False
+
+
+class IngestionMemo:
+    """Memo of values derived from chunk text during one ingestion
+
+    Stages that format, hash or tokenize the same multimodal chunk read the value
+    computed by the first stage instead of recomputing it.
+    """
+
+    def __init__(self, tokenizer=None):
+        """Initialize the memo
+
+        Args:
+            tokenizer: Tokenizer used for token counts (LightRAG tokenizer)
+        """
+        self.tokenizer = tokenizer
+        self._chunks: Dict[Hashable, Tuple[str, str]] = {}
+        self._tokens: Dict[str, List[int]] = {}
+        self._hashes: Dict[Tuple[str, str], str] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def chunk(self, key: Hashable, render: Callable[[], str]) -> Tuple[str, str]:
+        """Templated chunk content and chunk ID of one item
+
+        Args:
+            key: Identifies the item within the ingestion
+            render: Formats the chunk content on first use
+
+        Returns:
+            Tuple of (chunk content, chunk ID)
+        """
+        entry = self._chunks.get(key)
+        if entry is None:
+            self.misses += 1
+            content = render()
+            entry = (content, self.mdhash(content, prefix="chunk-"))
+            self._chunks[key] = entry
+        else:
+            self.hits += 1
+        return entry
+
+    def mdhash(self, content: str, prefix: str = "") -> str:
+        """Memoized compute_mdhash_id"""
+        key = (prefix, content)
+        if key not in self._hashes:
+            self._hashes[key] = compute_mdhash_id(content, prefix=prefix)
+        return self._hashes[key]
+
+    def encode(self, text: str) -> List[int]:
+        """Memoized tokenizer.encode"""
+        tokens = self._tokens.get(text)
+        if tokens is None:
+            tokens = self.tokenizer.encode(text)
+            self._tokens[text] = tokens
+        return tokens
+
+    def count_tokens(self, text: str) -> int:
+        """Token count of a text"""
+        return len(self.encode(text))
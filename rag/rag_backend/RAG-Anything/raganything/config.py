@@ -34,6 +34,62 @@ class RAGAnythingConfig:
     )
     """Whether to display content statistics during parsing."""
 
+    """Seconds before a MinerU parse is killed (0 for no limit, not applied in the parser worker pool)."""
+    """Seconds before a MinerU PDF parse is killed (0 for no limit)."""
+
+    use_parser_worker_pool: bool = field(
+        default=get_env_value("USE_PARSER_WORKER_POOL", False, bool)
+    )
+    """Run parsing on persistent worker processes that keep parser models loaded."""
+
+    parser_pool_workers: int = field(
+        default=get_env_value("PARSER_POOL_WORKERS", 1, int)
+    )
+    """Number of persistent parser worker processes."""
+
+    pdf_shard_pages: int = field(default=get_env_value("PDF_SHARD_PAGES", 50, int))
+    """Pages per shard when splitting large PDFs for parallel MinerU parsing (0 disables sharding)."""
+
+    pdf_shard_min_pages: int = field(
+        default=get_env_value("PDF_SHARD_MIN_PAGES", 200, int)
+    )
+    """Minimum page count before a PDF is split into shards."""
+
+    pdf_shard_workers: int = field(default=get_env_value("PDF_SHARD_WORKERS", 2, int))
+    """Maximum number of PDF shards parsed concurrently."""
+
+    # Parse Cache Configuration
+    # ---
+    enable_content_hash_cache: bool = field(
+        default=get_env_value("ENABLE_CONTENT_HASH_CACHE", True, bool)
+    )
+    """Reuse cached parse results for files with identical bytes, regardless of their path or mtime."""
+
+    parse_cache_backend: str = field(
+        default=get_env_value("PARSE_CACHE_BACKEND", "auto", str)
+    )
+    """Parse cache storage: 'sqlite' (one row per entry), 'kv' (LightRAG KV storage) or 'auto' (sqlite unless LightRAG uses a non-JSON KV storage)."""
+
+    parse_cache_segment_max_mb: int = field(
+        default=get_env_value("PARSE_CACHE_SEGMENT_MAX_MB", 256, int)
+    )
+    """Size in MiB after which the sqlite parse cache starts a new content list segment file."""
+
+    # Tracing and Metrics Configuration
+    # ---
+    enable_metrics: bool = field(default=get_env_value("ENABLE_METRICS", True, bool))
+    """Record model call counts and latencies for the Prometheus metrics of render_metrics()."""
+
+    max_ingestion_traces: int = field(
+        default=get_env_value("MAX_INGESTION_TRACES", 100, int)
+    )
+    """Number of recent per-document ingestion traces kept in memory."""
+
+    ingestion_trace_file: str = field(
+        default=get_env_value("INGESTION_TRACE_FILE", "", str)
+    )
+    """JSON lines file receiving OpenTelemetry-compatible span records of each ingestion (empty disables export)."""
+
     # Multimodal Processing Configuration
     # ---
     enable_image_processing: bool = field(
@@ -72,6 +128,69 @@ class RAGAnythingConfig:
     )
     """Whether to recursively process subfolders in batch mode."""
 
+    # Streaming Ingestion Configuration
+    # ---
+    enable_streaming_ingestion: bool = field(
+        default=get_env_value("ENABLE_STREAMING_INGESTION", False, bool)
+    )
+    """Generate multimodal descriptions while the document is still being parsed (page-sharded MinerU PDFs; other documents overlap descriptions with text insertion only)."""
+
+    streaming_queue_size: int = field(
+        default=get_env_value("STREAMING_QUEUE_SIZE", 16, int)
+    )
+    """Maximum number of parsed multimodal items waiting for description generation; when full, no further PDF shard is parsed."""
+
+    # Description Cache Configuration
+    # ---
+    enable_description_cache: bool = field(
+        default=get_env_value("ENABLE_DESCRIPTION_CACHE", True, bool)
+    )
+    """Reuse generated multimodal descriptions for identical content, prompt and model."""
+
+    description_cache_max_entries: int = field(
+        default=get_env_value("DESCRIPTION_CACHE_MAX_ENTRIES", 10000, int)
+    )
+    """Maximum number of cached descriptions; least recently used entries are evicted."""
+
+    description_cache_ttl: int = field(
+        default=get_env_value("DESCRIPTION_CACHE_TTL", 30 * 24 * 3600, int)
+    )
+    """Seconds a cached description stays valid (0 for no expiry)."""
+
+    description_cache_context_sensitive: bool = field(
+        default=get_env_value("DESCRIPTION_CACHE_CONTEXT_SENSITIVE", False, bool)
+    )
+    """Include the surrounding document context in cache keys; when False identical items share descriptions across documents."""
+
+    description_cache_model_id: str = field(
+        default=get_env_value("DESCRIPTION_CACHE_MODEL_ID", "", str)
+    )
+    """Model identifier used in cache keys; defaults to the LightRAG model name and caption function name."""
+
+    # Image Deduplication Configuration
+    # ---
+    enable_image_dedup: bool = field(
+        default=get_env_value("ENABLE_IMAGE_DEDUP", True, bool)
+    )
+    """Caption near-identical images (by perceptual hash) with the same caption and footnote once and reuse the description."""
+
+    image_dedup_threshold: int = field(
+        default=get_env_value("IMAGE_DEDUP_THRESHOLD", 4, int)
+    )
+    """Maximum Hamming distance between 64-bit image hashes to treat images as near-duplicates."""
+
+    # Image Caption Batching Configuration
+    # ---
+    image_caption_batch_size: int = field(
+        default=get_env_value("IMAGE_CAPTION_BATCH_SIZE", 1, int)
+    )
+    """Maximum number of images described by one multi-image vision model request (1 disables batching; larger values need a caption function honouring messages=)."""
+
+    image_caption_batch_max_bytes: int = field(
+        default=get_env_value("IMAGE_CAPTION_BATCH_MAX_BYTES", 8 * 1024 * 1024, int)
+    )
+    """Maximum base64 image payload of one multi-image request, in bytes."""
+
     # Context Extraction Configuration
     # ---
     context_window: int = field(default=get_env_value("CONTEXT_WINDOW", 1, int))
@@ -103,6 +222,18 @@ class RAGAnythingConfig:
     content_format: str = field(default=get_env_value("CONTENT_FORMAT", "minerU", str))
     """Default content format for context extraction when processing documents."""
 
+    # Document Status Configuration
+    # ---
+    enable_doc_status_buffer: bool = field(
+        default=get_env_value("ENABLE_DOC_STATUS_BUFFER", True, bool)
+    )
+    """Coalesce doc_status updates in a journaled write-behind buffer instead of rewriting the store per update."""
+
+    doc_status_flush_interval: float = field(
+        default=get_env_value("DOC_STATUS_FLUSH_INTERVAL", 2.0, float)
+    )
+    """Seconds between background flushes of buffered doc_status updates (0 flushes only at document end)."""
+
     def __post_init__(self):
         """Post-initialization setup for backward compatibility"""
         # Support legacy environment variable names for backward compatibility
@@ -0,0 +1,346 @@
+"""
+Process-wide metrics for RAGAnything
+
+Counters, gauges and histograms rendered in the Prometheus text exposition
+format, without depending on prometheus_client. Model calls, parser runs,
+multimodal query cache lookups and ingestion stage durations are recorded as
+they happen; cache statistics kept elsewhere are added at scrape time through
+RAGAnything.render_metrics().
+"""
+
+import bisect
+import functools
+import inspect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Callable, Iterator, List, Optional, Sequence, Tuple
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+
+def _escape_label_value(value: Any) -> str:
+    """Escape backslashes, quotes and newlines in a label value"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, Any]) -> str:
+    """Render a label set as {name="value",...}"""
+    if not labels:
+        return ""
+    pairs = (f'{name}="{_escape_label_value(value)}"' for name, value in labels.items())
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """Base class of labelled metrics"""
+
+    metric_type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], Any] = {}
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}"
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        """Render the metric in the Prometheus text format"""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.metric_type}",
+        ]
+        for name, labels, value in self._samples():
+            lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+
+    metric_type = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        return [(self.name, dict(zip(self.labelnames, key)), v) for key, v in items]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down"""
+
+    metric_type = "gauge"
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    @contextmanager
+    def track_inprogress(self, **labels) -> Iterator[None]:
+        """Count the enclosed block as in progress"""
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+    def _samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        return [(self.name, dict(zip(self.labelnames, key)), v) for key, v in items]
+
+
+class Histogram(_Metric):
+    """Distribution of observed values over cumulative buckets"""
+
+    metric_type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {
+                    "counts": [0] * (len(self.buckets) + 1),
+                    "sum": 0.0,
+                    "count": 0,
+                }
+            state["counts"][bisect.bisect_left(self.buckets, value)] += 1
+            state["sum"] += value
+            state["count"] += 1
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """Observe the duration of the enclosed block"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def _samples(self):
+        samples = []
+        with self._lock:
+            items = [(key, dict(state)) for key, state in self._values.items()]
+        for key, state in items:
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), state["counts"]):
+                cumulative += count
+                samples.append(
+                    (
+                        f"{self.name}_bucket",
+                        {**labels, "le": _format_value(bound)},
+                        cumulative,
+                    )
+                )
+            samples.append((f"{self.name}_sum", labels, state["sum"]))
+            samples.append((f"{self.name}_count", labels, state["count"]))
+        return samples
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames=()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames=()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text format"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+def render_gauges(
+    name: str, documentation: str, samples: List[Tuple[Dict[str, str], float]]
+) -> str:
+    """Render values read at scrape time as a gauge family
+
+    Args:
+        name: Metric name
+        documentation: Help text
+        samples: (labels, value) pairs
+    """
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} gauge"]
+    for labels, value in samples:
+        lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+MODEL_CALLS = REGISTRY.counter(
+    "raganything_model_calls_total",
+    "LLM and VLM calls by model role and outcome.",
+    ("model", "status"),
+)
+MODEL_CALL_SECONDS = REGISTRY.histogram(
+    "raganything_model_call_seconds",
+    "LLM and VLM call latency in seconds.",
+    ("model",),
+)
+TOKENS = REGISTRY.counter(
+    "raganything_tokens_total",
+    "Tokens consumed by model calls that report usage.",
+    ("model", "kind"),
+)
+PARSES_IN_FLIGHT = REGISTRY.gauge(
+    "raganything_parses_in_flight",
+    "Document parser runs currently executing.",
+)
+PARSE_SECONDS = REGISTRY.histogram(
+    "raganything_parse_seconds",
+    "Document parser run duration in seconds.",
+    ("method",),
+)
+# Rendered by RAGAnything.render_metrics() together with the counters of the
+# parse, description and LLM response caches, which are kept elsewhere
+CACHE_REQUESTS = Counter(
+    "raganything_cache_requests_total",
+    "Cache lookups by cache and result.",
+    ("cache", "result"),
+)
+INGESTION_STAGE_SECONDS = REGISTRY.histogram(
+    "raganything_ingestion_stage_seconds",
+    "Duration of ingestion trace spans in seconds, by stage.",
+    ("stage",),
+)
+QUERY_FIRST_CHUNK_SECONDS = REGISTRY.histogram(
+    "raganything_query_first_chunk_seconds",
+    "Time from the start of a streaming query to its first answer chunk in seconds.",
+    ("mode",),
+)
+
+
+class TokenUsageMetrics:
+    """Token tracker feeding TOKENS, accepted as token_tracker by LightRAG's LLM helpers"""
+
+    def __init__(self, model: str):
+        self.model = model
+
+    def add_usage(self, token_counts: Dict[str, int]):
+        """Record the usage reported for one call"""
+        for kind in ("prompt_tokens", "completion_tokens"):
+            if token_counts.get(kind):
+                TOKENS.inc(token_counts[kind], model=self.model, kind=kind)
+
+
+def instrument_model_func(func: Optional[Callable], model: str) -> Optional[Callable]:
+    """Wrap a model function to count its calls and observe their latency
+
+    Works for coroutine functions, sync functions and sync functions returning
+    awaitables; the wrapper keeps the original calling convention and qualname.
+
+    Args:
+        func: Model function (None is returned unchanged)
+        model: Model role label, e.g. "llm" or "vlm"
+    """
+    if func is None or getattr(func, "__raganything_metrics__", False):
+        return func
+
+    def record(started: float, status: str):
+        MODEL_CALLS.inc(model=model, status=status)
+        MODEL_CALL_SECONDS.observe(time.perf_counter() - started, model=model)
+
+    async def observe(awaitable, started: float):
+        try:
+            result = await awaitable
+        except BaseException:
+            record(started, "error")
+            raise
+        record(started, "ok")
+        return result
+
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            return await observe(func(*args, **kwargs), time.perf_counter())
+
+    else:
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except BaseException:
+                record(started, "error")
+                raise
+            if inspect.isawaitable(result):
+                return observe(result, started)
+            record(started, "ok")
+            return result
+
+    wrapper.__raganything_metrics__ = True
+    return wrapper
@@ -10,12 +10,15 @@ Includes:
 """
 
 import re
+import copy
 import json
 import time
 import base64
-from typing import Dict, Any, Tuple, List
+import asyncio
+from typing import Dict, Any, Tuple, List, Optional, Union, Callable
 from pathlib import Path
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from collections import OrderedDict
 
 from lightrag.utils import (
     logger,
@@ -28,6 +31,9 @@ from lightrag.operate import extract_entities, merge_nodes_and_edges
 
 # Import prompt templates
 from raganything.prompt import PROMPTS
+from raganything.cache import DescriptionCache, ImageHashIndex
+from raganything.utils import compute_image_dhash
+from raganything.tracing import trace_span
 
 
 @dataclass
@@ -46,9 +52,23 @@ class ContextConfig:
             self.filter_content_types = ["text"]
 
 
+@dataclass
+class PageContextIndex:
+    """Page index of a content list, built once and extended as the list grows"""
+
+    source: List[Dict]
+    indexed_count: int = 0  # Number of leading content list items indexed
+    page_texts: Dict[int, List[str]] = field(default_factory=dict)
+    page_token_counts: Dict[int, List[int]] = field(default_factory=dict)
+    memo: Dict[Tuple[int, int, int], str] = field(default_factory=dict)
+
+
 class ContextExtractor:
     """Universal context extractor supporting multiple content source formats"""
 
+    # Content lists indexed at the same time (documents processed concurrently)
+    MAX_INDEXED_SOURCES = 8
+
     def __init__(self, config: ContextConfig = None, tokenizer=None):
         """Initialize context extractor
 
@@ -58,6 +78,112 @@ class ContextExtractor:
         """
         self.config = config or ContextConfig()
         self.tokenizer = tokenizer
+        self._page_indexes: "OrderedDict[int, PageContextIndex]" = OrderedDict()
+
+    def index_content_source(self, content_source: Any, content_format: str = "auto"):
+        """Build the page index of a content list ahead of context extraction
+
+        Args:
+            content_source: Source content for context extraction
+            content_format: Format of content source ("minerU", "text_chunks", "auto")
+        """
+        if (
+            isinstance(content_source, list)
+            and content_format in ("minerU", "auto")
+            and self.config.context_mode != "chunk"
+        ):
+            self._get_page_index(content_source)
+
+    def _get_page_index(self, content_list: List[Dict]) -> PageContextIndex:
+        """Get the page index of a content list, indexing items added since the last call
+
+        Args:
+            content_list: List of content items
+
+        Returns:
+            Page index of the content list
+        """
+        key = id(content_list)
+        index = self._page_indexes.get(key)
+        if (
+            index is None
+            or index.source is not content_list
+            or len(content_list) < index.indexed_count
+        ):
+            index = PageContextIndex(source=content_list)
+            self._page_indexes[key] = index
+            while len(self._page_indexes) > self.MAX_INDEXED_SOURCES:
+                self._page_indexes.popitem(last=False)
+        else:
+            self._page_indexes.move_to_end(key)
+
+        if len(content_list) > index.indexed_count:
+            self._index_new_items(index)
+        return index
+
+    def _index_new_items(self, index: PageContextIndex):
+        """Render the context text of items appended to an indexed content list
+
+        Args:
+            index: Page index to extend
+        """
+        changed_pages = set()
+        for item in index.source[index.indexed_count :]:
+            if item.get("type", "") not in self.config.filter_content_types:
+                continue
+            text_content = self._extract_text_from_item(item)
+            if text_content and text_content.strip():
+                item_page = item.get("page_idx", 0)
+                index.page_texts.setdefault(item_page, []).append(text_content)
+                index.page_token_counts.pop(item_page, None)
+                changed_pages.add(item_page)
+        index.indexed_count = len(index.source)
+
+        # Drop memoized contexts whose window covers a changed page
+        if changed_pages and index.memo:
+            index.memo = {
+                key: context
+                for key, context in index.memo.items()
+                if not any(
+                    key[0] - key[1] <= page <= key[0] + key[1] for page in changed_pages
+                )
+            }
+
+    def _get_page_token_counts(self, index: PageContextIndex, page: int) -> List[int]:
+        """Token counts of a page's context texts, computed once per page"""
+        if page not in index.page_token_counts:
+            index.page_token_counts[page] = [
+                self._count_tokens(text) for text in index.page_texts[page]
+            ]
+        return index.page_token_counts[page]
+
+    def _count_tokens(self, text: str) -> int:
+        """Count tokens with the tokenizer, or characters when none is available"""
+        if self.tokenizer:
+            return len(self.tokenizer.encode(text))
+        return len(text)
+
+    def _truncate_segment(self, text: str, max_tokens: int, keep_end: bool) -> str:
+        """Cut one context text to a token budget
+
+        Args:
+            text: Context text exceeding the budget
+            max_tokens: Tokens available for the text
+            keep_end: Keep the end of the text instead of its start
+
+        Returns:
+            Truncated text marked with "...", or "" if nothing fits
+        """
+        max_tokens -= self._count_tokens("...")
+        if max_tokens <= 0:
+            return ""
+        if self.tokenizer:
+            tokens = self.tokenizer.encode(text)
+            kept = tokens[-max_tokens:] if keep_end else tokens[:max_tokens]
+            truncated = self.tokenizer.decode(kept)
+        else:
+            truncated = text[-max_tokens:] if keep_end else text[:max_tokens]
+        return f"...{truncated}" if keep_end else f"{truncated}..."
 
     def extract_context(
         self,
@@ -145,30 +271,60 @@ class ContextExtractor:
         current_page = current_item_info.get("page_idx", 0)
         window_size = self.config.context_window
 
-        start_page = max(0, current_page - window_size)
-        end_page = current_page + window_size + 1
-
-        context_texts = []
-
-        for item in content_list:
-            item_page = item.get("page_idx", 0)
-            item_type = item.get("type", "")
-
-            # Check if item is within context window and matches filter criteria
-            if (
-                start_page <= item_page < end_page
-                and item_type in self.config.filter_content_types
-            ):
-                text_content = self._extract_text_from_item(item)
-                if text_content and text_content.strip():
-                    # Add page marker for better context understanding
-                    if item_page != current_page:
-                        context_texts.append(f"[Page {item_page}] {text_content}")
-                    else:
-                        context_texts.append(text_content)
-
-        context = "\n".join(context_texts)
-        return self._truncate_context(context)
+        # Items of the same window share one assembled context
+        index = self._get_page_index(content_list)
+        memo_key = (current_page, window_size, self.config.max_context_tokens)
+        if memo_key in index.memo:
+            return index.memo[memo_key]
+
+        # Fill the token budget with whole texts, closest pages first: the current
+        # page, then alternately the previous and next pages
+        remaining = self.config.max_context_tokens
+        selected: Dict[int, Dict[int, str]] = {}
+        for distance in range(window_size + 1):
+            pages = (
+                [current_page]
+                if distance == 0
+                else [current_page - distance, current_page + distance]
+            )
+            for item_page in pages:
+                page_texts = index.page_texts.get(item_page) if item_page >= 0 else None
+                if not page_texts or remaining <= 0:
+                    continue
+                token_counts = self._get_page_token_counts(index, item_page)
+
+                # Add page marker for better context understanding
+                marker = f"[Page {item_page}] " if item_page != current_page else ""
+                overhead = 1 + (self._count_tokens(marker) if marker else 0)
+
+                # On preceding pages the texts nearest the current page come last
+                keep_end = item_page < current_page
+                order = range(len(page_texts))
+                if keep_end:
+                    order = reversed(order)
+
+                kept = selected.setdefault(item_page, {})
+                for i in order:
+                    if token_counts[i] + overhead <= remaining:
+                        kept[i] = marker + page_texts[i]
+                        remaining -= token_counts[i] + overhead
+                        continue
+                    truncated = self._truncate_segment(
+                        page_texts[i], remaining - overhead, keep_end
+                    )
+                    if truncated:
+                        kept[i] = marker + truncated
+                    remaining = 0
+                    break
+
+        # Emit the kept texts in document order
+        context = "\n".join(
+            selected[item_page][i]
+            for item_page in sorted(selected)
+            for i in sorted(selected[item_page])
+        )
+        index.memo[memo_key] = context
+        return context
 
     def _extract_chunk_context(
         self, content_list: List[Dict], current_item_info: Dict
@@ -365,6 +521,8 @@ class BaseModalProcessor:
         lightrag: LightRAG,
         modal_caption_func,
         context_extractor: ContextExtractor = None,
+        description_cache: Optional[DescriptionCache] = None,
+        model_id: Optional[str] = None,
     ):
         """Initialize base processor
 
@@ -372,9 +530,20 @@ class BaseModalProcessor:
             lightrag: LightRAG instance
             modal_caption_func: Function for generating descriptions
             context_extractor: Context extractor instance
+            description_cache: Shared cache of generated descriptions
+            model_id: Identifier of the caption model, part of description cache keys
         """
         self.lightrag = lightrag
         self.modal_caption_func = modal_caption_func
+        self.description_cache = description_cache
+        self.model_id = model_id or getattr(
+            modal_caption_func, "__qualname__", type(modal_caption_func).__name__
+        )
+
+        # Near-duplicate image lookup, configured by ImageModalProcessor
+        self.image_hash_index: Optional[ImageHashIndex] = None
+        self.image_dedup_threshold = 0
+        self.near_duplicate_hits = 0
 
         # Use LightRAG's storage instances
         self.text_chunks_db = lightrag.text_chunks
@@ -412,6 +581,7 @@ class BaseModalProcessor:
         """
         self.content_source = content_source
         self.content_format = content_format
+        self.context_extractor.index_content_source(content_source, content_format)
         logger.info(f"Content source set with format: {content_format}")
 
     def _get_context_for_item(self, item_info: Dict[str, Any]) -> str:
@@ -439,6 +609,119 @@ class BaseModalProcessor:
             logger.error(f"Error getting context for item {item_info}: {e}")
             return ""
 
+    async def _caption_with_cache(
+        self,
+        content: Union[str, bytes],
+        prompt_fields: Dict[str, Any],
+        context: str,
+        parse_response: Callable[[str], Tuple[str, Dict[str, Any]]],
+        prompt: str,
+        perceptual_hash: Optional[int] = None,
+        **caption_kwargs,
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Call the caption model unless the description cache already holds the result
+
+        Args:
+            content: Content the description is generated from (image data, table body, LaTeX)
+            prompt_fields: Prompt template and arguments identifying the request, without file paths
+            context: Extracted surrounding context
+            parse_response: Turns the raw model response into (description, entity_info)
+            prompt: Rendered prompt sent to the model
+            perceptual_hash: Image dHash used to reuse descriptions of near-duplicate images
+            **caption_kwargs: Additional arguments for modal_caption_func
+
+        Returns:
+            Tuple of (description, entity_info)
+        """
+        prompt_fields = {
+            **prompt_fields,
+            "system_prompt": caption_kwargs.get("system_prompt"),
+        }
+        cached, cache_key, hash_group = self._lookup_description(
+            content, prompt_fields, context, perceptual_hash
+        )
+        if cached is not None:
+            return cached
+
+        response = await self.modal_caption_func(prompt, **caption_kwargs)
+        description, entity_info = parse_response(response)
+
+        # Parsers fall back to the raw response when it is malformed; don't keep those
+        if description != response:
+            self._store_description(
+                cache_key, hash_group, perceptual_hash, description, entity_info
+            )
+        return description, entity_info
+
+    def _lookup_description(
+        self,
+        content: Union[str, bytes],
+        prompt_fields: Dict[str, Any],
+        context: str,
+        perceptual_hash: Optional[int] = None,
+    ) -> Tuple[Optional[Tuple[str, Dict[str, Any]]], Optional[str], Optional[str]]:
+        """Look up a previously generated description
+
+        Args:
+            content: Content the description is generated from
+            prompt_fields: Prompt fields identifying the request, including the system prompt
+            context: Extracted surrounding context
+            perceptual_hash: Image dHash used to reuse descriptions of near-duplicate images
+
+        Returns:
+            Tuple of (cached (description, entity_info) or None, description cache key,
+            near-duplicate index group), the latter two for storing a new description
+        """
+        cache_key = None
+        if self.description_cache is not None:
+            cache_key = self.description_cache.make_key(
+                self.description_cache.content_hash(content),
+                prompt_fields,
+                self.model_id,
+                context,
+            )
+            cached = self.description_cache.get(cache_key)
+            if cached is not None:
+                logger.debug(
+                    f"Description cache hit for {prompt_fields.get('template')}"
+                )
+                return cached, cache_key, None
+
+        # Near-duplicate images described before under the same prompt and model
+        hash_group = None
+        if perceptual_hash is not None and self.image_hash_index is not None:
+            hash_group = DescriptionCache.content_hash(
+                json.dumps([prompt_fields, self.model_id], sort_keys=True, default=str)
+            )
+            match = self.image_hash_index.query(
+                perceptual_hash, self.image_dedup_threshold, hash_group
+            )
+            if match is not None:
+                self.near_duplicate_hits += 1
+                description, entity_info = match[1]["payload"]
+                logger.debug("Reusing description of a near-duplicate image")
+                return (description, copy.deepcopy(entity_info)), cache_key, None
+
+        return None, cache_key, hash_group
+
+    def _store_description(
+        self,
+        cache_key: Optional[str],
+        hash_group: Optional[str],
+        perceptual_hash: Optional[int],
+        description: str,
+        entity_info: Dict[str, Any],
+    ):
+        """Remember a generated description under the keys returned by _lookup_description"""
+        if cache_key is not None:
+            self.description_cache.put(cache_key, description, entity_info)
+        if hash_group is not None:
+            self.image_hash_index.add(
+                perceptual_hash,
+                hash_group,
+                [description, copy.deepcopy(entity_info)],
+            )
+
     async def generate_description_only(
         self,
         modal_content,
@@ -711,13 +994,14 @@ class BaseModalProcessor:
         chunks = {chunk_id: chunk_data}
 
         # Extract entities and relationships
-        chunk_results = await extract_entities(
-            chunks=chunks,
-            global_config=self.global_config,
-            pipeline_status=pipeline_status,
-            pipeline_status_lock=pipeline_status_lock,
-            llm_response_cache=self.hashing_kv,
-        )
+        with trace_span("extract_entities", chunks=len(chunks)):
+            chunk_results = await extract_entities(
+                chunks=chunks,
+                global_config=self.global_config,
+                pipeline_status=pipeline_status,
+                pipeline_status_lock=pipeline_status_lock,
+                llm_response_cache=self.hashing_kv,
+            )
 
         # Add "belongs_to" relationships for all extracted entities
         processed_chunk_results = []
@@ -759,22 +1043,24 @@ class BaseModalProcessor:
         if not batch_mode:
             # Merge with correct file_path parameter
             file_path = chunk_data.get("file_path", "manual_creation")
-            await merge_nodes_and_edges(
-                chunk_results=chunk_results,
-                knowledge_graph_inst=self.knowledge_graph_inst,
-                entity_vdb=self.entities_vdb,
-                relationships_vdb=self.relationships_vdb,
-                global_config=self.global_config,
-                pipeline_status=pipeline_status,
-                pipeline_status_lock=pipeline_status_lock,
-                llm_response_cache=self.hashing_kv,
-                current_file_number=1,
-                total_files=1,
-                file_path=file_path,  # Pass the correct file_path
-            )
+            with trace_span("merge_nodes_and_edges"):
+                await merge_nodes_and_edges(
+                    chunk_results=chunk_results,
+                    knowledge_graph_inst=self.knowledge_graph_inst,
+                    entity_vdb=self.entities_vdb,
+                    relationships_vdb=self.relationships_vdb,
+                    global_config=self.global_config,
+                    pipeline_status=pipeline_status,
+                    pipeline_status_lock=pipeline_status_lock,
+                    llm_response_cache=self.hashing_kv,
+                    current_file_number=1,
+                    total_files=1,
+                    file_path=file_path,  # Pass the correct file_path
+                )
 
             # Ensure all storage updates are complete
-            await self.lightrag._insert_done()
+            with trace_span("flush.lightrag_indexes"):
+                await self.lightrag._insert_done()
 
         return processed_chunk_results
 
@@ -787,6 +1073,12 @@ class ImageModalProcessor(BaseModalProcessor):
         lightrag: LightRAG,
         modal_caption_func,
         context_extractor: ContextExtractor = None,
+        description_cache: Optional[DescriptionCache] = None,
+        model_id: Optional[str] = None,
+        image_hash_index: Optional[ImageHashIndex] = None,
+        image_dedup_threshold: int = 4,
+        batch_size: int = 1,
+        batch_max_bytes: int = 8 * 1024 * 1024,
     ):
         """Initialize image processor
 
@@ -794,8 +1086,22 @@ class ImageModalProcessor(BaseModalProcessor):
             lightrag: LightRAG instance
             modal_caption_func: Function for generating descriptions (supporting image understanding)
             context_extractor: Context extractor instance
+            description_cache: Shared cache of generated descriptions
+            model_id: Identifier of the caption model, part of description cache keys
+            image_hash_index: Perceptual hash index of previously described images
+            image_dedup_threshold: Maximum dHash Hamming distance of near-duplicate images
+            batch_size: Maximum number of images captioned in one multi-image request
+            batch_max_bytes: Maximum base64 payload size of one multi-image request
         """
-        super().__init__(lightrag, modal_caption_func, context_extractor)
+        super().__init__(
+            lightrag, modal_caption_func, context_extractor, description_cache, model_id
+        )
+        self.image_hash_index = image_hash_index
+        self.image_dedup_threshold = image_dedup_threshold
+        self.batch_size = batch_size
+        self.batch_max_bytes = batch_max_bytes
+        # Set once the caption function turns out not to handle multi-image requests
+        self.batching_disabled = False
 
     def _encode_image_to_base64(self, image_path: str) -> str:
         """Encode image to base64"""
@@ -807,6 +1113,121 @@ class ImageModalProcessor(BaseModalProcessor):
             logger.error(f"Failed to encode image {image_path}: {e}")
             return ""
 
+    async def _prepare_image_request(
+        self,
+        modal_content,
+        item_info: Dict[str, Any] = None,
+        entity_name: str = None,
+    ) -> Dict[str, Any]:
+        """Validate an image item and build everything needed to caption it
+
+        Args:
+            modal_content: Image content to process
+            item_info: Item information for context extraction
+            entity_name: Optional predefined entity name
+
+        Returns:
+            Dict with the image path, captions, footnotes, context, rendered prompt,
+            prompt fields, base64 image data and perceptual hash
+        """
+        # Parse image content (reuse existing logic)
+        if isinstance(modal_content, str):
+            try:
+                content_data = json.loads(modal_content)
+            except json.JSONDecodeError:
+                content_data = {"description": modal_content}
+        else:
+            content_data = modal_content
+
+        image_path = content_data.get("img_path")
+        captions = content_data.get(
+            "image_caption", content_data.get("img_caption", [])
+        )
+        footnotes = content_data.get(
+            "image_footnote", content_data.get("img_footnote", [])
+        )
+
+        # Validate image path
+        if not image_path:
+            raise ValueError(
+                f"No image path provided in modal_content: {modal_content}"
+            )
+
+        # Convert to Path object and check if it exists
+        image_path_obj = Path(image_path)
+        if not image_path_obj.exists():
+            raise FileNotFoundError(f"Image file not found: {image_path}")
+
+        # Extract context for current item
+        context = ""
+        if item_info:
+            context = self._get_context_for_item(item_info)
+
+        # Build detailed visual analysis prompt with context
+        if context:
+            vision_prompt = PROMPTS.get(
+                "vision_prompt_with_context", PROMPTS["vision_prompt"]
+            ).format(
+                context=context,
+                entity_name=entity_name
+                if entity_name
+                else "unique descriptive name for this image",
+                image_path=image_path,
+                captions=captions if captions else "None",
+                footnotes=footnotes if footnotes else "None",
+            )
+        else:
+            vision_prompt = PROMPTS["vision_prompt"].format(
+                entity_name=entity_name
+                if entity_name
+                else "unique descriptive name for this image",
+                image_path=image_path,
+                captions=captions if captions else "None",
+                footnotes=footnotes if footnotes else "None",
+            )
+
+        # Encode image to base64
+        image_base64 = self._encode_image_to_base64(image_path)
+        if not image_base64:
+            raise RuntimeError(f"Failed to encode image to base64: {image_path}")
+
+        perceptual_hash = None
+        if self.image_hash_index is not None:
+            perceptual_hash = await asyncio.to_thread(compute_image_dhash, image_path)
+
+        return {
+            "modal_content": modal_content,
+            "item_info": item_info,
+            "entity_name": entity_name,
+            "image_path": image_path,
+            "captions": captions,
+            "footnotes": footnotes,
+            "context": context,
+            "prompt": vision_prompt,
+            "prompt_fields": {
+                "template": "vision_prompt_with_context"
+                if context
+                else "vision_prompt",
+                "entity_name": entity_name,
+                "captions": captions,
+                "footnotes": footnotes,
+            },
+            "image_base64": image_base64,
+            "perceptual_hash": perceptual_hash,
+        }
+
+    def _fallback_entity(
+        self, modal_content, entity_name: str = None
+    ) -> Dict[str, Any]:
+        """Entity info used when an image cannot be described"""
+        return {
+            "entity_name": entity_name
+            if entity_name
+            else f"image_{compute_mdhash_id(str(modal_content))}",
+            "entity_type": "image",
+            "summary": f"Image content: {str(modal_content)[:100]}",
+        }
+
     async def generate_description_only(
         self,
         modal_content,
@@ -828,90 +1249,234 @@ class ImageModalProcessor(BaseModalProcessor):
             Tuple of (enhanced_caption, entity_info)
         """
         try:
-            # Parse image content (reuse existing logic)
-            if isinstance(modal_content, str):
-                try:
-                    content_data = json.loads(modal_content)
-                except json.JSONDecodeError:
-                    content_data = {"description": modal_content}
-            else:
-                content_data = modal_content
-
-            image_path = content_data.get("img_path")
-            captions = content_data.get(
-                "image_caption", content_data.get("img_caption", [])
+            request = await self._prepare_image_request(
+                modal_content, item_info, entity_name
             )
-            footnotes = content_data.get(
-                "image_footnote", content_data.get("img_footnote", [])
+
+            # Call vision model with encoded image and parse its response
+            enhanced_caption, entity_info = await self._caption_with_cache(
+                request["image_base64"],
+                request["prompt_fields"],
+                request["context"],
+                lambda response: self._parse_response(response, entity_name),
+                request["prompt"],
+                perceptual_hash=request["perceptual_hash"],
+                image_data=request["image_base64"],
+                system_prompt=PROMPTS["IMAGE_ANALYSIS_SYSTEM"],
             )
 
-            # Validate image path
-            if not image_path:
-                raise ValueError(
-                    f"No image path provided in modal_content: {modal_content}"
-                )
+            return enhanced_caption, entity_info
 
-            # Convert to Path object and check if it exists
-            image_path_obj = Path(image_path)
-            if not image_path_obj.exists():
-                raise FileNotFoundError(f"Image file not found: {image_path}")
+        except Exception as e:
+            logger.error(f"Error generating image description: {e}")
+            # Fallback processing
+            return str(modal_content), self._fallback_entity(modal_content, entity_name)
 
-            # Extract context for current item
-            context = ""
-            if item_info:
-                context = self._get_context_for_item(item_info)
+    async def generate_descriptions_batch(
+        self, items: List[Tuple[Any, Optional[Dict[str, Any]]]]
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Generate descriptions of several images, packing the images that are not
+        cached into multi-image caption requests
 
-            # Build detailed visual analysis prompt with context
-            if context:
-                vision_prompt = PROMPTS.get(
-                    "vision_prompt_with_context", PROMPTS["vision_prompt"]
-                ).format(
-                    context=context,
-                    entity_name=entity_name
-                    if entity_name
-                    else "unique descriptive name for this image",
-                    image_path=image_path,
-                    captions=captions if captions else "None",
-                    footnotes=footnotes if footnotes else "None",
-                )
-            else:
-                vision_prompt = PROMPTS["vision_prompt"].format(
-                    entity_name=entity_name
-                    if entity_name
-                    else "unique descriptive name for this image",
-                    image_path=image_path,
-                    captions=captions if captions else "None",
-                    footnotes=footnotes if footnotes else "None",
-                )
+        Images whose batched response is missing or malformed are described with
+        single-image requests instead.
 
-            # Encode image to base64
-            image_base64 = self._encode_image_to_base64(image_path)
-            if not image_base64:
-                raise RuntimeError(f"Failed to encode image to base64: {image_path}")
+        Args:
+            items: List of (modal_content, item_info) pairs
 
-            # Call vision model with encoded image
-            response = await self.modal_caption_func(
-                vision_prompt,
-                image_data=image_base64,
-                system_prompt=PROMPTS["IMAGE_ANALYSIS_SYSTEM"],
+        Returns:
+            List of (description, entity_info) tuples in input order
+        """
+        results: List[Optional[Tuple[str, Dict[str, Any]]]] = [None] * len(items)
+        pending = []
+        for position, (modal_content, item_info) in enumerate(items):
+            try:
+                request = await self._prepare_image_request(modal_content, item_info)
+            except Exception as e:
+                logger.error(f"Error generating image description: {e}")
+                results[position] = (
+                    str(modal_content),
+                    self._fallback_entity(modal_content),
+                )
+                continue
+
+            request["prompt_fields"]["system_prompt"] = PROMPTS["IMAGE_ANALYSIS_SYSTEM"]
+            cached, cache_key, hash_group = self._lookup_description(
+                request["image_base64"],
+                request["prompt_fields"],
+                request["context"],
+                request["perceptual_hash"],
+            )
+            if cached is not None:
+                results[position] = cached
+                continue
+            request.update(
+                position=position, cache_key=cache_key, hash_group=hash_group
             )
+            pending.append(request)
 
-            # Parse response (reuse existing logic)
-            enhanced_caption, entity_info = self._parse_response(response, entity_name)
+        for batch in self._pack_image_batches(pending):
+            batch_results = (
+                await self._caption_image_batch(batch) if len(batch) > 1 else [None]
+            )
+            for request, result in zip(batch, batch_results):
+                if result is None:
+                    result = await self.generate_description_only(
+                        request["modal_content"], "image", request["item_info"]
+                    )
+                results[request["position"]] = result
+
+        return results
+
+    def _pack_image_batches(
+        self, requests: List[Dict[str, Any]]
+    ) -> List[List[Dict[str, Any]]]:
+        """Group image requests in order, bounded by batch size and payload bytes"""
+        if self.batching_disabled:
+            return [[request] for request in requests]
+        batches, current, current_bytes = [], [], 0
+        for request in requests:
+            size = len(request["image_base64"])
+            if current and (
+                len(current) >= self.batch_size
+                or current_bytes + size > self.batch_max_bytes
+            ):
+                batches.append(current)
+                current, current_bytes = [], 0
+            current.append(request)
+            current_bytes += size
+        if current:
+            batches.append(current)
+        return batches
+
+    async def _caption_image_batch(
+        self, batch: List[Dict[str, Any]]
+    ) -> List[Optional[Tuple[str, Dict[str, Any]]]]:
+        """Describe several images with one multi-image vision model request
 
-            return enhanced_caption, entity_info
+        Args:
+            batch: Prepared image requests
 
-        except Exception as e:
-            logger.error(f"Error generating image description: {e}")
-            # Fallback processing
-            fallback_entity = {
-                "entity_name": entity_name
-                if entity_name
-                else f"image_{compute_mdhash_id(str(modal_content))}",
-                "entity_type": "image",
-                "summary": f"Image content: {str(modal_content)[:100]}",
+        Returns:
+            (description, entity_info) per request, or None where the response
+            holds no valid entry for that image
+        """
+        content_parts = [
+            {
+                "type": "text",
+                "text": PROMPTS["vision_batch_prompt"].format(image_count=len(batch)),
             }
-            return str(modal_content), fallback_entity
+        ]
+        for image_index, request in enumerate(batch, start=1):
+            content_parts.append(
+                {
+                    "type": "text",
+                    "text": PROMPTS["vision_batch_item"].format(
+                        image_index=image_index,
+                        image_path=request["image_path"],
+                        captions=request["captions"] if request["captions"] else "None",
+                        footnotes=request["footnotes"]
+                        if request["footnotes"]
+                        else "None",
+                        context=request["context"] if request["context"] else "None",
+                    ),
+                }
+            )
+            content_parts.append(
+                {
+                    "type": "image_url",
+                    "image_url": {
+                        "url": f"data:image/jpeg;base64,{request['image_base64']}"
+                    },
+                }
+            )
+        messages = [
+            {"role": "system", "content": PROMPTS["IMAGE_ANALYSIS_SYSTEM"]},
+            {"role": "user", "content": content_parts},
+        ]
+
+        try:
+            response = await self.modal_caption_func("", messages=messages)
+        except TypeError as e:
+            # The caption function does not accept multi-image messages
+            self._disable_batching(f"caption function rejected messages: {e}")
+            return [None] * len(batch)
+        except Exception as e:
+            logger.warning(f"Batched image captioning failed: {e}")
+            return [None] * len(batch)
+
+        entries = self._parse_batch_response(response)
+        if not entries:
+            # Most likely the caption function ignores messages= and described
+            # only the prompt; retrying every batch would double the calls
+            self._disable_batching("response to a multi-image request was unparseable")
+            return [None] * len(batch)
+        results = []
+        for image_index, request in enumerate(batch, start=1):
+            result = None
+            entry = entries.get(image_index)
+            if entry is not None:
+                raw = json.dumps(entry, ensure_ascii=False)
+                description, entity_info = self._parse_response(raw)
+                if description != raw:
+                    self._store_description(
+                        request["cache_key"],
+                        request["hash_group"],
+                        request["perceptual_hash"],
+                        description,
+                        entity_info,
+                    )
+                    result = (description, entity_info)
+            results.append(result)
+
+        fallbacks = results.count(None)
+        logger.debug(
+            f"Captioned {len(batch) - fallbacks}/{len(batch)} images in one request"
+        )
+        if fallbacks:
+            logger.warning(
+                f"{fallbacks} images missing from batched response, retrying individually"
+            )
+        return results
+
+    def _disable_batching(self, reason: str):
+        """Caption images one per request from now on"""
+        if not self.batching_disabled:
+            self.batching_disabled = True
+            logger.warning(f"Disabling batched image captioning, {reason}")
+
+    def _parse_batch_response(self, response: str) -> Dict[int, Dict[str, Any]]:
+        """Parse a multi-image response into entries keyed by 1-based image index"""
+        entries = None
+        array_match = re.search(r"\[.*\]", response, re.DOTALL)
+        if array_match:
+            parsed = self._try_parse_json(array_match.group(0))
+            if parsed is None:
+                parsed = self._try_parse_json(
+                    self._basic_json_cleanup(array_match.group(0))
+                )
+            if isinstance(parsed, list):
+                entries = parsed
+
+        # Fall back to the individual top-level objects of a malformed array
+        if entries is None:
+            entries = []
+            for candidate in dict.fromkeys(self._extract_all_json_candidates(response)):
+                parsed = self._try_parse_json(self._basic_json_cleanup(candidate))
+                if isinstance(parsed, dict) and "detailed_description" in parsed:
+                    entries.append(parsed)
+
+        by_index: Dict[int, Dict[str, Any]] = {}
+        for position, entry in enumerate(entries, start=1):
+            if not isinstance(entry, dict):
+                continue
+            try:
+                image_index = int(entry.get("image_index", position))
+            except (TypeError, ValueError):
+                continue
+            by_index.setdefault(image_index, entry)
+        return by_index
 
     async def process_multimodal_content(
         self,
@@ -1083,17 +1648,23 @@ class TableModalProcessor(BaseModalProcessor):
                     table_footnote=table_footnote if table_footnote else "None",
                 )
 
-            # Call LLM for table analysis
-            response = await self.modal_caption_func(
+            # Call LLM for table analysis and parse its response
+            enhanced_caption, entity_info = await self._caption_with_cache(
+                str(table_body),
+                {
+                    "template": "table_prompt_with_context"
+                    if context
+                    else "table_prompt",
+                    "entity_name": entity_name,
+                    "table_caption": table_caption,
+                    "table_footnote": table_footnote,
+                },
+                context,
+                lambda response: self._parse_table_response(response, entity_name),
                 table_prompt,
                 system_prompt=PROMPTS["TABLE_ANALYSIS_SYSTEM"],
             )
 
-            # Parse response (reuse existing logic)
-            enhanced_caption, entity_info = self._parse_table_response(
-                response, entity_name
-            )
-
             return enhanced_caption, entity_info
 
         except Exception as e:
@@ -1271,17 +1842,22 @@ class EquationModalProcessor(BaseModalProcessor):
                     else "descriptive name for this equation",
                 )
 
-            # Call LLM for equation analysis
-            response = await self.modal_caption_func(
+            # Call LLM for equation analysis and parse its response
+            enhanced_caption, entity_info = await self._caption_with_cache(
+                str(equation_text),
+                {
+                    "template": "equation_prompt_with_context"
+                    if context
+                    else "equation_prompt",
+                    "entity_name": entity_name,
+                    "equation_format": equation_format,
+                },
+                context,
+                lambda response: self._parse_equation_response(response, entity_name),
                 equation_prompt,
                 system_prompt=PROMPTS["EQUATION_ANALYSIS_SYSTEM"],
             )
 
-            # Parse response (reuse existing logic)
-            enhanced_caption, entity_info = self._parse_equation_response(
-                response, entity_name
-            )
-
             return enhanced_caption, entity_info
 
         except Exception as e:
@@ -1443,19 +2019,26 @@ class GenericModalProcessor(BaseModalProcessor):
                     content=str(modal_content),
                 )
 
-            # Call LLM for generic analysis
-            response = await self.modal_caption_func(
+            # Call LLM for generic analysis and parse its response
+            enhanced_caption, entity_info = await self._caption_with_cache(
+                str(modal_content),
+                {
+                    "template": "generic_prompt_with_context"
+                    if context
+                    else "generic_prompt",
+                    "entity_name": entity_name,
+                    "content_type": content_type,
+                },
+                context,
+                lambda response: self._parse_generic_response(
+                    response, entity_name, content_type
+                ),
                 generic_prompt,
                 system_prompt=PROMPTS["GENERIC_ANALYSIS_SYSTEM"].format(
                     content_type=content_type
                 ),
             )
 
-            # Parse response (reuse existing logic)
-            enhanced_caption, entity_info = self._parse_generic_response(
-                response, entity_name, content_type
-            )
-
             return enhanced_caption, entity_info
 
         except Exception as e:
@@ -26,6 +26,7 @@ from typing import (
     Union,
     Tuple,
     Any,
+    Callable,
     TypeVar,
 )
 
@@ -42,6 +43,10 @@ class MineruExecutionError(Exception):
             f"Mineru command failed with return code {return_code}: {error_msg}"
         )
 
+    def __reduce__(self):
+        # Keep the exception picklable across parser worker processes
+        return (self.__class__, (self.return_code, self.error_msg))
+
 
 class Parser:
     """
@@ -55,6 +60,9 @@ class Parser:
     IMAGE_FORMATS = {".png", ".jpeg", ".jpg", ".bmp", ".tiff", ".tif", ".gif", ".webp"}
     TEXT_FORMATS = {".txt", ".md"}
 
+    # Characters per synthetic page when parsing text files natively
+    TEXT_PAGE_CHARS = 3000
+
     # Class-level logger
     logger = logging.getLogger(__name__)
 
@@ -225,23 +233,7 @@ class Parser:
                 raise ValueError(f"Unsupported text format: {text_path.suffix}")
 
             # Read the text content
-            try:
-                with open(text_path, "r", encoding="utf-8") as f:
-                    text_content = f.read()
-            except UnicodeDecodeError:
-                # Try with different encodings
-                for encoding in ["gbk", "latin-1", "cp1252"]:
-                    try:
-                        with open(text_path, "r", encoding=encoding) as f:
-                            text_content = f.read()
-                        logging.info(f"Successfully read file with {encoding} encoding")
-                        break
-                    except UnicodeDecodeError:
-                        continue
-                else:
-                    raise RuntimeError(
-                        f"Could not decode text file {text_path.name} with any supported encoding"
-                    )
+            text_content = Parser._read_text_file(text_path)
 
             # Prepare output directory
             if output_dir:
@@ -435,6 +427,309 @@ class Parser:
             logging.error(f"Error in convert_text_to_pdf: {str(e)}")
             raise
 
+    @staticmethod
+    def get_pdf_page_count(pdf_path: Union[str, Path]) -> Optional[int]:
+        """
+        Count the pages of a PDF without parsing it
+
+        Args:
+            pdf_path: Path to the PDF file
+
+        Returns:
+            Optional[int]: Page count, or None if no PDF library is available or the file is unreadable
+        """
+        try:
+            import pypdfium2 as pdfium
+
+            pdf = pdfium.PdfDocument(str(pdf_path))
+            try:
+                return len(pdf)
+            finally:
+                pdf.close()
+        except ImportError:
+            pass
+        except Exception as e:
+            logging.warning(f"Could not count pages of {pdf_path}: {e}")
+            return None
+
+        try:
+            from pypdf import PdfReader
+
+            return len(PdfReader(str(pdf_path)).pages)
+        except ImportError:
+            logging.debug("Neither pypdfium2 nor pypdf is installed")
+        except Exception as e:
+            logging.warning(f"Could not count pages of {pdf_path}: {e}")
+        return None
+
+    @staticmethod
+    def _read_text_file(text_path: Path) -> str:
+        """
+        Read a text file, trying common encodings after UTF-8
+
+        Args:
+            text_path: Path to the text file
+
+        Returns:
+            str: File content
+        """
+        try:
+            with open(text_path, "r", encoding="utf-8") as f:
+                return f.read()
+        except UnicodeDecodeError:
+            # Try with different encodings
+            for encoding in ["gbk", "latin-1", "cp1252"]:
+                try:
+                    with open(text_path, "r", encoding=encoding) as f:
+                        text_content = f.read()
+                    logging.info(f"Successfully read file with {encoding} encoding")
+                    return text_content
+                except UnicodeDecodeError:
+                    continue
+            raise RuntimeError(
+                f"Could not decode text file {text_path.name} with any supported encoding"
+            )
+
+    def parse_text_file(
+        self,
+        text_path: Union[str, Path],
+        output_dir: Optional[str] = None,
+        lang: Optional[str] = None,
+        render_pdf: bool = False,
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        """
+        Parse text file (.txt, .md) directly into content blocks
+
+        Markdown headings, pipe tables, `$$` equation blocks and local image links
+        are mapped to MinerU-style content blocks. Set render_pdf to convert the
+        file to PDF with ReportLab and run the PDF parser on it instead.
+
+        Args:
+            text_path: Path to the text file (.txt, .md)
+            output_dir: Output directory path (only used with render_pdf)
+            lang: Document language for OCR optimization (only used with render_pdf)
+            render_pdf: Render to PDF and parse that instead of parsing natively
+            **kwargs: Additional parameters for the PDF parser
+
+        Returns:
+            List[Dict[str, Any]]: List of content blocks
+        """
+        try:
+            text_path = Path(text_path)
+            if not text_path.exists():
+                raise FileNotFoundError(f"Text file does not exist: {text_path}")
+
+            if text_path.suffix.lower() not in self.TEXT_FORMATS:
+                raise ValueError(f"Unsupported text format: {text_path.suffix}")
+
+            if render_pdf:
+                # Convert text file to PDF using base class method
+                pdf_path = self.convert_text_to_pdf(text_path, output_dir)
+
+                # Parse the converted PDF
+                return self.parse_pdf(
+                    pdf_path=pdf_path, output_dir=output_dir, lang=lang, **kwargs
+                )
+
+            text_content = self._read_text_file(text_path)
+            if text_path.suffix.lower() == ".md":
+                content_list = self.markdown_to_content_list(
+                    text_content, base_dir=text_path.parent
+                )
+            else:
+                content_list = self.plain_text_to_content_list(text_content)
+
+            logging.info(
+                f"Parsed {text_path.name} natively into {len(content_list)} content blocks"
+            )
+            return content_list
+
+        except Exception as e:
+            logging.error(f"Error in parse_text_file: {str(e)}")
+            raise
+
+    @classmethod
+    def plain_text_to_content_list(cls, text: str) -> List[Dict[str, Any]]:
+        """
+        Split plain text into paragraph text blocks
+
+        Args:
+            text: Plain text content
+
+        Returns:
+            List[Dict[str, Any]]: List of content blocks
+        """
+        import re
+
+        content_list = []
+        for paragraph in re.split(r"\n\s*\n", text):
+            paragraph = paragraph.strip()
+            if paragraph:
+                content_list.append({"type": "text", "text": paragraph})
+        return cls._assign_text_pages(content_list)
+
+    @classmethod
+    def markdown_to_content_list(
+        cls, text: str, base_dir: Optional[Union[str, Path]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Convert Markdown into MinerU-style content blocks
+
+        Args:
+            text: Markdown content
+            base_dir: Directory that relative image links are resolved against
+
+        Returns:
+            List[Dict[str, Any]]: List of content blocks
+        """
+        import re
+
+        heading_re = re.compile(r"^(#{1,6})\s+(.*?)(?:\s+#+)?\s*$")
+        image_re = re.compile(
+            r"^!\[([^\]]*)\]\(\s*<?([^)\s>]+)>?(?:\s+\"[^\"]*\")?\s*\)$"
+        )
+        table_sep_re = re.compile(r"^\|?\s*:?-{3,}:?\s*(\|\s*:?-{3,}:?\s*)*\|?$")
+        fence_re = re.compile(r"^(```|~~~)")
+        base_dir = Path(base_dir) if base_dir else None
+
+        content_list: List[Dict[str, Any]] = []
+        paragraph: List[str] = []
+
+        def flush_paragraph():
+            if paragraph:
+                block = "\n".join(paragraph).strip()
+                if block:
+                    content_list.append({"type": "text", "text": block})
+                paragraph.clear()
+
+        lines = text.splitlines()
+        i = 0
+        while i < len(lines):
+            line = lines[i]
+            stripped = line.strip()
+
+            # Blank line ends a paragraph
+            if not stripped:
+                flush_paragraph()
+                i += 1
+                continue
+
+            # Fenced code block, kept verbatim as text
+            fence = fence_re.match(stripped)
+            if fence:
+                flush_paragraph()
+                block = [line]
+                i += 1
+                while i < len(lines):
+                    block.append(lines[i])
+                    i += 1
+                    if lines[i - 1].strip().startswith(fence.group(1)):
+                        break
+                content_list.append({"type": "text", "text": "\n".join(block)})
+                continue
+
+            # Display equation: $$ ... $$ on one line or across several
+            if stripped.startswith("$$"):
+                flush_paragraph()
+                block = [stripped]
+                if not (len(stripped) > 2 and stripped.endswith("$$")):
+                    i += 1
+                    while i < len(lines):
+                        block.append(lines[i].strip())
+                        i += 1
+                        if lines[i - 1].strip().endswith("$$"):
+                            break
+                else:
+                    i += 1
+                latex = "\n".join(block).strip()
+                content_list.append(
+                    {"type": "equation", "text": latex, "text_format": "latex"}
+                )
+                continue
+
+            # Heading
+            heading = heading_re.match(stripped)
+            if heading:
+                flush_paragraph()
+                content_list.append(
+                    {
+                        "type": "text",
+                        "text": heading.group(2),
+                        "text_level": len(heading.group(1)),
+                    }
+                )
+                i += 1
+                continue
+
+            # Pipe table: header row followed by a separator row
+            if (
+                stripped.startswith("|")
+                and i + 1 < len(lines)
+                and table_sep_re.match(lines[i + 1].strip())
+            ):
+                flush_paragraph()
+                block = [stripped, lines[i + 1].strip()]
+                i += 2
+                while i < len(lines) and lines[i].strip().startswith("|"):
+                    block.append(lines[i].strip())
+                    i += 1
+                content_list.append(
+                    {
+                        "type": "table",
+                        "img_path": "",
+                        "table_body": "\n".join(block),
+                        "table_caption": [],
+                        "table_footnote": [],
+                    }
+                )
+                continue
+
+            # Standalone image link pointing at an existing local file
+            image = image_re.match(stripped)
+            if image:
+                img_path = Path(image.group(2))
+                if not img_path.is_absolute() and base_dir is not None:
+                    img_path = base_dir / img_path
+                if img_path.is_file():
+                    flush_paragraph()
+                    content_list.append(
+                        {
+                            "type": "image",
+                            "img_path": str(img_path.resolve()),
+                            "image_caption": [image.group(1)] if image.group(1) else [],
+                            "image_footnote": [],
+                        }
+                    )
+                    i += 1
+                    continue
+
+            paragraph.append(line)
+            i += 1
+
+        flush_paragraph()
+        return cls._assign_text_pages(content_list)
+
+    @classmethod
+    def _assign_text_pages(
+        cls, content_list: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Give blocks a synthetic page_idx, one page per TEXT_PAGE_CHARS characters,
+        so page-based context extraction works for text sources
+
+        Args:
+            content_list: Content blocks in document order
+
+        Returns:
+            List[Dict[str, Any]]: The same blocks with page_idx set
+        """
+        chars = 0
+        for item in content_list:
+            item["page_idx"] = chars // cls.TEXT_PAGE_CHARS
+            chars += len(item.get("text") or item.get("table_body") or "")
+        return content_list
+
     @staticmethod
     def _process_inline_markdown(text: str) -> str:
         """
@@ -598,9 +893,14 @@ class MineruParser(Parser):
         device: Optional[str] = None,
         source: Optional[str] = None,
         vlm_url: Optional[str] = None,
+        timeout: Optional[float] = None,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
     ) -> None:
         """
-        Run mineru command line tool
+        Run mineru command line tool, blocking until it exits
+
+        Runs _run_mineru_command_async on a private event loop, so output is
+        streamed without reader threads or polling.
 
         Args:
             input_path: Path to input file or directory
@@ -615,6 +915,59 @@ class MineruParser(Parser):
             device: Inference device
             source: Model source
             vlm_url: When the backend is `vlm-sglang-client`, you need to specify the server_url
+            timeout: Seconds before the process is killed, None or 0 for no limit
+            progress_callback: Called with progress dicts parsed from mineru output
+        """
+        import asyncio
+
+        coro = MineruParser._run_mineru_command_async(
+            input_path,
+            output_dir,
+            method=method,
+            lang=lang,
+            backend=backend,
+            start_page=start_page,
+            end_page=end_page,
+            formula=formula,
+            table=table,
+            device=device,
+            source=source,
+            vlm_url=vlm_url,
+            timeout=timeout,
+            progress_callback=progress_callback,
+        )
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            asyncio.run(coro)
+            return
+
+        # This thread already runs an event loop, which must not be nested
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(asyncio.run, coro).result()
+
+    @staticmethod
+    def _build_mineru_command(
+        input_path: Union[str, Path],
+        output_dir: Union[str, Path],
+        method: str = "auto",
+        lang: Optional[str] = None,
+        backend: Optional[str] = None,
+        start_page: Optional[int] = None,
+        end_page: Optional[int] = None,
+        formula: bool = True,
+        table: bool = True,
+        device: Optional[str] = None,
+        source: Optional[str] = None,
+        vlm_url: Optional[str] = None,
+    ) -> List[str]:
+        """
+        Build the mineru command line, see _run_mineru_command for the arguments
+
+        Returns:
+            List[str]: Command and arguments
         """
         cmd = [
             "mineru",
@@ -645,146 +998,196 @@ class MineruParser(Parser):
         if vlm_url:
             cmd.extend(["-u", vlm_url])
 
-        output_lines = []
-        error_lines = []
-
-        try:
-            # Prepare subprocess parameters to hide console window on Windows
-            import platform
-            import threading
-            from queue import Queue, Empty
+        return cmd
 
-            # Log the command being executed
-            logging.info(f"Executing mineru command: {' '.join(cmd)}")
+    @staticmethod
+    def _log_mineru_stderr_line(line: str, error_lines: List[str]) -> None:
+        """
+        Log one line of mineru stderr, collecting error lines
 
-            subprocess_kwargs = {
-                "stdout": subprocess.PIPE,
-                "stderr": subprocess.PIPE,
-                "text": True,
-                "encoding": "utf-8",
-                "errors": "ignore",
-                "bufsize": 1,  # Line buffered
-            }
+        Args:
+            line: Output line
+            error_lines: List that error lines are appended to
+        """
+        # Log mineru errors with WARNING level
+        if "warning" in line.lower():
+            logging.warning(f"[MinerU] {line}")
+        elif "error" in line.lower():
+            logging.error(f"[MinerU] {line}")
+            error_message = line.split("\n")[0]
+            error_lines.append(error_message)
+        else:
+            logging.info(f"[MinerU] {line}")
 
-            # Hide console window on Windows
-            if platform.system() == "Windows":
-                subprocess_kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
+    @staticmethod
+    def _parse_mineru_progress(line: str) -> Optional[Dict[str, Any]]:
+        """
+        Extract progress from a mineru tqdm line such as "Predict: 45%|####  | 9/20 [00:01<00:02]"
 
-            # Function to read output from subprocess and add to queue
-            def enqueue_output(pipe, queue, prefix):
-                try:
-                    for line in iter(pipe.readline, ""):
-                        if line.strip():  # Only add non-empty lines
-                            queue.put((prefix, line.strip()))
-                    pipe.close()
-                except Exception as e:
-                    queue.put((prefix, f"Error reading {prefix}: {e}"))
+        Args:
+            line: Output line
 
-            # Start subprocess
-            process = subprocess.Popen(cmd, **subprocess_kwargs)
+        Returns:
+            Optional[Dict[str, Any]]: Progress with stage, current, total and percent,
+            or None if the line carries no progress
+        """
+        import re
 
-            # Create queues for stdout and stderr
-            stdout_queue = Queue()
-            stderr_queue = Queue()
+        match = re.search(r"(?:^|\s)(\d+)/(\d+)(?:\s*\[|\s*$)", line)
+        if not match or "|" not in line:
+            return None
+
+        current, total = int(match.group(1)), int(match.group(2))
+        if total <= 0:
+            return None
+        stage = line.split("|", 1)[0].rsplit(":", 1)[0].strip() if ":" in line else ""
+        return {
+            "stage": stage,
+            "current": current,
+            "total": total,
+            "percent": round(100.0 * current / total, 1),
+        }
 
-            # Start threads to read output
-            stdout_thread = threading.Thread(
-                target=enqueue_output, args=(process.stdout, stdout_queue, "STDOUT")
-            )
-            stderr_thread = threading.Thread(
-                target=enqueue_output, args=(process.stderr, stderr_queue, "STDERR")
-            )
+    @staticmethod
+    async def _run_mineru_command_async(
+        input_path: Union[str, Path],
+        output_dir: Union[str, Path],
+        method: str = "auto",
+        lang: Optional[str] = None,
+        backend: Optional[str] = None,
+        start_page: Optional[int] = None,
+        end_page: Optional[int] = None,
+        formula: bool = True,
+        table: bool = True,
+        device: Optional[str] = None,
+        source: Optional[str] = None,
+        vlm_url: Optional[str] = None,
+        timeout: Optional[float] = None,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> None:
+        """
+        Run mineru command line tool as an asyncio subprocess
 
-            stdout_thread.daemon = True
-            stderr_thread.daemon = True
-            stdout_thread.start()
-            stderr_thread.start()
+        Output is streamed without helper threads. The process is killed when the
+        timeout expires or the awaiting task is cancelled.
 
-            # Process output in real time
-            while process.poll() is None:
-                # Check stdout queue
-                try:
-                    while True:
-                        prefix, line = stdout_queue.get_nowait()
-                        output_lines.append(line)
-                        # Log mineru output with INFO level, prefixed with [MinerU]
-                        logging.info(f"[MinerU] {line}")
-                except Empty:
-                    pass
-
-                # Check stderr queue
-                try:
-                    while True:
-                        prefix, line = stderr_queue.get_nowait()
-                        # Log mineru errors with WARNING level
-                        if "warning" in line.lower():
-                            logging.warning(f"[MinerU] {line}")
-                        elif "error" in line.lower():
-                            logging.error(f"[MinerU] {line}")
-                            error_message = line.split("\n")[0]
-                            error_lines.append(error_message)
-                        else:
-                            logging.info(f"[MinerU] {line}")
-                except Empty:
-                    pass
+        Args:
+            input_path: Path to input file or directory
+            output_dir: Output directory path
+            method: Parsing method (auto, txt, ocr)
+            lang: Document language for OCR optimization
+            backend: Parsing backend
+            start_page: Starting page number (0-based)
+            end_page: Ending page number (0-based)
+            formula: Enable formula parsing
+            table: Enable table parsing
+            device: Inference device
+            source: Model source
+            vlm_url: When the backend is `vlm-sglang-client`, you need to specify the server_url
+            timeout: Seconds before the process is killed, None or 0 for no limit
+            progress_callback: Called with progress dicts parsed from mineru output
+        """
+        import asyncio
+        import codecs
+        import platform
+        import re
 
-                # Small delay to prevent busy waiting
-                import time
+        cmd = MineruParser._build_mineru_command(
+            input_path,
+            output_dir,
+            method=method,
+            lang=lang,
+            backend=backend,
+            start_page=start_page,
+            end_page=end_page,
+            formula=formula,
+            table=table,
+            device=device,
+            source=source,
+            vlm_url=vlm_url,
+        )
 
-                time.sleep(0.1)
+        error_lines: List[str] = []
 
-            # Process any remaining output after process completion
-            try:
-                while True:
-                    prefix, line = stdout_queue.get_nowait()
-                    output_lines.append(line)
-                    logging.info(f"[MinerU] {line}")
-            except Empty:
-                pass
+        # Log the command being executed
+        logging.info(f"Executing mineru command: {' '.join(cmd)}")
 
-            try:
-                while True:
-                    prefix, line = stderr_queue.get_nowait()
-                    if "warning" in line.lower():
-                        logging.warning(f"[MinerU] {line}")
-                    elif "error" in line.lower():
-                        logging.error(f"[MinerU] {line}")
-                        error_message = line.split("\n")[0]
-                        error_lines.append(error_message)
-                    else:
-                        logging.info(f"[MinerU] {line}")
-            except Empty:
-                pass
-
-            # Wait for process to complete and get return code
-            return_code = process.wait()
-
-            # Wait for threads to finish
-            stdout_thread.join(timeout=5)
-            stderr_thread.join(timeout=5)
-
-            if return_code != 0 or error_lines:
-                logging.info("[MinerU] Command executed failed")
-                raise MineruExecutionError(return_code, error_lines)
-            else:
-                logging.info("[MinerU] Command executed successfully")
+        subprocess_kwargs = {}
+        # Hide console window on Windows
+        if platform.system() == "Windows":
+            subprocess_kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
 
-        except MineruExecutionError:
-            raise
-        except subprocess.CalledProcessError as e:
-            logging.error(f"Error running mineru subprocess command: {e}")
-            logging.error(f"Command: {' '.join(cmd)}")
-            logging.error(f"Return code: {e.returncode}")
-            raise
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                **subprocess_kwargs,
+            )
         except FileNotFoundError:
             raise RuntimeError(
                 "mineru command not found. Please ensure MinerU 2.0 is properly installed:\n"
                 "pip install -U 'mineru[core]' or uv pip install -U 'mineru[core]'"
             )
-        except Exception as e:
-            error_message = f"Unexpected error running mineru command: {e}"
-            logging.error(error_message)
-            raise RuntimeError(error_message) from e
+
+        def handle_line(stream_name: str, line: str) -> None:
+            progress = MineruParser._parse_mineru_progress(line)
+            if progress is not None:
+                logging.debug(f"[MinerU] {line}")
+                if progress_callback is not None:
+                    try:
+                        progress_callback(progress)
+                    except Exception as e:
+                        logging.debug(f"MinerU progress callback failed: {e}")
+            elif stream_name == "STDOUT":
+                logging.info(f"[MinerU] {line}")
+            else:
+                MineruParser._log_mineru_stderr_line(line, error_lines)
+
+        async def read_stream(stream, stream_name: str) -> None:
+            # Characters may be split across reads, so decode incrementally
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+            buffer = ""
+            while True:
+                chunk = await stream.read(4096)
+                buffer += decoder.decode(chunk, final=not chunk)
+                # tqdm redraws with carriage returns, so split on both line endings
+                *lines, buffer = re.split(r"[\r\n]", buffer)
+                for line in lines:
+                    if line.strip():
+                        handle_line(stream_name, line.strip())
+                if not chunk:
+                    break
+            if buffer.strip():
+                handle_line(stream_name, buffer.strip())
+
+        async def run() -> int:
+            await asyncio.gather(
+                read_stream(process.stdout, "STDOUT"),
+                read_stream(process.stderr, "STDERR"),
+            )
+            return await process.wait()
+
+        try:
+            return_code = await asyncio.wait_for(run(), timeout=timeout or None)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            logging.error(f"[MinerU] Command timed out after {timeout}s")
+            raise MineruExecutionError(
+                process.returncode, [f"MinerU timed out after {timeout}s"]
+            )
+        except asyncio.CancelledError:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            logging.info("[MinerU] Command cancelled")
+            raise
+
+        if return_code != 0 or error_lines:
+            logging.info("[MinerU] Command executed failed")
+            raise MineruExecutionError(return_code, error_lines)
+        logging.info("[MinerU] Command executed successfully")
 
     @staticmethod
     def _read_output_files(
@@ -853,6 +1256,62 @@ class MineruParser(Parser):
 
         return content_list, md_content
 
+    @staticmethod
+    def _prepare_pdf_parse(
+        pdf_path: Union[str, Path], output_dir: Optional[str] = None
+    ) -> Tuple[Path, Path]:
+        """
+        Check the PDF exists and create the output directory
+
+        Args:
+            pdf_path: Path to the PDF file
+            output_dir: Output directory path, defaults to mineru_output next to the PDF
+
+        Returns:
+            Tuple containing (PDF path, output directory)
+        """
+        # Convert to Path object for easier handling
+        pdf_path = Path(pdf_path)
+        if not pdf_path.exists():
+            raise FileNotFoundError(f"PDF file does not exist: {pdf_path}")
+
+        # Prepare output directory
+        if output_dir:
+            base_output_dir = Path(output_dir)
+        else:
+            base_output_dir = pdf_path.parent / "mineru_output"
+
+        base_output_dir.mkdir(parents=True, exist_ok=True)
+        return pdf_path, base_output_dir
+
+    def _read_pdf_output(
+        self,
+        base_output_dir: Path,
+        file_stem: str,
+        method: str,
+        backend: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Read the content list mineru generated for a PDF
+
+        Args:
+            base_output_dir: Output directory passed to mineru
+            file_stem: PDF file name without extension
+            method: Parsing method
+            backend: Parsing backend
+
+        Returns:
+            List[Dict[str, Any]]: List of content blocks
+        """
+        # VLM backends write their output under the vlm method directory
+        if (backend or "").startswith("vlm-"):
+            method = "vlm"
+
+        content_list, _ = self._read_output_files(
+            base_output_dir, file_stem, method=method
+        )
+        return content_list
+
     def parse_pdf(
         self,
         pdf_path: Union[str, Path],
@@ -875,44 +1334,74 @@ class MineruParser(Parser):
             List[Dict[str, Any]]: List of content blocks
         """
         try:
-            # Convert to Path object for easier handling
-            pdf_path = Path(pdf_path)
-            if not pdf_path.exists():
-                raise FileNotFoundError(f"PDF file does not exist: {pdf_path}")
+            pdf_path, base_output_dir = self._prepare_pdf_parse(pdf_path, output_dir)
 
-            name_without_suff = pdf_path.stem
+            # Run mineru command
+            self._run_mineru_command(
+                input_path=pdf_path,
+                output_dir=base_output_dir,
+                method=method,
+                lang=lang,
+                **kwargs,
+            )
 
-            # Prepare output directory
-            if output_dir:
-                base_output_dir = Path(output_dir)
-            else:
-                base_output_dir = pdf_path.parent / "mineru_output"
+            return self._read_pdf_output(
+                base_output_dir, pdf_path.stem, method, kwargs.get("backend")
+            )
 
-            base_output_dir.mkdir(parents=True, exist_ok=True)
+        except MineruExecutionError:
+            raise
+        except Exception as e:
+            logging.error(f"Error in parse_pdf: {str(e)}")
+            raise
+
+    async def aparse_pdf(
+        self,
+        pdf_path: Union[str, Path],
+        output_dir: Optional[str] = None,
+        method: str = "auto",
+        lang: Optional[str] = None,
+        timeout: Optional[float] = None,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        """
+        Parse PDF document using MinerU 2.0 without blocking the event loop
+
+        Args:
+            pdf_path: Path to the PDF file
+            output_dir: Output directory path
+            method: Parsing method (auto, txt, ocr)
+            lang: Document language for OCR optimization
+            timeout: Seconds before mineru is killed, None or 0 for no limit
+            progress_callback: Called with progress dicts parsed from mineru output
+            **kwargs: Additional parameters for mineru command
+
+        Returns:
+            List[Dict[str, Any]]: List of content blocks
+        """
+        try:
+            pdf_path, base_output_dir = self._prepare_pdf_parse(pdf_path, output_dir)
 
             # Run mineru command
-            self._run_mineru_command(
+            await self._run_mineru_command_async(
                 input_path=pdf_path,
                 output_dir=base_output_dir,
                 method=method,
                 lang=lang,
+                timeout=timeout,
+                progress_callback=progress_callback,
                 **kwargs,
             )
 
-            # Read the generated output files
-            backend = kwargs.get("backend", "")
-            if backend.startswith("vlm-"):
-                method = "vlm"
-
-            content_list, _ = self._read_output_files(
-                base_output_dir, name_without_suff, method=method
+            return self._read_pdf_output(
+                base_output_dir, pdf_path.stem, method, kwargs.get("backend")
             )
-            return content_list
 
         except MineruExecutionError:
             raise
         except Exception as e:
-            logging.error(f"Error in parse_pdf: {str(e)}")
+            logging.error(f"Error in aparse_pdf: {str(e)}")
             raise
 
     def parse_image(
@@ -1102,40 +1591,6 @@ class MineruParser(Parser):
             logging.error(f"Error in parse_office_doc: {str(e)}")
             raise
 
-    def parse_text_file(
-        self,
-        text_path: Union[str, Path],
-        output_dir: Optional[str] = None,
-        lang: Optional[str] = None,
-        **kwargs,
-    ) -> List[Dict[str, Any]]:
-        """
-        Parse text file by first converting to PDF, then parsing with MinerU 2.0
-
-        Supported formats: .txt, .md
-
-        Args:
-            text_path: Path to the text file (.txt, .md)
-            output_dir: Output directory path
-            lang: Document language for OCR optimization
-            **kwargs: Additional parameters for mineru command
-
-        Returns:
-            List[Dict[str, Any]]: List of content blocks
-        """
-        try:
-            # Convert text file to PDF using base class method
-            pdf_path = self.convert_text_to_pdf(text_path, output_dir)
-
-            # Parse the converted PDF
-            return self.parse_pdf(
-                pdf_path=pdf_path, output_dir=output_dir, lang=lang, **kwargs
-            )
-
-        except Exception as e:
-            logging.error(f"Error in parse_text_file: {str(e)}")
-            raise
-
     def parse_document(
         self,
         file_path: Union[str, Path],
@@ -1326,11 +1781,14 @@ class DoclingParser(Parser):
             return self.parse_office_doc(file_path, output_dir, lang, **kwargs)
         elif ext in self.HTML_FORMATS:
             return self.parse_html(file_path, output_dir, lang, **kwargs)
+        elif ext in self.TEXT_FORMATS:
+            return self.parse_text_file(file_path, output_dir, lang, **kwargs)
         else:
             raise ValueError(
                 f"Unsupported file format: {ext}. "
-                f"Docling only supports PDF files, Office formats ({', '.join(self.OFFICE_FORMATS)}) "
-                f"and HTML formats ({', '.join(self.HTML_FORMATS)})"
+                f"Docling only supports PDF files, Office formats ({', '.join(self.OFFICE_FORMATS)}), "
+                f"HTML formats ({', '.join(self.HTML_FORMATS)}) "
+                f"and text formats ({', '.join(self.TEXT_FORMATS)})"
             )
 
     def _run_docling_command(
@@ -1353,18 +1811,13 @@ class DoclingParser(Parser):
         file_output_dir = Path(output_dir) / file_stem / "docling"
         file_output_dir.mkdir(parents=True, exist_ok=True)
 
-        cmd_json = [
+        # One conversion emits both the JSON and the Markdown export
+        cmd = [
             "docling",
             "--output",
             str(file_output_dir),
             "--to",
             "json",
-            str(input_path),
-        ]
-        cmd_md = [
-            "docling",
-            "--output",
-            str(file_output_dir),
             "--to",
             "md",
             str(input_path),
@@ -1386,13 +1839,10 @@ class DoclingParser(Parser):
             if platform.system() == "Windows":
                 docling_subprocess_kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
 
-            result_json = subprocess.run(cmd_json, **docling_subprocess_kwargs)
-            result_md = subprocess.run(cmd_md, **docling_subprocess_kwargs)
+            result = subprocess.run(cmd, **docling_subprocess_kwargs)
             logging.info("Docling command executed successfully")
-            if result_json.stdout:
-                logging.debug(f"JSON cmd output: {result_json.stdout}")
-            if result_md.stdout:
-                logging.debug(f"Markdown cmd output: {result_md.stdout}")
+            if result.stdout:
+                logging.debug(f"Docling cmd output: {result.stdout}")
         except subprocess.CalledProcessError as e:
             logging.error(f"Error running docling command: {e}")
             if e.stderr:
@@ -1449,8 +1899,33 @@ class DoclingParser(Parser):
                     )
             except Exception as e:
                 logging.warning(f"Could not read or convert JSON file {json_file}: {e}")
+
+        # Derive Markdown from the JSON export if docling did not write it
+        if not md_content and json_file.exists():
+            md_content = self._markdown_from_json(json_file)
         return content_list, md_content
 
+    @staticmethod
+    def _markdown_from_json(json_file: Path) -> str:
+        """
+        Render Markdown from a docling JSON export
+
+        Args:
+            json_file: Path to the docling JSON file
+
+        Returns:
+            str: Markdown text, empty if docling_core is unavailable
+        """
+        try:
+            from docling_core.types.doc import DoclingDocument
+
+            with open(json_file, "r", encoding="utf-8") as f:
+                document = DoclingDocument.model_validate(json.load(f))
+            return document.export_to_markdown()
+        except Exception as e:
+            logging.warning(f"Could not derive markdown from {json_file}: {e}")
+            return ""
+
     def read_from_block_recursive(
         self,
         block,
@@ -0,0 +1,248 @@
+"""
+Persistent parser worker pool
+
+Keeps long-lived parser worker processes whose MinerU / Docling models stay
+loaded between documents, instead of paying model load for every `mineru` or
+`docling` CLI invocation. Jobs reach the workers over the executor's local queue.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from .parser import MineruParser, DoclingParser, MineruExecutionError
+
+# Parser of the current worker process, created once by _init_worker
+_worker_parser = None
+
+
+class WarmMineruParser(MineruParser):
+    """
+    MinerU parser that runs inference in the calling process
+
+    MinerU keeps its layout, OCR and formula models in process-wide singletons, so
+    running it in-process from a long-lived worker loads them only once.
+    Falls back to the `mineru` CLI when the Python API is unavailable.
+    """
+
+    __slots__ = ()
+
+    @staticmethod
+    def _run_mineru_command(
+        input_path: Union[str, Path],
+        output_dir: Union[str, Path],
+        method: str = "auto",
+        lang: Optional[str] = None,
+        backend: Optional[str] = None,
+        start_page: Optional[int] = None,
+        end_page: Optional[int] = None,
+        formula: bool = True,
+        table: bool = True,
+        device: Optional[str] = None,
+        source: Optional[str] = None,
+        vlm_url: Optional[str] = None,
+        timeout: Optional[float] = None,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> None:
+        """
+        Run MinerU through its Python API, same arguments as MineruParser._run_mineru_command
+
+        timeout and progress_callback only apply to the CLI fallback.
+        """
+        try:
+            from mineru.cli.common import do_parse, read_fn
+        except ImportError:
+            logging.warning(
+                "MinerU Python API not available in worker, falling back to the mineru CLI"
+            )
+            return MineruParser._run_mineru_command(
+                input_path=input_path,
+                output_dir=output_dir,
+                method=method,
+                lang=lang,
+                backend=backend,
+                start_page=start_page,
+                end_page=end_page,
+                formula=formula,
+                table=table,
+                device=device,
+                source=source,
+                vlm_url=vlm_url,
+                timeout=timeout,
+                progress_callback=progress_callback,
+            )
+
+        # The CLI passes these through the environment as well
+        if device:
+            os.environ["MINERU_DEVICE_MODE"] = device
+        if source:
+            os.environ["MINERU_MODEL_SOURCE"] = source
+
+        input_path = Path(input_path)
+        logging.info(f"Running in-process MinerU on {input_path.name}")
+
+        try:
+            do_parse(
+                output_dir=str(output_dir),
+                pdf_file_names=[input_path.stem],
+                pdf_bytes_list=[read_fn(input_path)],
+                p_lang_list=[lang or "ch"],
+                backend=backend or "pipeline",
+                parse_method=method,
+                formula_enable=formula,
+                table_enable=table,
+                server_url=vlm_url,
+                start_page_id=start_page or 0,
+                end_page_id=end_page,
+            )
+        except Exception as e:
+            logging.error(f"[MinerU] In-process parsing failed: {e}")
+            raise MineruExecutionError(1, [str(e)]) from e
+
+
+class WarmDoclingParser(DoclingParser):
+    """
+    Docling parser that reuses one DocumentConverter, and its loaded models,
+    for every document. Falls back to the `docling` CLI when the Python API is
+    unavailable.
+    """
+
+    def __init__(self) -> None:
+        """Initialize WarmDoclingParser"""
+        super().__init__()
+        self._converter = None
+
+    def _get_converter(self):
+        """Create the DocumentConverter on first use"""
+        if self._converter is None:
+            from docling.document_converter import DocumentConverter
+
+            try:
+                from docling.datamodel.base_models import InputFormat
+                from docling.datamodel.pipeline_options import PdfPipelineOptions
+                from docling.document_converter import PdfFormatOption
+
+                # Embed picture images in the JSON like the CLI does
+                pipeline_options = PdfPipelineOptions(generate_picture_images=True)
+                self._converter = DocumentConverter(
+                    format_options={
+                        InputFormat.PDF: PdfFormatOption(
+                            pipeline_options=pipeline_options
+                        )
+                    }
+                )
+            except ImportError:
+                self._converter = DocumentConverter()
+        return self._converter
+
+    def _run_docling_command(
+        self,
+        input_path: Union[str, Path],
+        output_dir: Union[str, Path],
+        file_stem: str,
+        **kwargs,
+    ) -> None:
+        """
+        Convert with the cached DocumentConverter, writing the same files as the CLI
+        """
+        try:
+            converter = self._get_converter()
+        except ImportError:
+            logging.warning(
+                "Docling Python API not available in worker, falling back to the docling CLI"
+            )
+            return super()._run_docling_command(
+                input_path, output_dir, file_stem, **kwargs
+            )
+
+        file_output_dir = Path(output_dir) / file_stem / "docling"
+        file_output_dir.mkdir(parents=True, exist_ok=True)
+
+        document = converter.convert(str(input_path)).document
+        with open(file_output_dir / f"{file_stem}.json", "w", encoding="utf-8") as f:
+            json.dump(document.export_to_dict(), f, ensure_ascii=False)
+        with open(file_output_dir / f"{file_stem}.md", "w", encoding="utf-8") as f:
+            f.write(document.export_to_markdown())
+        logging.info("In-process Docling conversion executed successfully")
+
+
+def _init_worker(parser_type: str) -> None:
+    """Create the warm parser of a worker process"""
+    global _worker_parser
+    _worker_parser = (
+        WarmDoclingParser() if parser_type == "docling" else WarmMineruParser()
+    )
+
+
+def _run_job(method_name: str, kwargs: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Run one parse job on the worker's warm parser"""
+    return getattr(_worker_parser, method_name)(**kwargs)
+
+
+class ParserWorkerPool:
+    """
+    Pool of long-lived parser processes
+
+    Each worker creates a warm parser once and keeps it, and its models, alive for
+    every job it runs. Workers are started lazily on the first submitted job.
+    """
+
+    def __init__(self, parser_type: str = "mineru", max_workers: int = 1):
+        """
+        Initialize parser worker pool
+
+        Args:
+            parser_type: Type of parser to use ("mineru" or "docling")
+            max_workers: Number of worker processes
+        """
+        if parser_type not in ("mineru", "docling"):
+            raise ValueError(f"Unsupported parser type: {parser_type}")
+
+        self.parser_type = parser_type
+        self.max_workers = max(1, max_workers)
+        self.logger = logging.getLogger(__name__)
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def start(self) -> "ParserWorkerPool":
+        """Start the worker processes if they are not running"""
+        if self._executor is None:
+            # Spawn instead of fork: the parent may hold threads and CUDA state
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.parser_type,),
+            )
+            self.logger.info(
+                f"Started {self.parser_type} parser worker pool with {self.max_workers} workers"
+            )
+        return self
+
+    async def submit(self, method_name: str, **kwargs) -> List[Dict[str, Any]]:
+        """
+        Run a parser method on a pooled worker
+
+        Args:
+            method_name: Parser method to call (e.g. "parse_pdf", "parse_office_doc")
+            **kwargs: Arguments for the parser method
+
+        Returns:
+            List[Dict[str, Any]]: List of content blocks
+        """
+        self.start()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, _run_job, method_name, kwargs)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker processes, cancelling jobs that have not started"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+            self.logger.info(f"Stopped {self.parser_type} parser worker pool")
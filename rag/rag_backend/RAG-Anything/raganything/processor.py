@@ -8,8 +8,10 @@ import os
 import time
 import hashlib
 import json
-from typing import Dict, List, Any, Tuple, Optional
+from typing import AsyncIterator, Dict, List, Any, Tuple, Optional
 from pathlib import Path
+from collections import deque
+from contextlib import aclosing
 
 from raganything.base import DocStatus
 from raganything.parser import MineruParser, DoclingParser, MineruExecutionError
@@ -18,14 +20,61 @@ from raganything.utils import (
     insert_text_content,
     insert_text_content_with_multimodal_content,
     get_processor_for_type,
+    compute_file_content_hash,
+    compute_file_fingerprint,
+    compute_image_dhash,
 )
+from raganything.cache import ImageHashIndex, IngestionMemo
+from raganything.tracing import (
+    annotate_trace,
+    span_progress_callback,
+    trace_span,
+    traced_ingestion,
+)
+from raganything.metrics import PARSE_SECONDS, PARSES_IN_FLIGHT
 import asyncio
-from lightrag.utils import compute_mdhash_id
 
 
 class ProcessorMixin:
     """ProcessorMixin class containing document processing functionality for RAGAnything"""
 
+    # Parser kwargs that change the parse result and therefore the cache key
+    _CACHE_RELEVANT_KWARGS = [
+        "lang",
+        "device",
+        "start_page",
+        "end_page",
+        "formula",
+        "table",
+        "backend",
+        "source",
+        "render_pdf",
+    ]
+
+    def _build_parse_config(self, parse_method: str = None, **kwargs) -> Dict[str, Any]:
+        """
+        Build the parsing configuration that a cached result must match
+
+        Args:
+            parse_method: Parse method used
+            **kwargs: Additional parser parameters
+
+        Returns:
+            Dict[str, Any]: Parser, parse method and relevant parser kwargs
+        """
+        parse_config = {
+            "parser": self.config.parser,
+            "parse_method": parse_method or self.config.parse_method,
+        }
+
+        # Add relevant kwargs to config
+        relevant_kwargs = {
+            k: v for k, v in kwargs.items() if k in self._CACHE_RELEVANT_KWARGS
+        }
+        parse_config.update(relevant_kwargs)
+
+        return parse_config
+
     def _generate_cache_key(
         self, file_path: Path, parse_method: str = None, **kwargs
     ) -> str:
@@ -48,34 +97,82 @@ class ProcessorMixin:
         config_dict = {
             "file_path": str(file_path.absolute()),
             "mtime": mtime,
-            "parser": self.config.parser,
-            "parse_method": parse_method or self.config.parse_method,
+            **self._build_parse_config(parse_method, **kwargs),
         }
 
-        # Add relevant kwargs to config
-        relevant_kwargs = {
-            k: v
-            for k, v in kwargs.items()
-            if k
-            in [
-                "lang",
-                "device",
-                "start_page",
-                "end_page",
-                "formula",
-                "table",
-                "backend",
-                "source",
-            ]
-        }
-        config_dict.update(relevant_kwargs)
-
         # Generate hash from config
         config_str = json.dumps(config_dict, sort_keys=True)
         cache_key = hashlib.md5(config_str.encode()).hexdigest()
 
         return cache_key
 
+    def _generate_content_cache_key(
+        self, content_hash: str, parse_method: str = None, **kwargs
+    ) -> str:
+        """
+        Generate cache key based on file content and parsing configuration
+
+        Args:
+            content_hash: SHA-256 hash of the file bytes
+            parse_method: Parse method used
+            **kwargs: Additional parser parameters
+
+        Returns:
+            str: Cache key for the content and configuration
+        """
+        config_dict = {
+            "content_hash": content_hash,
+            **self._build_parse_config(parse_method, **kwargs),
+        }
+        config_str = json.dumps(config_dict, sort_keys=True)
+        return f"content-{hashlib.md5(config_str.encode()).hexdigest()}"
+
+    def get_parse_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get parse cache hit/miss counters
+
+        Returns:
+            Dict[str, Any]: Counters for the path and content tiers of the parse cache
+        """
+        return self.parse_cache_stats.to_dict()
+
+    def get_ingestion_trace(
+        self, doc_id: str, include_spans: bool = True
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get the timing trace of a recent ingestion
+
+        Args:
+            doc_id: Document ID, or the file path for an ingestion that failed
+                before its doc_id was known
+            include_spans: Include every span, not only the per-stage summary
+
+        Returns:
+            Optional[Dict[str, Any]]: Trace as a dict, or None if not recorded
+        """
+        trace = self.ingestion_traces.get(doc_id)
+        return trace.to_dict(include_spans) if trace is not None else None
+
+    def _record_ingestion_trace(self, trace):
+        """Keep a finished ingestion trace and export it if configured"""
+        key = trace.attributes.get("doc_id") or trace.name
+        self.ingestion_traces.pop(key, None)
+        self.ingestion_traces[key] = trace
+        while len(self.ingestion_traces) > self.config.max_ingestion_traces:
+            self.ingestion_traces.popitem(last=False)
+
+        if self.config.ingestion_trace_file:
+            try:
+                trace.export(self.config.ingestion_trace_file)
+            except OSError as e:
+                self.logger.warning(f"Failed to export ingestion trace: {e}")
+
+        stages = ", ".join(
+            f"{name} {stage['total_seconds']:.2f}s"
+            for name, stage in list(trace.summary().items())[:5]
+        )
+        self.logger.info(f"Ingestion trace for {key}: {stages}")
+
     def _generate_content_based_doc_id(self, content_list: List[Dict[str, Any]]) -> str:
         """
         Generate doc_id based on document content
@@ -148,33 +245,23 @@ class ProcessorMixin:
 
             # Check parsing configuration
             cached_config = cached_data.get("parse_config", {})
-            current_config = {
-                "parser": self.config.parser,
-                "parse_method": parse_method or self.config.parse_method,
-            }
-
-            # Add relevant kwargs to current config
-            relevant_kwargs = {
-                k: v
-                for k, v in kwargs.items()
-                if k
-                in [
-                    "lang",
-                    "device",
-                    "start_page",
-                    "end_page",
-                    "formula",
-                    "table",
-                    "backend",
-                    "source",
-                ]
-            }
-            current_config.update(relevant_kwargs)
+            current_config = self._build_parse_config(parse_method, **kwargs)
 
             if cached_config != current_config:
                 self.logger.debug(f"Cache invalid - config changed: {cache_key}")
                 return None
 
+            # Entries written with the content tier enabled only reference the content entry
+            content_cache_key = cached_data.get("content_cache_key")
+            if content_cache_key and not cached_data.get("content_list"):
+                content_data = await self.parse_cache.get_by_id(content_cache_key)
+                if not content_data:
+                    self.logger.debug(
+                        f"Cache incomplete - content entry missing: {content_cache_key}"
+                    )
+                    return None
+                cached_data = content_data
+
             content_list = cached_data.get("content_list", [])
             doc_id = cached_data.get("doc_id")
 
@@ -201,6 +288,8 @@ class ProcessorMixin:
         doc_id: str,
         file_path: Path,
         parse_method: str = None,
+        content_hash: str = None,
+        fingerprint: str = None,
         **kwargs,
     ) -> None:
         """
@@ -212,6 +301,8 @@ class ProcessorMixin:
             doc_id: Content-based document ID
             file_path: Path to the file for mtime storage
             parse_method: Parse method used
+            content_hash: SHA-256 of the file bytes, enables the content tier when given
+            fingerprint: Size + head/tail fingerprint of the file, required with content_hash
             **kwargs: Additional parser parameters
         """
         if not hasattr(self, "parse_cache") or self.parse_cache is None:
@@ -222,105 +313,367 @@ class ProcessorMixin:
             file_mtime = file_path.stat().st_mtime
 
             # Create parsing configuration
-            parse_config = {
-                "parser": self.config.parser,
-                "parse_method": parse_method or self.config.parse_method,
-            }
-
-            # Add relevant kwargs to config
-            relevant_kwargs = {
-                k: v
-                for k, v in kwargs.items()
-                if k
-                in [
-                    "lang",
-                    "device",
-                    "start_page",
-                    "end_page",
-                    "formula",
-                    "table",
-                    "backend",
-                    "source",
-                ]
+            parse_config = self._build_parse_config(parse_method, **kwargs)
+
+            cache_entry = {
+                "doc_id": doc_id,
+                "mtime": file_mtime,
+                "parse_config": parse_config,
+                "cached_at": time.time(),
+                "cache_version": "1.0",
             }
-            parse_config.update(relevant_kwargs)
+            cache_data = {}
 
-            cache_data = {
-                cache_key: {
+            if content_hash:
+                # Store the content once under its content key; the path entry only
+                # references it so identical bytes under other paths share it
+                content_cache_key = self._generate_content_cache_key(
+                    content_hash, parse_method, **kwargs
+                )
+                cache_data[content_cache_key] = {
                     "content_list": content_list,
                     "doc_id": doc_id,
-                    "mtime": file_mtime,
+                    "content_hash": content_hash,
                     "parse_config": parse_config,
-                    "cached_at": time.time(),
+                    "cached_at": cache_entry["cached_at"],
                     "cache_version": "1.0",
                 }
-            }
-            await self.parse_cache.upsert(cache_data)
-            # Ensure data is persisted to disk
-            await self.parse_cache.index_done_callback()
+                cache_entry["content_cache_key"] = content_cache_key
+
+                # Register the content hash under the cheap size + head/tail fingerprint
+                fingerprint_key = f"fingerprint-{fingerprint}"
+                fingerprint_data = await self.parse_cache.get_by_id(fingerprint_key)
+                content_hashes = (
+                    fingerprint_data.get("content_hashes", [])
+                    if fingerprint_data
+                    else []
+                )
+                if content_hash not in content_hashes:
+                    cache_data[fingerprint_key] = {
+                        "content_hashes": content_hashes + [content_hash]
+                    }
+            else:
+                cache_entry["content_list"] = content_list
+
+            cache_data[cache_key] = cache_entry
+            with trace_span("flush.parse_cache"):
+                await self.parse_cache.upsert(cache_data)
+                # Ensure data is persisted to disk
+                await self.parse_cache.index_done_callback()
             self.logger.info(f"Stored parsing result in cache: {cache_key}")
         except Exception as e:
             self.logger.warning(f"Error storing to parse cache: {e}")
 
-    async def parse_document(
+    async def _get_content_cached_result(
+        self, file_path: Path, fingerprint: str, parse_method: str = None, **kwargs
+    ) -> tuple[tuple[List[Dict[str, Any]], str] | None, str | None]:
+        """
+        Get cached parsing result for a file with identical bytes, wherever it lives
+
+        The cheap size + head/tail fingerprint is checked first; the full content hash
+        is only computed when some cached file shares that fingerprint.
+
+        Args:
+            file_path: Path to the file
+            fingerprint: Size + head/tail fingerprint of the file
+            parse_method: Parse method used
+            **kwargs: Additional parser parameters
+
+        Returns:
+            tuple: ((content_list, doc_id) or None if not found, content hash if it was computed)
+        """
+        if not hasattr(self, "parse_cache") or self.parse_cache is None:
+            return None, None
+
+        content_hash = None
+        try:
+            fingerprint_data = await self.parse_cache.get_by_id(
+                f"fingerprint-{fingerprint}"
+            )
+            if not fingerprint_data or not fingerprint_data.get("content_hashes"):
+                self.parse_cache_stats.precheck_rejects += 1
+                return None, None
+
+            content_hash = await asyncio.to_thread(compute_file_content_hash, file_path)
+            self.parse_cache_stats.hashed_bytes += file_path.stat().st_size
+            if content_hash not in fingerprint_data["content_hashes"]:
+                return None, content_hash
+
+            content_cache_key = self._generate_content_cache_key(
+                content_hash, parse_method, **kwargs
+            )
+            cached_data = await self.parse_cache.get_by_id(content_cache_key)
+            if not cached_data:
+                return None, content_hash
+
+            if cached_data.get("parse_config", {}) != self._build_parse_config(
+                parse_method, **kwargs
+            ):
+                self.logger.debug(
+                    f"Content cache invalid - config changed: {content_cache_key}"
+                )
+                return None, content_hash
+
+            content_list = cached_data.get("content_list", [])
+            doc_id = cached_data.get("doc_id")
+            if content_list and doc_id:
+                self.logger.debug(
+                    f"Found cached parsing result for identical content: {content_cache_key}"
+                )
+                return (content_list, doc_id), content_hash
+
+        except Exception as e:
+            self.logger.warning(f"Error accessing content parse cache: {e}")
+
+        return None, content_hash
+
+    async def _run_parser(
+        self, doc_parser, method_name: str, **kwargs
+    ) -> List[Dict[str, Any]]:
+        """
+        Run a parser method on the persistent worker pool if enabled, otherwise
+        asynchronously (MinerU PDFs) or in a thread
+
+        Outside the worker pool, MinerU is killed after config.parser_timeout and
+        reports its progress on the method's trace span.
+
+        Args:
+            doc_parser: Parser instance used when the worker pool is disabled
+            method_name: Parser method to call
+            **kwargs: Arguments for the parser method
+
+        Returns:
+            List[Dict[str, Any]]: List of content blocks
+        """
+        with PARSES_IN_FLIGHT.track_inprogress(), PARSE_SECONDS.time(
+            method=method_name
+        ), trace_span(method_name) as span:
+            if self.config.use_parser_worker_pool:
+                return await self._get_parser_pool().submit(method_name, **kwargs)
+            if isinstance(doc_parser, MineruParser):
+                kwargs.update(
+                    timeout=self.config.parser_timeout or None,
+                    progress_callback=span_progress_callback(span),
+                )
+            if method_name == "parse_pdf" and hasattr(doc_parser, "aparse_pdf"):
+                # Await the mineru subprocess directly instead of holding a thread
+                return await doc_parser.aparse_pdf(**kwargs)
+            return await asyncio.to_thread(getattr(doc_parser, method_name), **kwargs)
+
+    async def _get_shardable_page_count(
+        self, file_path: Path, **kwargs
+    ) -> Optional[int]:
+        """
+        Get the page count of a PDF that should be parsed in page shards
+
+        Sharding only applies to MinerU, and only when the caller did not request
+        an explicit page range.
+
+        Args:
+            file_path: Path to the PDF file
+            **kwargs: Parser parameters of the current parse
+
+        Returns:
+            Optional[int]: Page count if the PDF should be sharded, otherwise None
+        """
+        if (
+            self.config.parser != "mineru"
+            or self.config.pdf_shard_pages <= 0
+            or kwargs.get("start_page") is not None
+            or kwargs.get("end_page") is not None
+        ):
+            return None
+
+        page_count = await asyncio.to_thread(MineruParser.get_pdf_page_count, file_path)
+        if not page_count or page_count < max(
+            self.config.pdf_shard_min_pages, self.config.pdf_shard_pages + 1
+        ):
+            return None
+        return page_count
+
+    async def _iter_pdf_shards(
         self,
-        file_path: str,
-        output_dir: str = None,
-        parse_method: str = None,
-        display_stats: bool = None,
+        doc_parser,
+        file_path: Path,
+        output_dir: str,
+        parse_method: str,
+        page_count: int,
         **kwargs,
-    ) -> tuple[List[Dict[str, Any]], str]:
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
         """
-        Parse document with caching support
+        Parse a PDF as concurrent page-range shards, yielding shard results in page order
+
+        Each shard is written to its own output directory, so image files never
+        collide, and its page_idx values are shifted back to document page numbers.
+        At most pdf_shard_workers shards are parsed or waiting to be taken ahead of
+        the consumer: the next shard starts when the consumer asks for another
+        result, so a consumer that falls behind holds parsing back.
 
         Args:
-            file_path: Path to the file to parse
-            output_dir: Output directory (defaults to config.parser_output_dir)
-            parse_method: Parse method (defaults to config.parse_method)
-            display_stats: Whether to display content statistics (defaults to config.display_content_stats)
-            **kwargs: Additional parameters for parser (e.g., lang, device, start_page, end_page, formula, table, backend, source)
+            doc_parser: Parser instance
+            file_path: Path to the PDF file
+            output_dir: Output directory
+            parse_method: Parse method
+            page_count: Number of pages in the PDF
+            **kwargs: Additional parameters for the parser
+
+        Yields:
+            List[Dict[str, Any]]: Content blocks of one shard
+        """
+        shard_pages = self.config.pdf_shard_pages
+        # end_page is inclusive for MinerU
+        shards = [
+            (start, min(start + shard_pages, page_count) - 1)
+            for start in range(0, page_count, shard_pages)
+        ]
+        shard_root = Path(output_dir) / f"{file_path.stem}_shards"
+        workers = max(1, self.config.pdf_shard_workers)
 
-        Returns:
-            tuple[List[Dict[str, Any]], str]: (content_list, doc_id)
+        self.logger.info(
+            f"Parsing {page_count} pages of {file_path.name} as {len(shards)} shards "
+            f"of up to {shard_pages} pages"
+        )
+
+        async def parse_shard(start: int, end: int) -> List[Dict[str, Any]]:
+            shard_content = await self._run_parser(
+                doc_parser,
+                "parse_pdf",
+                pdf_path=file_path,
+                output_dir=str(shard_root / f"pages_{start}_{end}"),
+                method=parse_method,
+                start_page=start,
+                end_page=end,
+                **kwargs,
+            )
+            for item in shard_content:
+                if isinstance(item, dict):
+                    item["page_idx"] = item.get("page_idx", 0) + start
+            self.logger.debug(
+                f"Shard pages {start}-{end} produced {len(shard_content)} content blocks"
+            )
+            return shard_content
+
+        tasks = deque(
+            asyncio.create_task(parse_shard(start, end))
+            for start, end in shards[:workers]
+        )
+        next_shard = len(tasks)
+        try:
+            while tasks:
+                shard_content = await tasks.popleft()
+                yield shard_content
+                # Only start another shard once the consumer is back for more
+                if next_shard < len(shards):
+                    tasks.append(asyncio.create_task(parse_shard(*shards[next_shard])))
+                    next_shard += 1
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _parse_pdf_sharded(
+        self,
+        doc_parser,
+        file_path: Path,
+        output_dir: str,
+        parse_method: str,
+        page_count: int,
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
         """
-        # Use config defaults if not provided
-        if output_dir is None:
-            output_dir = self.config.parser_output_dir
-        if parse_method is None:
-            parse_method = self.config.parse_method
-        if display_stats is None:
-            display_stats = self.config.display_content_stats
+        Parse a PDF as concurrent page-range shards and merge the results
 
-        self.logger.info(f"Starting document parsing: {file_path}")
+        Args:
+            doc_parser: Parser instance
+            file_path: Path to the PDF file
+            output_dir: Output directory
+            parse_method: Parse method
+            page_count: Number of pages in the PDF
+            **kwargs: Additional parameters for the parser
 
-        file_path = Path(file_path)
-        if not file_path.exists():
-            raise FileNotFoundError(f"File not found: {file_path}")
+        Returns:
+            List[Dict[str, Any]]: Merged content blocks in page order
+        """
+        content_list = []
+        async for shard_content in self._iter_pdf_shards(
+            doc_parser, file_path, output_dir, parse_method, page_count, **kwargs
+        ):
+            content_list.extend(shard_content)
+        return content_list
+
+    async def _lookup_parse_cache(
+        self, file_path: Path, cache_key: str, parse_method: str, **kwargs
+    ) -> Tuple[
+        Optional[Tuple[List[Dict[str, Any]], str]], Optional[str], Optional[str]
+    ]:
+        """
+        Look a document up in the path tier, then the content tier, of the parse cache
 
-        # Generate cache key based on file and configuration
-        cache_key = self._generate_cache_key(file_path, parse_method, **kwargs)
+        Args:
+            file_path: Path to the file
+            cache_key: Path-based cache key
+            parse_method: Parse method
+            **kwargs: Parser parameters
 
-        # Check cache first
+        Returns:
+            Tuple of (cached (content_list, doc_id) or None, fingerprint, content_hash),
+            where fingerprint and content_hash are whatever the lookup already computed
+        """
         cached_result = await self._get_cached_result(
             cache_key, file_path, parse_method, **kwargs
         )
+        fingerprint = None
+        content_hash = None
         if cached_result is not None:
-            content_list, doc_id = cached_result
-            self.logger.info(f"Using cached parsing result for: {file_path}")
-            if display_stats:
-                self.logger.info(
-                    f"* Total blocks in cached content_list: {len(content_list)}"
+            self.parse_cache_stats.path_hits += 1
+        elif self.config.enable_content_hash_cache:
+            # Fall back to files with identical bytes under another path or mtime
+            fingerprint = await asyncio.to_thread(compute_file_fingerprint, file_path)
+            cached_result, content_hash = await self._get_content_cached_result(
+                file_path, fingerprint, parse_method, **kwargs
+            )
+            if cached_result is not None:
+                self.parse_cache_stats.content_hits += 1
+                # Point this path at the shared content entry for future lookups
+                content_list, doc_id = cached_result
+                await self._store_cached_result(
+                    cache_key,
+                    content_list,
+                    doc_id,
+                    file_path,
+                    parse_method,
+                    content_hash=content_hash,
+                    fingerprint=fingerprint,
+                    **kwargs,
                 )
-            return content_list, doc_id
 
+        if cached_result is None:
+            self.parse_cache_stats.misses += 1
+        return cached_result, fingerprint, content_hash
+
+    def _get_doc_parser(self):
+        """Create a parser instance for the configured parser"""
+        return DoclingParser() if self.config.parser == "docling" else MineruParser()
+
+    async def _parse_uncached(
+        self, file_path: Path, output_dir: str, parse_method: str, **kwargs
+    ) -> List[Dict[str, Any]]:
+        """
+        Parse a document with the configured parser based on its file extension
+
+        Args:
+            file_path: Path to the file to parse
+            output_dir: Output directory
+            parse_method: Parse method
+            **kwargs: Additional parameters for parser
+
+        Returns:
+            List[Dict[str, Any]]: List of content blocks
+        """
         # Choose appropriate parsing method based on file extension
         ext = file_path.suffix.lower()
 
         try:
-            doc_parser = (
-                DoclingParser() if self.config.parser == "docling" else MineruParser()
-            )
-
+            doc_parser = self._get_doc_parser()
             # Log parser and method information
             self.logger.info(
                 f"Using {self.config.parser} parser with method: {parse_method}"
@@ -328,13 +681,25 @@ class ProcessorMixin:
 
             if ext in [".pdf"]:
                 self.logger.info("Detected PDF file, using parser for PDF...")
-                content_list = await asyncio.to_thread(
-                    doc_parser.parse_pdf,
-                    pdf_path=file_path,
-                    output_dir=output_dir,
-                    method=parse_method,
-                    **kwargs,
-                )
+                page_count = await self._get_shardable_page_count(file_path, **kwargs)
+                if page_count:
+                    content_list = await self._parse_pdf_sharded(
+                        doc_parser,
+                        file_path,
+                        output_dir,
+                        parse_method,
+                        page_count,
+                        **kwargs,
+                    )
+                else:
+                    content_list = await self._run_parser(
+                        doc_parser,
+                        "parse_pdf",
+                        pdf_path=file_path,
+                        output_dir=output_dir,
+                        method=parse_method,
+                        **kwargs,
+                    )
             elif ext in [
                 ".jpg",
                 ".jpeg",
@@ -348,8 +713,9 @@ class ProcessorMixin:
                 self.logger.info("Detected image file, using parser for images...")
                 # Use the selected parser's image parsing capability
                 if hasattr(doc_parser, "parse_image"):
-                    content_list = await asyncio.to_thread(
-                        doc_parser.parse_image,
+                    content_list = await self._run_parser(
+                        doc_parser,
+                        "parse_image",
                         image_path=file_path,
                         output_dir=output_dir,
                         **kwargs,
@@ -376,19 +742,39 @@ class ProcessorMixin:
                 self.logger.info(
                     "Detected Office or HTML document, using parser for Office/HTML..."
                 )
-                content_list = await asyncio.to_thread(
-                    doc_parser.parse_office_doc,
+                content_list = await self._run_parser(
+                    doc_parser,
+                    "parse_office_doc",
                     doc_path=file_path,
                     output_dir=output_dir,
                     **kwargs,
                 )
+            elif ext in doc_parser.TEXT_FORMATS:
+                self.logger.info("Detected text file, using parser for text...")
+                if kwargs.get("render_pdf"):
+                    # Rendering to PDF runs the full PDF parser
+                    content_list = await self._run_parser(
+                        doc_parser,
+                        "parse_text_file",
+                        text_path=file_path,
+                        output_dir=output_dir,
+                        **kwargs,
+                    )
+                else:
+                    content_list = await asyncio.to_thread(
+                        doc_parser.parse_text_file,
+                        text_path=file_path,
+                        output_dir=output_dir,
+                        **kwargs,
+                    )
             else:
                 # For other or unknown formats, use generic parser
                 self.logger.info(
                     f"Using generic parser for {ext} file (method={parse_method})..."
                 )
-                content_list = await asyncio.to_thread(
-                    doc_parser.parse_document,
+                content_list = await self._run_parser(
+                    doc_parser,
+                    "parse_document",
                     file_path=file_path,
                     method=parse_method,
                     output_dir=output_dir,
@@ -404,6 +790,35 @@ class ProcessorMixin:
             )
             raise e
 
+        return content_list
+
+    async def _finish_parse(
+        self,
+        file_path: Path,
+        content_list: List[Dict[str, Any]],
+        cache_key: str,
+        parse_method: str,
+        display_stats: bool,
+        fingerprint: Optional[str] = None,
+        content_hash: Optional[str] = None,
+        **kwargs,
+    ) -> str:
+        """
+        Validate a fresh parse result, derive its doc_id and store it in the parse cache
+
+        Args:
+            file_path: Path to the parsed file
+            content_list: Parsed content blocks
+            cache_key: Path-based cache key
+            parse_method: Parse method
+            display_stats: Whether to display content statistics
+            fingerprint: File fingerprint, if already computed
+            content_hash: File content hash, if already computed
+            **kwargs: Parser parameters
+
+        Returns:
+            str: Content-based doc_id
+        """
         msg = f"Parsing {file_path} complete! Extracted {len(content_list)} content blocks"
         self.logger.info(msg)
 
@@ -414,8 +829,18 @@ class ProcessorMixin:
         doc_id = self._generate_content_based_doc_id(content_list)
 
         # Store result in cache
+        if self.config.enable_content_hash_cache and content_hash is None:
+            content_hash = await asyncio.to_thread(compute_file_content_hash, file_path)
+            self.parse_cache_stats.hashed_bytes += file_path.stat().st_size
         await self._store_cached_result(
-            cache_key, content_list, doc_id, file_path, parse_method, **kwargs
+            cache_key,
+            content_list,
+            doc_id,
+            file_path,
+            parse_method,
+            content_hash=content_hash,
+            fingerprint=fingerprint,
+            **kwargs,
         )
 
         # Display content statistics if requested
@@ -435,7 +860,173 @@ class ProcessorMixin:
             for block_type, count in block_types.items():
                 self.logger.info(f"  - {block_type}: {count}")
 
-        return content_list, doc_id
+        return doc_id
+
+    async def parse_document(
+        self,
+        file_path: str,
+        output_dir: str = None,
+        parse_method: str = None,
+        display_stats: bool = None,
+        **kwargs,
+    ) -> tuple[List[Dict[str, Any]], str]:
+        """
+        Parse document with caching support
+
+        Args:
+            file_path: Path to the file to parse
+            output_dir: Output directory (defaults to config.parser_output_dir)
+            parse_method: Parse method (defaults to config.parse_method)
+            display_stats: Whether to display content statistics (defaults to config.display_content_stats)
+            **kwargs: Additional parameters for parser (e.g., lang, device, start_page, end_page, formula, table, backend, source)
+
+        Returns:
+            tuple[List[Dict[str, Any]], str]: (content_list, doc_id)
+        """
+        # Use config defaults if not provided
+        if output_dir is None:
+            output_dir = self.config.parser_output_dir
+        if parse_method is None:
+            parse_method = self.config.parse_method
+        if display_stats is None:
+            display_stats = self.config.display_content_stats
+
+        self.logger.info(f"Starting document parsing: {file_path}")
+
+        file_path = Path(file_path)
+        if not file_path.exists():
+            raise FileNotFoundError(f"File not found: {file_path}")
+
+        with trace_span("parse_document", parse_method=parse_method) as span:
+            # Generate cache key based on file and configuration
+            cache_key = self._generate_cache_key(file_path, parse_method, **kwargs)
+
+            # Check cache first
+            cached_result, fingerprint, content_hash = await self._lookup_parse_cache(
+                file_path, cache_key, parse_method, **kwargs
+            )
+            if span is not None:
+                span.attributes["cached"] = cached_result is not None
+            if cached_result is not None:
+                content_list, doc_id = cached_result
+                self.logger.info(f"Using cached parsing result for: {file_path}")
+                if display_stats:
+                    self.logger.info(
+                        f"* Total blocks in cached content_list: {len(content_list)}"
+                    )
+                return content_list, doc_id
+
+            content_list = await self._parse_uncached(
+                file_path, output_dir, parse_method, **kwargs
+            )
+            doc_id = await self._finish_parse(
+                file_path,
+                content_list,
+                cache_key,
+                parse_method,
+                display_stats,
+                fingerprint=fingerprint,
+                content_hash=content_hash,
+                **kwargs,
+            )
+            return content_list, doc_id
+
+    async def parse_document_stream(
+        self,
+        file_path: str,
+        output_dir: str = None,
+        parse_method: str = None,
+        display_stats: bool = None,
+        **kwargs,
+    ) -> AsyncIterator[Tuple[List[Dict[str, Any]], Optional[str]]]:
+        """
+        Parse document incrementally, yielding content blocks as they become available
+
+        Large PDFs parsed in page shards are yielded shard by shard in page order;
+        cached results and other documents arrive as a single batch. The parse
+        result is cached exactly as parse_document does, and the stream is timed
+        by a parse_document span, which includes time the consumer spends
+        between items.
+
+        Args:
+            file_path: Path to the file to parse
+            output_dir: Output directory (defaults to config.parser_output_dir)
+            parse_method: Parse method (defaults to config.parse_method)
+            display_stats: Whether to display content statistics (defaults to config.display_content_stats)
+            **kwargs: Additional parameters for parser (e.g., lang, device, start_page, end_page, formula, table, backend, source)
+
+        Yields:
+            Tuple[List[Dict[str, Any]], Optional[str]]: (content blocks, doc_id), where
+            doc_id is None until the last item. A cached result is a single item
+            carrying the doc_id; a fresh parse ends with the doc_id and no blocks
+        """
+        # Use config defaults if not provided
+        if output_dir is None:
+            output_dir = self.config.parser_output_dir
+        if parse_method is None:
+            parse_method = self.config.parse_method
+        if display_stats is None:
+            display_stats = self.config.display_content_stats
+
+        self.logger.info(f"Starting streaming document parsing: {file_path}")
+
+        file_path = Path(file_path)
+        if not file_path.exists():
+            raise FileNotFoundError(f"File not found: {file_path}")
+
+        # The consumer runs between the yields, so its spans are not nested under this one
+        with trace_span(
+            "parse_document", nest=False, parse_method=parse_method, streaming=True
+        ) as span:
+            cache_key = self._generate_cache_key(file_path, parse_method, **kwargs)
+            cached_result, fingerprint, content_hash = await self._lookup_parse_cache(
+                file_path, cache_key, parse_method, **kwargs
+            )
+            if span is not None:
+                span.attributes["cached"] = cached_result is not None
+            if cached_result is not None:
+                content_list, doc_id = cached_result
+                self.logger.info(f"Using cached parsing result for: {file_path}")
+                yield content_list, doc_id
+                return
+
+            page_count = None
+            if file_path.suffix.lower() == ".pdf":
+                page_count = await self._get_shardable_page_count(file_path, **kwargs)
+
+            if page_count:
+                content_list = []
+                try:
+                    async for shard_content in self._iter_pdf_shards(
+                        self._get_doc_parser(),
+                        file_path,
+                        output_dir,
+                        parse_method,
+                        page_count,
+                        **kwargs,
+                    ):
+                        content_list.extend(shard_content)
+                        yield shard_content, None
+                except MineruExecutionError as e:
+                    self.logger.error(f"Mineru command failed: {e}")
+                    raise
+            else:
+                content_list = await self._parse_uncached(
+                    file_path, output_dir, parse_method, **kwargs
+                )
+                yield content_list, None
+
+            doc_id = await self._finish_parse(
+                file_path,
+                content_list,
+                cache_key,
+                parse_method,
+                display_stats,
+                fingerprint=fingerprint,
+                content_hash=content_hash,
+                **kwargs,
+            )
+            yield [], doc_id
 
     async def _process_multimodal_content(
         self,
@@ -462,7 +1053,7 @@ class ProcessorMixin:
 
         # Check multimodal processing status - handle LightRAG's early DocStatus.PROCESSED marking
         try:
-            existing_doc_status = await self.lightrag.doc_status.get_by_id(doc_id)
+            existing_doc_status = await self._get_doc_status(doc_id)
             if existing_doc_status:
                 # Check if multimodal content is already processed
                 multimodal_processed = existing_doc_status.get(
@@ -548,7 +1139,7 @@ class ProcessorMixin:
         multimodal_chunk_ids = []
 
         # Get current text chunks count to set proper order indexes for multimodal chunks
-        existing_doc_status = await self.lightrag.doc_status.get_by_id(doc_id)
+        existing_doc_status = await self._get_doc_status(doc_id)
         existing_chunks_count = (
             existing_doc_status.get("chunks_count", 0) if existing_doc_status else 0
         )
@@ -572,20 +1163,23 @@ class ProcessorMixin:
                     }
 
                     # Process content and get chunk results instead of immediately merging
-                    (
-                        enhanced_caption,
-                        entity_info,
-                        chunk_results,
-                    ) = await processor.process_multimodal_content(
-                        modal_content=item,
-                        content_type=content_type,
-                        file_path=file_name,
-                        item_info=item_info,  # Pass item info for context extraction
-                        batch_mode=True,
-                        doc_id=doc_id,  # Pass doc_id for proper association
-                        chunk_order_index=existing_chunks_count
-                        + i,  # Proper order index
-                    )
+                    with trace_span(
+                        "process_multimodal_content", content_type=content_type
+                    ):
+                        (
+                            enhanced_caption,
+                            entity_info,
+                            chunk_results,
+                        ) = await processor.process_multimodal_content(
+                            modal_content=item,
+                            content_type=content_type,
+                            file_path=file_name,
+                            item_info=item_info,  # Pass item info for context extraction
+                            batch_mode=True,
+                            doc_id=doc_id,  # Pass doc_id for proper association
+                            chunk_order_index=existing_chunks_count
+                            + i,  # Proper order index
+                        )
 
                     # Collect chunk results for batch processing
                     all_chunk_results.extend(chunk_results)
@@ -612,7 +1206,7 @@ class ProcessorMixin:
         if multimodal_chunk_ids:
             try:
                 # Get current document status
-                current_doc_status = await self.lightrag.doc_status.get_by_id(doc_id)
+                current_doc_status = await self._get_doc_status(doc_id)
 
                 if current_doc_status:
                     existing_chunks_list = current_doc_status.get("chunks_list", [])
@@ -624,21 +1218,18 @@ class ProcessorMixin:
                         multimodal_chunk_ids
                     )
 
-                    # Update document status with integrated chunk list
-                    await self.lightrag.doc_status.upsert(
+                    # Update document status with integrated chunk list; persisted
+                    # with the multimodal completion mark at the end of the document
+                    await self._update_doc_status(
+                        doc_id,
                         {
-                            doc_id: {
-                                **current_doc_status,  # Keep existing fields
-                                "chunks_list": updated_chunks_list,  # Integrated chunks list
-                                "chunks_count": updated_chunks_count,  # Updated total count
-                                "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S+00:00"),
-                            }
-                        }
+                            "chunks_list": updated_chunks_list,  # Integrated chunks list
+                            "chunks_count": updated_chunks_count,  # Updated total count
+                            "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S+00:00"),
+                        },
+                        current_doc_status,
                     )
 
-                    # Ensure doc_status update is persisted to disk
-                    await self.lightrag.doc_status.index_done_callback()
-
                     self.logger.info(
                         f"Updated doc_status with {len(multimodal_chunk_ids)} multimodal chunks integrated into chunks_list"
                     )
@@ -660,30 +1251,205 @@ class ProcessorMixin:
             pipeline_status = await get_namespace_data("pipeline_status")
             pipeline_status_lock = get_pipeline_status_lock()
 
-            await merge_nodes_and_edges(
-                chunk_results=all_chunk_results,
-                knowledge_graph_inst=self.lightrag.chunk_entity_relation_graph,
-                entity_vdb=self.lightrag.entities_vdb,
-                relationships_vdb=self.lightrag.relationships_vdb,
-                global_config=self.lightrag.__dict__,
-                full_entities_storage=self.lightrag.full_entities,
-                full_relations_storage=self.lightrag.full_relations,
-                doc_id=doc_id,
-                pipeline_status=pipeline_status,
-                pipeline_status_lock=pipeline_status_lock,
-                llm_response_cache=self.lightrag.llm_response_cache,
-                current_file_number=1,
-                total_files=1,
-                file_path=file_name,
-            )
+            with trace_span("merge_nodes_and_edges"):
+                await merge_nodes_and_edges(
+                    chunk_results=all_chunk_results,
+                    knowledge_graph_inst=self.lightrag.chunk_entity_relation_graph,
+                    entity_vdb=self.lightrag.entities_vdb,
+                    relationships_vdb=self.lightrag.relationships_vdb,
+                    global_config=self.lightrag.__dict__,
+                    full_entities_storage=self.lightrag.full_entities,
+                    full_relations_storage=self.lightrag.full_relations,
+                    doc_id=doc_id,
+                    pipeline_status=pipeline_status,
+                    pipeline_status_lock=pipeline_status_lock,
+                    llm_response_cache=self.lightrag.llm_response_cache,
+                    current_file_number=1,
+                    total_files=1,
+                    file_path=file_name,
+                )
 
-            await self.lightrag._insert_done()
+            with trace_span("flush.lightrag_indexes"):
+                await self.lightrag._insert_done()
 
         self.logger.info("Individual multimodal content processing complete")
 
         # Mark multimodal content as processed
         await self._mark_multimodal_processing_complete(doc_id)
 
+    async def _generate_multimodal_description(
+        self, item: Dict[str, Any], index: int, file_path: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Generate the description of one multimodal item with the processor for its type
+
+        Args:
+            item: Multimodal content item
+            index: Position of the item among the document's multimodal items
+            file_path: File path for citation
+
+        Returns:
+            Optional[Dict[str, Any]]: Multimodal data for the finalize stages, or None
+            if no processor handles the item's type
+        """
+        content_type = item.get("type", "unknown")
+
+        # Select the correct processor based on content type
+        processor = get_processor_for_type(self.modal_processors, content_type)
+
+        if not processor:
+            self.logger.warning(f"No processor found for type: {content_type}")
+            return None
+
+        item_info = {
+            "page_idx": item.get("page_idx", 0),
+            "index": index,
+            "type": content_type,
+        }
+
+        # Call the correct processor's description generation method
+        with trace_span("generate_description_only", content_type=content_type):
+            (
+                description,
+                entity_info,
+            ) = await processor.generate_description_only(
+                modal_content=item,
+                content_type=content_type,
+                item_info=item_info,
+                entity_name=None,  # Let LLM auto-generate
+            )
+
+        return {
+            "index": index,
+            "content_type": content_type,
+            "description": description,
+            "entity_info": entity_info,
+            "original_item": item,
+            "item_info": item_info,
+            "processor": processor,  # Keep reference to the processor used
+            "file_path": file_path,  # Add file_path to the result
+        }
+
+    async def _generate_image_descriptions_batched(
+        self, indexed_items: List[Tuple[int, Dict[str, Any]]], file_path: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate the descriptions of several image items with multi-image requests
+
+        Args:
+            indexed_items: (index, item) pairs of image items
+            file_path: File path for citation
+
+        Returns:
+            List[Dict[str, Any]]: Multimodal data for the finalize stages, one per item
+        """
+        processor = self.modal_processors["image"]
+        item_infos = [
+            {"page_idx": item.get("page_idx", 0), "index": index, "type": "image"}
+            for index, item in indexed_items
+        ]
+        with trace_span("generate_descriptions_batch", images=len(indexed_items)):
+            descriptions = await processor.generate_descriptions_batch(
+                [
+                    (item, item_info)
+                    for (_, item), item_info in zip(indexed_items, item_infos)
+                ]
+            )
+        return [
+            {
+                "index": index,
+                "content_type": "image",
+                "description": description,
+                "entity_info": entity_info,
+                "original_item": item,
+                "item_info": item_info,
+                "processor": processor,
+                "file_path": file_path,
+            }
+            for (index, item), item_info, (description, entity_info) in zip(
+                indexed_items, item_infos, descriptions
+            )
+        ]
+
+    async def _cluster_near_duplicate_images(
+        self, multimodal_items: List[Dict[str, Any]]
+    ) -> Dict[int, int]:
+        """
+        Greedily cluster near-identical images of a document by perceptual hash
+
+        Only images with the same caption and footnote are clustered, as the
+        caption and footnote are part of the description prompt.
+
+        Args:
+            multimodal_items: List of multimodal items
+
+        Returns:
+            Dict[int, int]: Maps the index of each clustered image that does not need
+            its own caption to the index of its cluster representative
+        """
+        if not self.config.enable_image_dedup or "image" not in self.modal_processors:
+            return {}
+
+        image_indices = [
+            i
+            for i, item in enumerate(multimodal_items)
+            if item.get("type") == "image" and item.get("img_path")
+        ]
+        if len(image_indices) < 2:
+            return {}
+
+        hashes = await asyncio.to_thread(
+            lambda: [
+                compute_image_dhash(multimodal_items[i]["img_path"])
+                for i in image_indices
+            ]
+        )
+
+        representatives = ImageHashIndex()
+        duplicate_of: Dict[int, int] = {}
+        for index, image_hash in zip(image_indices, hashes):
+            if image_hash is None:
+                continue
+            item = multimodal_items[index]
+            group = json.dumps(
+                [
+                    item.get("image_caption", item.get("img_caption", [])),
+                    item.get("image_footnote", item.get("img_footnote", [])),
+                ],
+                default=str,
+            )
+            match = representatives.query(
+                image_hash, self.config.image_dedup_threshold, group
+            )
+            if match is not None:
+                duplicate_of[index] = match[1]["payload"]
+            else:
+                representatives.add(image_hash, group, payload=index)
+
+        if duplicate_of:
+            cluster_count = len(set(duplicate_of.values()))
+            self.image_dedup_stats.clustered_images += len(duplicate_of) + cluster_count
+            self.image_dedup_stats.clusters += cluster_count
+            self.image_dedup_stats.within_document_calls_saved += len(duplicate_of)
+            self.logger.info(
+                f"Perceptual dedup: {len(duplicate_of) + cluster_count} near-duplicate images "
+                f"in {cluster_count} clusters, saving {len(duplicate_of)} caption calls"
+            )
+        return duplicate_of
+
+    def get_image_dedup_stats(self) -> Dict[str, Any]:
+        """
+        Get perceptual-hash image deduplication statistics
+
+        Returns:
+            Dict[str, Any]: Cluster counts and caption calls saved within and across documents
+        """
+        image_processor = self.modal_processors.get("image")
+        self.image_dedup_stats.cross_document_calls_saved = getattr(
+            image_processor, "near_duplicate_hits", 0
+        )
+        return self.image_dedup_stats.to_dict()
+
     async def _process_multimodal_content_batch_type_aware(
         self, multimodal_items: List[Dict[str, Any]], file_path: str, doc_id: str
     ):
@@ -700,15 +1466,6 @@ class ProcessorMixin:
             self.logger.debug("No multimodal content to process")
             return
 
-        # Get existing chunks count for proper order indexing
-        try:
-            existing_doc_status = await self.lightrag.doc_status.get_by_id(doc_id)
-            existing_chunks_count = (
-                existing_doc_status.get("chunks_count", 0) if existing_doc_status else 0
-            )
-        except Exception:
-            existing_chunks_count = 0
-
         # Use LightRAG's concurrency control
         semaphore = asyncio.Semaphore(getattr(self.lightrag, "max_parallel_insert", 2))
 
@@ -720,93 +1477,95 @@ class ProcessorMixin:
         # Log processing start
         self.logger.info(f"Starting to process {total_items} multimodal content items")
 
+        # Stage 0: Cluster near-duplicate images so each cluster is captioned once
+        duplicate_of = await self._cluster_near_duplicate_images(multimodal_items)
+
+        async def report_progress(count: int):
+            """Update progress, on success and on error (non-blocking)"""
+            nonlocal completed_count
+            async with progress_lock:
+                previous_count = completed_count
+                completed_count += count
+                step = max(1, total_items // 10)
+                if (
+                    completed_count // step > previous_count // step
+                    or completed_count == total_items
+                ):
+                    progress_percent = (completed_count / total_items) * 100
+                    self.logger.info(
+                        f"Multimodal chunk generation progress: {completed_count}/{total_items} ({progress_percent:.1f}%)"
+                    )
+
         # Stage 1: Concurrent generation of descriptions using correct processors for each type
         async def process_single_item_with_correct_processor(
             item: Dict[str, Any], index: int, file_path: str
         ):
             """Process single item using the correct processor for its type"""
-            nonlocal completed_count
             async with semaphore:
                 try:
-                    content_type = item.get("type", "unknown")
-
-                    # Select the correct processor based on content type
-                    processor = get_processor_for_type(
-                        self.modal_processors, content_type
+                    return await self._generate_multimodal_description(
+                        item, index, file_path
                     )
 
-                    if not processor:
-                        self.logger.warning(
-                            f"No processor found for type: {content_type}"
-                        )
-                        return None
+                except Exception as e:
+                    self.logger.error(
+                        f"Error generating description for {item.get('type', 'unknown')} item {index}: {e}"
+                    )
+                    return None
 
-                    item_info = {
-                        "page_idx": item.get("page_idx", 0),
-                        "index": index,
-                        "type": content_type,
-                    }
+                finally:
+                    await report_progress(1)
 
-                    # Call the correct processor's description generation method
-                    (
-                        description,
-                        entity_info,
-                    ) = await processor.generate_description_only(
-                        modal_content=item,
-                        content_type=content_type,
-                        item_info=item_info,
-                        entity_name=None,  # Let LLM auto-generate
+        async def process_image_group(indexed_items: List[Tuple[int, Dict[str, Any]]]):
+            """Describe a group of images with multi-image requests"""
+            async with semaphore:
+                try:
+                    return await self._generate_image_descriptions_batched(
+                        indexed_items, file_path
                     )
 
-                    # Update progress (non-blocking)
-                    async with progress_lock:
-                        completed_count += 1
-                        if (
-                            completed_count % max(1, total_items // 10) == 0
-                            or completed_count == total_items
-                        ):
-                            progress_percent = (completed_count / total_items) * 100
-                            self.logger.info(
-                                f"Multimodal chunk generation progress: {completed_count}/{total_items} ({progress_percent:.1f}%)"
-                            )
-
-                    return {
-                        "index": index,
-                        "content_type": content_type,
-                        "description": description,
-                        "entity_info": entity_info,
-                        "original_item": item,
-                        "item_info": item_info,
-                        "chunk_order_index": existing_chunks_count + index,
-                        "processor": processor,  # Keep reference to the processor used
-                        "file_path": file_path,  # Add file_path to the result
-                    }
-
                 except Exception as e:
-                    # Update progress even on error (non-blocking)
-                    async with progress_lock:
-                        completed_count += 1
-                        if (
-                            completed_count % max(1, total_items // 10) == 0
-                            or completed_count == total_items
-                        ):
-                            progress_percent = (completed_count / total_items) * 100
-                            self.logger.info(
-                                f"Multimodal chunk generation progress: {completed_count}/{total_items} ({progress_percent:.1f}%)"
-                            )
-
                     self.logger.error(
-                        f"Error generating description for {content_type} item {index}: {e}"
+                        f"Error generating descriptions for image items {[i for i, _ in indexed_items]}: {e}"
                     )
                     return None
 
+                finally:
+                    await report_progress(len(indexed_items))
+
+        # Images are grouped for multi-image caption requests when batching is enabled
+        pending = [
+            (i, item)
+            for i, item in enumerate(multimodal_items)
+            if i not in duplicate_of
+        ]
+        image_processor = self.modal_processors.get("image")
+        image_batch_size = getattr(image_processor, "batch_size", 1)
+        if getattr(image_processor, "batching_disabled", False):
+            image_batch_size = 1
+        image_items = []
+        if image_batch_size > 1:
+            image_items = [
+                (i, item) for i, item in pending if item.get("type") == "image"
+            ]
+            if len(image_items) < 2:
+                image_items = []
+        batched_indices = {i for i, _ in image_items}
+
         # Process all items concurrently with correct processors
         tasks = [
             asyncio.create_task(
                 process_single_item_with_correct_processor(item, i, file_path)
             )
-            for i, item in enumerate(multimodal_items)
+            for i, item in pending
+            if i not in batched_indices
         ]
+        tasks.extend(
+            asyncio.create_task(
+                process_image_group(image_items[start : start + image_batch_size])
+            )
+            for start in range(0, len(image_items), image_batch_size)
+        )
 
         results = await asyncio.gather(*tasks, return_exceptions=True)
 
@@ -816,8 +1575,33 @@ class ProcessorMixin:
             if isinstance(result, Exception):
                 self.logger.error(f"Task failed: {result}")
                 continue
-            if result is not None:
+            if isinstance(result, list):
+                multimodal_data_list.extend(result)
+            elif result is not None:
                 multimodal_data_list.append(result)
+        multimodal_data_list.sort(key=lambda data: data["index"])
+
+        # Fan cluster representatives' descriptions out to their near-duplicates
+        if duplicate_of:
+            by_index = {data["index"]: data for data in multimodal_data_list}
+            for index, representative in duplicate_of.items():
+                if representative not in by_index:
+                    continue
+                item = multimodal_items[index]
+                multimodal_data_list.append(
+                    {
+                        **by_index[representative],
+                        "index": index,
+                        "entity_info": dict(by_index[representative]["entity_info"]),
+                        "original_item": item,
+                        "item_info": {
+                            **by_index[representative]["item_info"],
+                            "page_idx": item.get("page_idx", 0),
+                            "index": index,
+                        },
+                    }
+                )
+            multimodal_data_list.sort(key=lambda data: data["index"])
 
         if not multimodal_data_list:
             self.logger.warning("No valid multimodal descriptions generated")
@@ -827,9 +1611,40 @@ class ProcessorMixin:
             f"Generated descriptions for {len(multimodal_data_list)}/{len(multimodal_items)} multimodal items using correct processors"
         )
 
+        await self._finalize_multimodal_batch(multimodal_data_list, file_path, doc_id)
+
+    async def _finalize_multimodal_batch(
+        self, multimodal_data_list: List[Dict[str, Any]], file_path: str, doc_id: str
+    ):
+        """
+        Store generated multimodal descriptions as chunks, entities and relations
+
+        Runs stages 2-7 of type-aware batch processing once descriptions exist.
+
+        Args:
+            multimodal_data_list: Results of _generate_multimodal_description
+            file_path: File path for citation
+            doc_id: Document ID for proper association
+        """
+        # Get existing chunks count for proper order indexing
+        try:
+            existing_doc_status = await self._get_doc_status(doc_id)
+            existing_chunks_count = (
+                existing_doc_status.get("chunks_count", 0) if existing_doc_status else 0
+            )
+        except Exception:
+            existing_chunks_count = 0
+
+        multimodal_data_list = sorted(multimodal_data_list, key=lambda d: d["index"])
+        for data in multimodal_data_list:
+            data["chunk_order_index"] = existing_chunks_count + data["index"]
+
+        # Templated chunks, chunk IDs and token counts are shared by all stages
+        memo = IngestionMemo(self.lightrag.tokenizer)
+
         # Stage 2: Convert to LightRAG chunks format
         lightrag_chunks = self._convert_to_lightrag_chunks_type_aware(
-            multimodal_data_list, file_path, doc_id
+            multimodal_data_list, file_path, doc_id, memo
         )
 
         # Stage 3: Store chunks to LightRAG storage
@@ -837,7 +1652,7 @@ class ProcessorMixin:
 
         # Stage 3.5: Store multimodal main entities to entities_vdb and full_entities
         await self._store_multimodal_main_entities(
-            multimodal_data_list, lightrag_chunks, file_path, doc_id
+            multimodal_data_list, lightrag_chunks, file_path, doc_id, memo
         )
 
         # Track chunk IDs for doc_status update
@@ -850,7 +1665,7 @@ class ProcessorMixin:
 
         # Stage 5: Add belongs_to relations (multimodal-specific)
         enhanced_chunk_results = await self._batch_add_belongs_to_relations_type_aware(
-            chunk_results, multimodal_data_list
+            chunk_results, multimodal_data_list, memo
         )
 
         # Stage 6: Use LightRAG's batch merge
@@ -861,30 +1676,47 @@ class ProcessorMixin:
         # Stage 7: Update doc_status with integrated chunks_list
         await self._update_doc_status_with_chunks_type_aware(doc_id, chunk_ids)
 
+    def _get_templated_chunk(
+        self, data: Dict[str, Any], memo: IngestionMemo
+    ) -> Tuple[str, str]:
+        """
+        Get the templated chunk content and chunk ID of a multimodal item
+
+        Args:
+            data: Multimodal data of one item
+            memo: Memo of the current ingestion
+
+        Returns:
+            Tuple[str, str]: (chunk content, chunk ID), formatted and hashed once per item
+        """
+        return memo.chunk(
+            (data["index"], data["content_type"], data["description"]),
+            lambda: self._apply_chunk_template(
+                data["content_type"], data["original_item"], data["description"]
+            ),
+        )
+
     def _convert_to_lightrag_chunks_type_aware(
-        self, multimodal_data_list: List[Dict[str, Any]], file_path: str, doc_id: str
+        self,
+        multimodal_data_list: List[Dict[str, Any]],
+        file_path: str,
+        doc_id: str,
+        memo: Optional[IngestionMemo] = None,
     ) -> Dict[str, Any]:
         """Convert multimodal data to LightRAG standard chunks format"""
+        memo = memo or IngestionMemo(self.lightrag.tokenizer)
 
         chunks = {}
 
         for data in multimodal_data_list:
-            description = data["description"]
             entity_info = data["entity_info"]
             chunk_order_index = data["chunk_order_index"]
-            content_type = data["content_type"]
-            original_item = data["original_item"]
 
             # Apply the appropriate chunk template based on content type
-            formatted_chunk_content = self._apply_chunk_template(
-                content_type, original_item, description
-            )
-
-            # Generate chunk_id
-            chunk_id = compute_mdhash_id(formatted_chunk_content, prefix="chunk-")
+            formatted_chunk_content, chunk_id = self._get_templated_chunk(data, memo)
 
             # Calculate tokens
-            tokens = len(self.lightrag.tokenizer.encode(formatted_chunk_content))
+            tokens = memo.count_tokens(formatted_chunk_content)
 
             # Build LightRAG standard chunk format
             chunks[chunk_id] = {
@@ -1004,6 +1836,7 @@ class ProcessorMixin:
         lightrag_chunks: Dict[str, Any],
         file_path: str,
         doc_id: str = None,
+        memo: Optional[IngestionMemo] = None,
     ):
         """
         Store multimodal main entities to entities_vdb and full_entities.
@@ -1014,9 +1847,11 @@ class ProcessorMixin:
             lightrag_chunks: Chunks in LightRAG format (already formatted with templates)
             file_path: File path for the entities
             doc_id: Document ID for full_entities storage
+            memo: Memo of the current ingestion holding the templated chunks
         """
         if not multimodal_data_list:
             return
+        memo = memo or IngestionMemo(self.lightrag.tokenizer)
 
         # Create entities_vdb entries for all multimodal main entities
         entities_to_store = {}
@@ -1026,18 +1861,12 @@ class ProcessorMixin:
             entity_name = entity_info["entity_name"]
             description = data["description"]
             content_type = data["content_type"]
-            original_item = data["original_item"]
 
-            # Apply the same chunk template to get the formatted content
-            formatted_chunk_content = self._apply_chunk_template(
-                content_type, original_item, description
-            )
-
-            # Generate chunk_id using the formatted content (same as in _convert_to_lightrag_chunks)
-            chunk_id = compute_mdhash_id(formatted_chunk_content, prefix="chunk-")
+            # Same chunk_id as in _convert_to_lightrag_chunks_type_aware
+            _, chunk_id = self._get_templated_chunk(data, memo)
 
             # Generate entity_id using LightRAG's standard format
-            entity_id = compute_mdhash_id(entity_name, prefix="ent-")
+            entity_id = memo.mdhash(entity_name, prefix="ent-")
 
             # Create entity data in LightRAG format
             entity_data = {
@@ -1052,28 +1881,29 @@ class ProcessorMixin:
 
         if entities_to_store:
             try:
-                # Store entities in knowledge graph
-                for entity_id, entity_data in entities_to_store.items():
-                    entity_name = entity_data["entity_name"]
-
-                    # Create node data for knowledge graph
-                    node_data = {
-                        "entity_id": entity_name,
-                        "entity_type": entity_data["entity_type"],
-                        "description": entity_data["content"],
-                        "source_id": entity_data["source_id"],
-                        "file_path": entity_data["file_path"],
-                        "created_at": int(time.time()),
-                    }
-
-                    # Store in knowledge graph
-                    await self.lightrag.chunk_entity_relation_graph.upsert_node(
-                        entity_name, node_data
+                # Create node data for knowledge graph
+                created_at = int(time.time())
+                nodes = [
+                    (
+                        entity_data["entity_name"],
+                        {
+                            "entity_id": entity_data["entity_name"],
+                            "entity_type": entity_data["entity_type"],
+                            "description": entity_data["content"],
+                            "source_id": entity_data["source_id"],
+                            "file_path": entity_data["file_path"],
+                            "created_at": created_at,
+                        },
                     )
+                    for entity_data in entities_to_store.values()
+                ]
 
-                # Store in entities_vdb
+                # Store in knowledge graph
+                await self._upsert_graph_nodes(nodes)
+
+                # Store in entities_vdb; persisted with all index storages by
+                # _insert_done at the end of the document
                 await self.lightrag.entities_vdb.upsert(entities_to_store)
-                await self.lightrag.entities_vdb.index_done_callback()
 
                 # NEW: Store multimodal main entities in full_entities storage
                 if doc_id and self.lightrag.full_entities:
@@ -1089,6 +1919,22 @@ class ProcessorMixin:
                 self.logger.error(f"Error storing multimodal main entities: {e}")
                 raise
 
+    async def _upsert_graph_nodes(self, nodes: List[Tuple[str, Dict[str, Any]]]):
+        """
+        Upsert knowledge graph nodes with one batch call when the graph backend supports it
+
+        Args:
+            nodes: List of (node_id, node_data) tuples
+        """
+        graph = self.lightrag.chunk_entity_relation_graph
+        if hasattr(graph, "upsert_nodes_batch"):
+            await graph.upsert_nodes_batch(nodes)
+            return
+
+        # Older graph backends without a batch API
+        for node_id, node_data in nodes:
+            await graph.upsert_node(node_id, node_data)
+
     async def _store_multimodal_entities_to_full_entities(
         self, entities_to_store: Dict[str, Any], doc_id: str
     ):
@@ -1134,9 +1980,8 @@ class ProcessorMixin:
                     "update_time": int(time.time()),
                 }
 
-            # Store updated data
+            # Store updated data, persisted by _insert_done at the end of the document
             await self.lightrag.full_entities.upsert({doc_id: doc_entities_data})
-            await self.lightrag.full_entities.index_done_callback()
 
             self.logger.debug(
                 f"Added {len(entities_to_store)} multimodal main entities to full_entities for doc {doc_id}"
@@ -1163,14 +2008,15 @@ class ProcessorMixin:
         pipeline_status_lock = get_pipeline_status_lock()
 
         # Directly use LightRAG's extract_entities
-        chunk_results = await extract_entities(
-            chunks=lightrag_chunks,
-            global_config=self.lightrag.__dict__,
-            pipeline_status=pipeline_status,
-            pipeline_status_lock=pipeline_status_lock,
-            llm_response_cache=self.lightrag.llm_response_cache,
-            text_chunks_storage=self.lightrag.text_chunks,
-        )
+        with trace_span("extract_entities", chunks=len(lightrag_chunks)):
+            chunk_results = await extract_entities(
+                chunks=lightrag_chunks,
+                global_config=self.lightrag.__dict__,
+                pipeline_status=pipeline_status,
+                pipeline_status_lock=pipeline_status_lock,
+                llm_response_cache=self.lightrag.llm_response_cache,
+                text_chunks_storage=self.lightrag.text_chunks,
+            )
 
         self.logger.info(
             f"Extracted entities from {len(lightrag_chunks)} multimodal chunks"
@@ -1178,23 +2024,21 @@ class ProcessorMixin:
         return chunk_results
 
     async def _batch_add_belongs_to_relations_type_aware(
-        self, chunk_results: List[Tuple], multimodal_data_list: List[Dict[str, Any]]
+        self,
+        chunk_results: List[Tuple],
+        multimodal_data_list: List[Dict[str, Any]],
+        memo: Optional[IngestionMemo] = None,
     ) -> List[Tuple]:
         """Add belongs_to relations for multimodal entities"""
+        memo = memo or IngestionMemo(self.lightrag.tokenizer)
+
         # Create mapping from chunk_id to modal_entity_name
         chunk_to_modal_entity = {}
         chunk_to_file_path = {}
 
         for data in multimodal_data_list:
-            description = data["description"]
-            content_type = data["content_type"]
-            original_item = data["original_item"]
-
-            # Use the same template formatting as in _convert_to_lightrag_chunks_type_aware
-            formatted_chunk_content = self._apply_chunk_template(
-                content_type, original_item, description
-            )
-            chunk_id = compute_mdhash_id(formatted_chunk_content, prefix="chunk-")
+            # Same chunk_id as in _convert_to_lightrag_chunks_type_aware
+            _, chunk_id = self._get_templated_chunk(data, memo)
 
             chunk_to_modal_entity[chunk_id] = data["entity_info"]["entity_name"]
             chunk_to_file_path[chunk_id] = data.get("file_path", "multimodal_content")
@@ -1254,24 +2098,73 @@ class ProcessorMixin:
         pipeline_status = await get_namespace_data("pipeline_status")
         pipeline_status_lock = get_pipeline_status_lock()
 
-        await merge_nodes_and_edges(
-            chunk_results=enhanced_chunk_results,
-            knowledge_graph_inst=self.lightrag.chunk_entity_relation_graph,
-            entity_vdb=self.lightrag.entities_vdb,
-            relationships_vdb=self.lightrag.relationships_vdb,
-            global_config=self.lightrag.__dict__,
-            full_entities_storage=self.lightrag.full_entities,
-            full_relations_storage=self.lightrag.full_relations,
-            doc_id=doc_id,
-            pipeline_status=pipeline_status,
-            pipeline_status_lock=pipeline_status_lock,
-            llm_response_cache=self.lightrag.llm_response_cache,
-            current_file_number=1,
-            total_files=1,
-            file_path=os.path.basename(file_path),
+        with trace_span("merge_nodes_and_edges"):
+            await merge_nodes_and_edges(
+                chunk_results=enhanced_chunk_results,
+                knowledge_graph_inst=self.lightrag.chunk_entity_relation_graph,
+                entity_vdb=self.lightrag.entities_vdb,
+                relationships_vdb=self.lightrag.relationships_vdb,
+                global_config=self.lightrag.__dict__,
+                full_entities_storage=self.lightrag.full_entities,
+                full_relations_storage=self.lightrag.full_relations,
+                doc_id=doc_id,
+                pipeline_status=pipeline_status,
+                pipeline_status_lock=pipeline_status_lock,
+                llm_response_cache=self.lightrag.llm_response_cache,
+                current_file_number=1,
+                total_files=1,
+                file_path=os.path.basename(file_path),
+            )
+
+        with trace_span("flush.lightrag_indexes"):
+            await self.lightrag._insert_done()
+
+    async def _get_doc_status(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a document status, including updates still held by the write buffer
+
+        Args:
+            doc_id: Document ID
+
+        Returns:
+            Optional[Dict[str, Any]]: Document status record, or None if unknown
+        """
+        if self.doc_status_buffer is not None:
+            return await self.doc_status_buffer.get(doc_id)
+        return await self.lightrag.doc_status.get_by_id(doc_id)
+
+    async def _update_doc_status(
+        self,
+        doc_id: str,
+        fields: Dict[str, Any],
+        current_doc_status: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Update fields of a document status through the write buffer
+
+        Args:
+            doc_id: Document ID
+            fields: Fields to set
+            current_doc_status: Current record, kept as the base of a direct upsert
+                when the write buffer is disabled
+        """
+        if self.doc_status_buffer is not None:
+            await self.doc_status_buffer.update(doc_id, fields)
+            return
+
+        if current_doc_status is None:
+            current_doc_status = await self.lightrag.doc_status.get_by_id(doc_id)
+        await self.lightrag.doc_status.upsert(
+            {doc_id: {**(current_doc_status or {}), **fields}}
         )
 
-        await self.lightrag._insert_done()
+    async def _flush_doc_status(self):
+        """Persist document status updates, called at the end of a document"""
+        with trace_span("flush.doc_status"):
+            if self.doc_status_buffer is not None:
+                await self.doc_status_buffer.flush()
+            else:
+                await self.lightrag.doc_status.index_done_callback()
 
     async def _update_doc_status_with_chunks_type_aware(
         self, doc_id: str, chunk_ids: List[str]
@@ -1279,7 +2172,7 @@ class ProcessorMixin:
         """Update document status with multimodal chunks"""
         try:
             # Get current document status
-            current_doc_status = await self.lightrag.doc_status.get_by_id(doc_id)
+            current_doc_status = await self._get_doc_status(doc_id)
 
             if current_doc_status:
                 existing_chunks_list = current_doc_status.get("chunks_list", [])
@@ -1289,21 +2182,18 @@ class ProcessorMixin:
                 updated_chunks_list = existing_chunks_list + chunk_ids
                 updated_chunks_count = existing_chunks_count + len(chunk_ids)
 
-                # Update document status with integrated chunk list
-                await self.lightrag.doc_status.upsert(
+                # Update document status with integrated chunk list; persisted with
+                # the multimodal completion mark at the end of the document
+                await self._update_doc_status(
+                    doc_id,
                     {
-                        doc_id: {
-                            **current_doc_status,  # Keep existing fields
-                            "chunks_list": updated_chunks_list,  # Integrated chunks list
-                            "chunks_count": updated_chunks_count,  # Updated total count
-                            "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S+00:00"),
-                        }
-                    }
+                        "chunks_list": updated_chunks_list,  # Integrated chunks list
+                        "chunks_count": updated_chunks_count,  # Updated total count
+                        "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S+00:00"),
+                    },
+                    current_doc_status,
                 )
 
-                # Ensure doc_status update is persisted to disk
-                await self.lightrag.doc_status.index_done_callback()
-
                 self.logger.info(
                     f"Updated doc_status: added {len(chunk_ids)} multimodal chunks to standard chunks_list "
                     f"(total chunks: {updated_chunks_count})"
@@ -1317,18 +2207,18 @@ class ProcessorMixin:
     async def _mark_multimodal_processing_complete(self, doc_id: str):
         """Mark multimodal content processing as complete in the document status."""
         try:
-            current_doc_status = await self.lightrag.doc_status.get_by_id(doc_id)
+            current_doc_status = await self._get_doc_status(doc_id)
             if current_doc_status:
-                await self.lightrag.doc_status.upsert(
+                await self._update_doc_status(
+                    doc_id,
                     {
-                        doc_id: {
-                            **current_doc_status,
-                            "multimodal_processed": True,
-                            "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S+00:00"),
-                        }
-                    }
+                        "multimodal_processed": True,
+                        "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S+00:00"),
+                    },
+                    current_doc_status,
                 )
-                await self.lightrag.doc_status.index_done_callback()
+                # End of the document: persist its buffered status updates
+                await self._flush_doc_status()
                 self.logger.debug(
                     f"Marked multimodal content processing as complete for document {doc_id}"
                 )
@@ -1348,7 +2238,7 @@ class ProcessorMixin:
             bool: True if both text and multimodal content are processed
         """
         try:
-            doc_status = await self.lightrag.doc_status.get_by_id(doc_id)
+            doc_status = await self._get_doc_status(doc_id)
             if not doc_status:
                 return False
 
@@ -1374,7 +2264,7 @@ class ProcessorMixin:
             Dict with processing status details
         """
         try:
-            doc_status = await self.lightrag.doc_status.get_by_id(doc_id)
+            doc_status = await self._get_doc_status(doc_id)
             if not doc_status:
                 return {
                     "exists": False,
@@ -1413,6 +2303,7 @@ class ProcessorMixin:
                 "chunks_count": 0,
             }
 
+    @traced_ingestion
     async def process_document_complete(
         self,
         file_path: str,
@@ -1450,6 +2341,21 @@ class ProcessorMixin:
 
         self.logger.info(f"Starting complete document processing: {file_path}")
 
+        if self.config.enable_streaming_ingestion:
+            await self._process_document_streaming(
+                file_path,
+                output_dir,
+                parse_method,
+                display_stats,
+                split_by_character=split_by_character,
+                split_by_character_only=split_by_character_only,
+                doc_id=doc_id,
+                **kwargs,
+            )
+            await self.flush_description_cache()
+            self.logger.info(f"Document {file_path} processing complete!")
+            return
+
         # Step 1: Parse document
         content_list, content_based_doc_id = await self.parse_document(
             file_path, output_dir, parse_method, display_stats, **kwargs
@@ -1458,9 +2364,11 @@ class ProcessorMixin:
         # Use provided doc_id or fall back to content-based doc_id
         if doc_id is None:
             doc_id = content_based_doc_id
+        annotate_trace(doc_id=doc_id)
 
         # Step 2: Separate text and multimodal content
-        text_content, multimodal_items = separate_content(content_list)
+        with trace_span("separate_content"):
+            text_content, multimodal_items = separate_content(content_list)
 
         # Step 2.5: Set content source for context extraction in multimodal processing
         if hasattr(self, "set_content_source_for_context") and multimodal_items:
@@ -1474,14 +2382,15 @@ class ProcessorMixin:
         # Step 3: Insert pure text content with all parameters
         if text_content.strip():
             file_name = os.path.basename(file_path)
-            await insert_text_content(
-                self.lightrag,
-                input=text_content,
-                file_paths=file_name,
-                split_by_character=split_by_character,
-                split_by_character_only=split_by_character_only,
-                ids=doc_id,
-            )
+            with trace_span("ainsert"):
+                await insert_text_content(
+                    self.lightrag,
+                    input=text_content,
+                    file_paths=file_name,
+                    split_by_character=split_by_character,
+                    split_by_character_only=split_by_character_only,
+                    ids=doc_id,
+                )
 
         # Step 4: Process multimodal content (using specialized processors)
         if multimodal_items:
@@ -1494,8 +2403,219 @@ class ProcessorMixin:
                 f"No multimodal content found in document {doc_id}, marked multimodal processing as complete"
             )
 
+        await self.flush_description_cache()
         self.logger.info(f"Document {file_path} processing complete!")
 
+    async def _process_document_streaming(
+        self,
+        file_path: str,
+        output_dir: str,
+        parse_method: str,
+        display_stats: bool,
+        split_by_character: str | None = None,
+        split_by_character_only: bool = False,
+        doc_id: str | None = None,
+        **kwargs,
+    ):
+        """
+        Streaming variant of process_document_complete
+
+        Multimodal descriptions are generated while later page shards are still
+        being parsed: an item is queued as soon as every page of its context window
+        has been parsed. When the bounded queue is full, the next shard result is
+        not taken, and the shard parser starts no further shard until it is, so
+        parsing is held back to the pace of the description workers. Documents
+        other than page-sharded MinerU PDFs are parsed in one piece, so for them
+        only text insertion overlaps the descriptions. Text insertion starts once
+        the last shard has been read; multimodal chunks, entities and relations
+        are stored once descriptions are done.
+
+        When the doc_id is known before items are queued (passed in, or carried by
+        a cached parse result), a document whose multimodal content is already
+        processed starts no description workers at all.
+
+        Args:
+            file_path: Path to the file to process
+            output_dir: Output directory
+            parse_method: Parse method
+            display_stats: Whether to display content statistics
+            split_by_character: Optional character to split the text by
+            split_by_character_only: If True, split only by the specified character
+            doc_id: Optional document ID, if not provided will be generated from content
+            **kwargs: Additional parameters for parser
+        """
+        content_list: List[Dict[str, Any]] = []
+        multimodal_items: List[Dict[str, Any]] = []
+        multimodal_data_list: List[Dict[str, Any]] = []
+        pending: List[Tuple[int, Dict[str, Any]]] = []
+        queue: asyncio.Queue = asyncio.Queue(
+            maxsize=max(1, self.config.streaming_queue_size)
+        )
+        context_window = max(0, self.config.context_window)
+        workers: List[asyncio.Task] = []
+
+        # Context extraction reads the content list as it grows
+        if hasattr(self, "set_content_source_for_context"):
+            self.set_content_source_for_context(
+                content_list, self.config.content_format
+            )
+
+        async def describe_worker():
+            while True:
+                entry = await queue.get()
+                try:
+                    if entry is None:
+                        return
+                    index, item = entry
+                    try:
+                        data = await self._generate_multimodal_description(
+                            item, index, file_path
+                        )
+                        if data is not None:
+                            multimodal_data_list.append(data)
+                    except Exception as e:
+                        self.logger.error(
+                            f"Error generating description for {item.get('type', 'unknown')} item {index}: {e}"
+                        )
+                finally:
+                    queue.task_done()
+
+        async def enqueue(entry):
+            # Workers start with the first queued item
+            if not workers:
+                workers.extend(
+                    asyncio.create_task(describe_worker())
+                    for _ in range(
+                        max(1, getattr(self.lightrag, "max_parallel_insert", 2))
+                    )
+                )
+            await queue.put(entry)
+
+        async def multimodal_processed(check_doc_id: str) -> bool:
+            # Skip multimodal work if an earlier run already finished it
+            try:
+                existing_doc_status = await self._get_doc_status(check_doc_id)
+            except Exception as e:
+                self.logger.debug(
+                    f"Error checking document status for {check_doc_id}: {e}"
+                )
+                return False
+            if existing_doc_status and existing_doc_status.get("multimodal_processed"):
+                self.logger.info(
+                    f"Document {check_doc_id} multimodal content is already processed"
+                )
+                return True
+            return False
+
+        status_checked = doc_id is not None
+        skip_multimodal = status_checked and await multimodal_processed(doc_id)
+
+        try:
+            # Step 1: Parse, queueing multimodal items whose context is complete
+            content_based_doc_id = None
+            async with aclosing(
+                self.parse_document_stream(
+                    file_path, output_dir, parse_method, display_stats, **kwargs
+                )
+            ) as blocks_stream:
+                async for blocks, stream_doc_id in blocks_stream:
+                    if stream_doc_id is not None:
+                        content_based_doc_id = stream_doc_id
+                        # A cached parse result carries its doc_id with its blocks
+                        if not status_checked:
+                            status_checked = True
+                            skip_multimodal = await multimodal_processed(stream_doc_id)
+                    if not blocks:
+                        continue
+
+                    content_list.extend(blocks)
+                    if skip_multimodal:
+                        continue
+                    _, new_items = separate_content(blocks)
+                    for item in new_items:
+                        pending.append((len(multimodal_items), item))
+                        multimodal_items.append(item)
+
+                    # Pages arrive in order, so everything up to the last page seen is parsed
+                    parsed_through = max(
+                        (b.get("page_idx", 0) for b in blocks if isinstance(b, dict)),
+                        default=0,
+                    )
+                    still_pending = []
+                    for index, item in pending:
+                        if item.get("page_idx", 0) + context_window <= parsed_through:
+                            await enqueue((index, item))
+                        else:
+                            still_pending.append((index, item))
+                    pending = still_pending
+
+            # Use provided doc_id or fall back to content-based doc_id
+            if doc_id is None:
+                doc_id = content_based_doc_id
+            annotate_trace(doc_id=doc_id)
+
+            # A fresh parse only yields its doc_id at the end; items already queued
+            # were described through the description cache where it has them
+            if not status_checked and await multimodal_processed(doc_id):
+                skip_multimodal = True
+            if skip_multimodal:
+                for worker in workers:
+                    worker.cancel()
+                multimodal_items = []
+                pending = []
+
+            async def drain_descriptions():
+                for entry in pending:
+                    await enqueue(entry)
+                for _ in workers:
+                    await queue.put(None)
+                await asyncio.gather(*workers)
+
+            async def insert_text():
+                with trace_span("separate_content"):
+                    text_content, _ = separate_content(content_list)
+                if text_content.strip():
+                    with trace_span("ainsert"):
+                        await insert_text_content(
+                            self.lightrag,
+                            input=text_content,
+                            file_paths=os.path.basename(file_path),
+                            split_by_character=split_by_character,
+                            split_by_character_only=split_by_character_only,
+                            ids=doc_id,
+                        )
+
+            # Step 2: Insert text while the remaining descriptions are generated
+            if multimodal_items:
+                await asyncio.gather(insert_text(), drain_descriptions())
+            else:
+                await insert_text()
+        finally:
+            for worker in workers:
+                worker.cancel()
+
+        # Step 3: Store multimodal chunks, entities and relations
+        if multimodal_data_list:
+            self.logger.info(
+                f"Generated descriptions for {len(multimodal_data_list)}/{len(multimodal_items)} multimodal items while streaming"
+            )
+            try:
+                await self._finalize_multimodal_batch(
+                    multimodal_data_list, file_path, doc_id
+                )
+            except Exception as e:
+                self.logger.error(f"Error in multimodal processing: {e}")
+                # Fallback to individual processing if batch processing fails
+                self.logger.warning("Falling back to individual multimodal processing")
+                await self._process_multimodal_content_individual(
+                    multimodal_items, file_path, doc_id
+                )
+        elif multimodal_items:
+            self.logger.warning("No valid multimodal descriptions generated")
+
+        await self._mark_multimodal_processing_complete(doc_id)
+
+    @traced_ingestion
     async def process_document_complete_lightrag_api(
         self,
         file_path: str,
@@ -1536,14 +2656,10 @@ class ProcessorMixin:
             # Ensure LightRAG is initialized
             result = await self._ensure_lightrag_initialized()
             if not result["success"]:
-                await self.lightrag.doc_status.upsert(
-                    {
-                        doc_pre_id: {
-                            **current_doc_status,
-                            "status": DocStatus.FAILED,
-                            "error_msg": result["error"],
-                        }
-                    }
+                await self._update_doc_status(
+                    doc_pre_id,
+                    {"status": DocStatus.FAILED, "error_msg": result["error"]},
+                    current_doc_status,
                 )
                 return False
 
@@ -1558,27 +2674,25 @@ class ProcessorMixin:
             self.logger.info(f"Starting complete document processing: {file_path}")
 
             # Initialize doc status
-            current_doc_status = await self.lightrag.doc_status.get_by_id(doc_pre_id)
+            current_doc_status = await self._get_doc_status(doc_pre_id)
             if not current_doc_status:
-                await self.lightrag.doc_status.upsert(
+                await self._update_doc_status(
+                    doc_pre_id,
                     {
-                        doc_pre_id: {
-                            "status": DocStatus.READY,
-                            "content": "",
-                            "error_msg": "",
-                            "content_summary": "",
-                            "multimodal_content": [],
-                            "scheme_name": scheme_name,
-                            "content_length": 0,
-                            "created_at": "",
-                            "updated_at": "",
-                            "file_path": file_name,
-                        }
-                    }
-                )
-                current_doc_status = await self.lightrag.doc_status.get_by_id(
-                    doc_pre_id
+                        "status": DocStatus.READY,
+                        "content": "",
+                        "error_msg": "",
+                        "content_summary": "",
+                        "multimodal_content": [],
+                        "scheme_name": scheme_name,
+                        "content_length": 0,
+                        "created_at": "",
+                        "updated_at": "",
+                        "file_path": file_name,
+                    },
+                    {},
                 )
+                current_doc_status = await self._get_doc_status(doc_pre_id)
 
             from lightrag.kg.shared_storage import (
                 get_namespace_data,
@@ -1593,14 +2707,10 @@ class ProcessorMixin:
                 pipeline_status.update({"scan_disabled": True})
                 pipeline_status["history_messages"].append("Now is not allowed to scan")
 
-            await self.lightrag.doc_status.upsert(
-                {
-                    doc_pre_id: {
-                        **current_doc_status,
-                        "status": DocStatus.HANDLING,
-                        "error_msg": "",
-                    }
-                }
+            await self._update_doc_status(
+                doc_pre_id,
+                {"status": DocStatus.HANDLING, "error_msg": ""},
+                current_doc_status,
             )
 
             content_list = []
@@ -1615,28 +2725,20 @@ class ProcessorMixin:
                 error_message = e.error_msg
                 if isinstance(e.error_msg, list):
                     error_message = "\n".join(e.error_msg)
-                await self.lightrag.doc_status.upsert(
-                    {
-                        doc_pre_id: {
-                            **current_doc_status,
-                            "status": DocStatus.FAILED,
-                            "error_msg": error_message,
-                        }
-                    }
+                await self._update_doc_status(
+                    doc_pre_id,
+                    {"status": DocStatus.FAILED, "error_msg": error_message},
+                    current_doc_status,
                 )
                 self.logger.info(
                     f"Error processing document {file_path}: MineruExecutionError"
                 )
                 return False
             except Exception as e:
-                await self.lightrag.doc_status.upsert(
-                    {
-                        doc_pre_id: {
-                            **current_doc_status,
-                            "status": DocStatus.FAILED,
-                            "error_msg": str(e),
-                        }
-                    }
+                await self._update_doc_status(
+                    doc_pre_id,
+                    {"status": DocStatus.FAILED, "error_msg": str(e)},
+                    current_doc_status,
                 )
                 self.logger.info(f"Error processing document {file_path}: {str(e)}")
                 return False
@@ -1644,9 +2746,11 @@ class ProcessorMixin:
             # Use provided doc_id or fall back to content-based doc_id
             if doc_id is None:
                 doc_id = content_based_doc_id
+            annotate_trace(doc_id=doc_id)
 
             # Step 2: Separate text and multimodal content
-            text_content, multimodal_items = separate_content(content_list)
+            with trace_span("separate_content"):
+                text_content, multimodal_items = separate_content(content_list)
 
             # Step 2.5: Set content source for context extraction in multimodal processing
             if hasattr(self, "set_content_source_for_context") and multimodal_items:
@@ -1659,16 +2763,17 @@ class ProcessorMixin:
 
             # Step 3: Insert pure text content and multimodal content with all parameters
             if text_content.strip():
-                await insert_text_content_with_multimodal_content(
-                    self.lightrag,
-                    input=text_content,
-                    multimodal_content=multimodal_items,
-                    file_paths=file_name,
-                    split_by_character=split_by_character,
-                    split_by_character_only=split_by_character_only,
-                    ids=doc_id,
-                    scheme_name=scheme_name,
-                )
+                with trace_span("ainsert"):
+                    await insert_text_content_with_multimodal_content(
+                        self.lightrag,
+                        input=text_content,
+                        multimodal_content=multimodal_items,
+                        file_paths=file_name,
+                        split_by_character=split_by_character,
+                        split_by_character_only=split_by_character_only,
+                        ids=doc_id,
+                        scheme_name=scheme_name,
+                    )
 
             self.logger.info(f"Document {file_path} processing completed successfully")
             return True
@@ -1678,16 +2783,11 @@ class ProcessorMixin:
             self.logger.debug("Exception details:", exc_info=True)
 
             # Update doc status to Failed
-            await self.lightrag.doc_status.upsert(
-                {
-                    doc_pre_id: {
-                        **current_doc_status,
-                        "status": DocStatus.FAILED,
-                        "error_msg": str(e),
-                    }
-                }
+            await self._update_doc_status(
+                doc_pre_id,
+                {"status": DocStatus.FAILED, "error_msg": str(e)},
+                current_doc_status,
             )
-            await self.lightrag.doc_status.index_done_callback()
 
             # Update pipeline status
             if pipeline_status_lock and pipeline_status:
@@ -1710,6 +2810,12 @@ class ProcessorMixin:
             return False
 
         finally:
+            # Persist the document's buffered status updates
+            try:
+                await self._flush_doc_status()
+            except Exception as e:
+                self.logger.error(f"Failed to persist doc_status for {file_name}: {e}")
+
             async with pipeline_status_lock:
                 pipeline_status.update({"scan_disabled": False})
                 pipeline_status["latest_message"] = (
@@ -1720,6 +2826,7 @@ class ProcessorMixin:
                 )
                 pipeline_status["history_messages"].append("Now is allowed to scan")
 
+    @traced_ingestion
     async def insert_content_list(
         self,
         content_list: List[Dict[str, Any]],
@@ -1768,6 +2875,7 @@ class ProcessorMixin:
         # Generate doc_id based on content if not provided
         if doc_id is None:
             doc_id = self._generate_content_based_doc_id(content_list)
+        annotate_trace(doc_id=doc_id)
 
         # Display content statistics if requested
         if display_stats:
@@ -1787,7 +2895,8 @@ class ProcessorMixin:
                 self.logger.info(f"  - {block_type}: {count}")
 
         # Step 1: Separate text and multimodal content
-        text_content, multimodal_items = separate_content(content_list)
+        with trace_span("separate_content"):
+            text_content, multimodal_items = separate_content(content_list)
 
         # Step 1.5: Set content source for context extraction in multimodal processing
         if hasattr(self, "set_content_source_for_context") and multimodal_items:
@@ -1801,14 +2910,15 @@ class ProcessorMixin:
         # Step 2: Insert pure text content with all parameters
         if text_content.strip():
             file_name = os.path.basename(file_path)
-            await insert_text_content(
-                self.lightrag,
-                input=text_content,
-                file_paths=file_name,
-                split_by_character=split_by_character,
-                split_by_character_only=split_by_character_only,
-                ids=doc_id,
-            )
+            with trace_span("ainsert"):
+                await insert_text_content(
+                    self.lightrag,
+                    input=text_content,
+                    file_paths=file_name,
+                    split_by_character=split_by_character,
+                    split_by_character_only=split_by_character_only,
+                    ids=doc_id,
+                )
 
         # Step 3: Process multimodal content (using specialized processors)
         if multimodal_items:
@@ -1821,4 +2931,5 @@ class ProcessorMixin:
                 f"No multimodal content found in document {doc_id}, marked multimodal processing as complete"
             )
 
+        await self.flush_description_cache()
         self.logger.info(f"Content list insertion complete for: {file_path}")
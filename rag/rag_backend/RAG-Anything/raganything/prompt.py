@@ -88,6 +88,38 @@ Image details:
 
 Focus on providing accurate, detailed visual analysis that incorporates the context and would be useful for knowledge retrieval."""
 
+# Multi-image analysis prompt, followed by one vision_batch_item section per image
+PROMPTS[
+    "vision_batch_prompt"
+] = """Please analyze each of the following {image_count} images in detail. Each image is preceded by its number and details. Provide a JSON array with exactly one object per image, in image order, each with the following structure:
+
+[
+    {{
+        "image_index": 1,
+        "detailed_description": "A comprehensive and detailed visual description of the image following these guidelines:
+        - Describe the overall composition and layout
+        - Identify all objects, people, text, and visual elements
+        - Explain relationships between elements and, when context is given, how they relate to it
+        - Note colors, lighting, and visual style
+        - Describe any actions or activities shown
+        - Include technical details if relevant (charts, diagrams, etc.)
+        - Always use specific names instead of pronouns",
+        "entity_info": {{
+            "entity_name": "unique descriptive name for this image",
+            "entity_type": "image",
+            "summary": "concise summary of the image content and its significance (max 100 words)"
+        }}
+    }}
+]
+
+Describe every image on its own; do not merge images or refer to other images. Focus on providing accurate, detailed visual analysis that would be useful for knowledge retrieval."""
+
+PROMPTS["vision_batch_item"] = """Image {image_index}:
+- Image Path: {image_path}
+- Captions: {captions}
+- Footnotes: {footnotes}
+- Context from surrounding content: {context}"""
+
 # Image analysis prompt with text fallback
 PROMPTS["text_prompt"] = """Based on the following image information, provide analysis:
 
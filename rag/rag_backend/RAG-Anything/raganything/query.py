@@ -7,11 +7,13 @@ Contains all query-related methods for both text and multimodal queries
 import json
 import hashlib
 import re
-from typing import Dict, List, Any
+import time
+from typing import AsyncIterator, Dict, List, Any
 from pathlib import Path
 from lightrag import QueryParam
 from lightrag.utils import always_get_an_event_loop
 from raganything.prompt import PROMPTS
+from raganything.metrics import CACHE_REQUESTS, QUERY_FIRST_CHUNK_SECONDS
 from raganything.utils import (
     get_processor_for_type,
     encode_image_to_base64,
@@ -213,13 +215,49 @@ class QueryMixin:
         )
 
         # Check cache if available and enabled
-        cached_result = None
-        if (
+        cached_result = await self._get_cached_multimodal_result(cache_key)
+        if cached_result:
+            return cached_result
+
+        # Process multimodal content to generate enhanced query text
+        enhanced_query = await self._process_multimodal_query_content(
+            query, multimodal_content
+        )
+
+        self.logger.info(
+            f"Generated enhanced query length: {len(enhanced_query)} characters"
+        )
+
+        # Execute enhanced query
+        result = await self.aquery(enhanced_query, mode=mode, **kwargs)
+
+        await self._cache_multimodal_result(
+            cache_key, result, query, multimodal_content, mode
+        )
+
+        self.logger.info("Multimodal query completed")
+        return result
+
+    def _multimodal_cache_enabled(self) -> bool:
+        """Whether multimodal query results can be cached in LightRAG's LLM response cache"""
+        return bool(
             hasattr(self, "lightrag")
             and self.lightrag
             and hasattr(self.lightrag, "llm_response_cache")
             and self.lightrag.llm_response_cache
-        ):
+        )
+
+    async def _get_cached_multimodal_result(self, cache_key: str) -> str | None:
+        """
+        Look up a cached multimodal query result
+
+        Args:
+            cache_key: Key from _generate_multimodal_cache_key()
+
+        Returns:
+            str | None: Cached result, or None on a miss or when caching is disabled
+        """
+        if self._multimodal_cache_enabled():
             if self.lightrag.llm_response_cache.global_config.get(
                 "enable_llm_cache", True
             ):
@@ -233,29 +271,33 @@ class QueryMixin:
                             self.logger.info(
                                 f"Multimodal query cache hit: {cache_key[:16]}..."
                             )
+                            CACHE_REQUESTS.inc(cache="multimodal_query", result="hit")
                             return result_content
+                    CACHE_REQUESTS.inc(cache="multimodal_query", result="miss")
                 except Exception as e:
                     self.logger.debug(f"Error accessing multimodal query cache: {e}")
+        return None
 
-        # Process multimodal content to generate enhanced query text
-        enhanced_query = await self._process_multimodal_query_content(
-            query, multimodal_content
-        )
-
-        self.logger.info(
-            f"Generated enhanced query length: {len(enhanced_query)} characters"
-        )
-
-        # Execute enhanced query
-        result = await self.aquery(enhanced_query, mode=mode, **kwargs)
+    async def _cache_multimodal_result(
+        self,
+        cache_key: str,
+        result: str,
+        query: str,
+        multimodal_content: List[Dict[str, Any]],
+        mode: str,
+    ):
+        """
+        Save a multimodal query result to the cache and persist the cache
 
+        Args:
+            cache_key: Key from _generate_multimodal_cache_key()
+            result: Query result
+            query: Original query text
+            multimodal_content: Multimodal content of the query
+            mode: Query mode
+        """
         # Save to cache if available and enabled
-        if (
-            hasattr(self, "lightrag")
-            and self.lightrag
-            and hasattr(self.lightrag, "llm_response_cache")
-            and self.lightrag.llm_response_cache
-        ):
+        if self._multimodal_cache_enabled():
             if self.lightrag.llm_response_cache.global_config.get(
                 "enable_llm_cache", True
             ):
@@ -279,20 +321,12 @@ class QueryMixin:
                     self.logger.debug(f"Error saving multimodal query to cache: {e}")
 
         # Ensure cache is persisted to disk
-        if (
-            hasattr(self, "lightrag")
-            and self.lightrag
-            and hasattr(self.lightrag, "llm_response_cache")
-            and self.lightrag.llm_response_cache
-        ):
+        if self._multimodal_cache_enabled():
             try:
                 await self.lightrag.llm_response_cache.index_done_callback()
             except Exception as e:
                 self.logger.debug(f"Error persisting multimodal query cache: {e}")
 
-        self.logger.info("Multimodal query completed")
-        return result
-
     async def aquery_vlm_enhanced(self, query: str, mode: str = "mix", **kwargs) -> str:
         """
         VLM enhanced query - replaces image paths in retrieved context with base64 encoded images for VLM processing
@@ -317,6 +351,34 @@ class QueryMixin:
 
         self.logger.info(f"Executing VLM enhanced query: {query[:100]}...")
 
+        messages = await self._prepare_vlm_messages(query, mode, **kwargs)
+
+        if messages is None:
+            self.logger.info("No valid images found, falling back to normal query")
+            # Fallback to normal query
+            query_param = QueryParam(mode=mode, **kwargs)
+            return await self.lightrag.aquery(query, param=query_param)
+
+        # 4. Call VLM for question answering
+        result = await self._call_vlm_with_multimodal_content(messages)
+
+        self.logger.info("VLM enhanced query completed")
+        return result
+
+    async def _prepare_vlm_messages(
+        self, query: str, mode: str, **kwargs
+    ) -> List[Dict] | None:
+        """
+        Retrieve the context for a VLM enhanced query and build the VLM messages
+
+        Args:
+            query: User query
+            mode: Underlying LightRAG query mode
+            **kwargs: Other query parameters
+
+        Returns:
+            List[Dict] | None: VLM messages, or None if the context has no valid images
+        """
         # Clear previous image cache
         if hasattr(self, "_current_images_base64"):
             delattr(self, "_current_images_base64")
@@ -333,21 +395,139 @@ class QueryMixin:
         )
 
         if not images_found:
-            self.logger.info("No valid images found, falling back to normal query")
-            # Fallback to normal query
-            query_param = QueryParam(mode=mode, **kwargs)
-            return await self.lightrag.aquery(query, param=query_param)
+            return None
 
         self.logger.info(f"Processed {images_found} images for VLM")
 
         # 3. Build VLM message format
-        messages = self._build_vlm_messages_with_images(enhanced_prompt, query)
+        return self._build_vlm_messages_with_images(enhanced_prompt, query)
 
-        # 4. Call VLM for question answering
-        result = await self._call_vlm_with_multimodal_content(messages)
+    async def aquery_stream(
+        self,
+        query: str,
+        mode: str = "mix",
+        multimodal_content: List[Dict[str, Any]] = None,
+        **kwargs,
+    ) -> AsyncIterator[str]:
+        """
+        Streaming query - yields the answer in chunks as the model generates it
 
-        self.logger.info("VLM enhanced query completed")
-        return result
+        Takes the same routes as aquery() and aquery_with_multimodal(): VLM
+        enhanced when a vision model is available, multimodal content turned
+        into an enhanced query first. Cached answers are yielded as one chunk.
+
+        Args:
+            query: Query text
+            mode: Query mode ("local", "global", "hybrid", "naive", "mix", "bypass")
+            multimodal_content: Optional multimodal content, as for aquery_with_multimodal()
+            **kwargs: Other query parameters, will be passed to QueryParam
+                - vlm_enhanced: bool, default True when vision_model_func is available
+
+        Yields:
+            str: Answer chunks
+
+        Examples:
+            async for chunk in rag.aquery_stream("What is machine learning?"):
+                print(chunk, end="", flush=True)
+        """
+        await self._ensure_lightrag_initialized()
+        kwargs.pop("stream", None)
+        started = time.perf_counter()
+        first_chunk = True
+
+        self.logger.info(f"Executing streaming query: {query[:100]}...")
+        self.logger.info(f"Query mode: {mode}")
+
+        cache_key = None
+        if multimodal_content:
+            cache_key = self._generate_multimodal_cache_key(
+                query, multimodal_content, mode, **kwargs
+            )
+            cached_result = await self._get_cached_multimodal_result(cache_key)
+            if cached_result:
+                QUERY_FIRST_CHUNK_SECONDS.observe(
+                    time.perf_counter() - started, mode=mode
+                )
+                yield cached_result
+                return
+            query_text = await self._process_multimodal_query_content(
+                query, multimodal_content
+            )
+        else:
+            query_text = query
+
+        vlm_enhanced = kwargs.pop("vlm_enhanced", None)
+        if vlm_enhanced is None:
+            vlm_enhanced = (
+                hasattr(self, "vision_model_func")
+                and self.vision_model_func is not None
+            )
+        if vlm_enhanced and getattr(self, "vision_model_func", None):
+            chunks = self.aquery_vlm_enhanced_stream(query_text, mode=mode, **kwargs)
+        else:
+            query_param = QueryParam(mode=mode, stream=True, **kwargs)
+            chunks = _iterate_response(
+                await self.lightrag.aquery(query_text, param=query_param)
+            )
+
+        answer = []
+        async for chunk in chunks:
+            if first_chunk:
+                first_chunk = False
+                elapsed = time.perf_counter() - started
+                QUERY_FIRST_CHUNK_SECONDS.observe(elapsed, mode=mode)
+                self.logger.info(f"First answer chunk after {elapsed:.2f}s")
+            if cache_key:
+                answer.append(chunk)
+            yield chunk
+
+        if cache_key:
+            await self._cache_multimodal_result(
+                cache_key, "".join(answer), query, multimodal_content, mode
+            )
+        self.logger.info("Streaming query completed")
+
+    async def aquery_vlm_enhanced_stream(
+        self, query: str, mode: str = "mix", **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Streaming version of aquery_vlm_enhanced()
+
+        vision_model_func is called with stream=True and may return either an
+        async iterator of chunks or the whole answer as a string.
+
+        Args:
+            query: User query
+            mode: Underlying LightRAG query mode
+            **kwargs: Other query parameters
+
+        Yields:
+            str: Answer chunks
+        """
+        if not hasattr(self, "vision_model_func") or not self.vision_model_func:
+            raise ValueError(
+                "VLM enhanced query requires vision_model_func. "
+                "Please provide a vision model function when initializing RAGAnything."
+            )
+
+        await self._ensure_lightrag_initialized()
+        kwargs.pop("stream", None)
+
+        self.logger.info(f"Executing streaming VLM enhanced query: {query[:100]}...")
+
+        messages = await self._prepare_vlm_messages(query, mode, **kwargs)
+
+        if messages is None:
+            self.logger.info("No valid images found, falling back to normal query")
+            query_param = QueryParam(mode=mode, stream=True, **kwargs)
+            response = await self.lightrag.aquery(query, param=query_param)
+        else:
+            response = await self._call_vlm_with_multimodal_content(
+                messages, stream=True
+            )
+
+        async for chunk in _iterate_response(response):
+            yield chunk
 
     async def _process_multimodal_query_content(
         self, base_query: str, multimodal_content: List[Dict[str, Any]]
@@ -667,15 +847,18 @@ class QueryMixin:
             {"role": "user", "content": content_parts},
         ]
 
-    async def _call_vlm_with_multimodal_content(self, messages: List[Dict]) -> str:
+    async def _call_vlm_with_multimodal_content(
+        self, messages: List[Dict], **kwargs
+    ) -> str | AsyncIterator[str]:
         """
         Call VLM to process multimodal content
 
         Args:
             messages: VLM message format
+            **kwargs: Extra arguments for vision_model_func, e.g. stream=True
 
         Returns:
-            str: VLM response result
+            str | AsyncIterator[str]: VLM response result, or its chunks when streaming
         """
         try:
             user_message = messages[1]
@@ -685,13 +868,14 @@ class QueryMixin:
             if isinstance(content, str):
                 # Pure text mode
                 result = await self.vision_model_func(
-                    content, system_prompt=system_prompt
+                    content, system_prompt=system_prompt, **kwargs
                 )
             else:
                 # Multimodal mode - pass complete messages directly to VLM
                 result = await self.vision_model_func(
                     "",  # Empty prompt since we're using messages format
                     messages=messages,
+                    **kwargs,
                 )
 
             return result
@@ -744,3 +928,14 @@ class QueryMixin:
         return loop.run_until_complete(
             self.aquery_with_multimodal(query, multimodal_content, mode=mode, **kwargs)
         )
+
+
+async def _iterate_response(response: str | AsyncIterator[str]) -> AsyncIterator[str]:
+    """Yield the chunks of a model response, which is a string when not streamed"""
+    if isinstance(response, str):
+        if response:
+            yield response
+        return
+    async for chunk in response:
+        if chunk:
+            yield chunk
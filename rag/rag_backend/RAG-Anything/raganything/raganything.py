@@ -12,6 +12,7 @@ from typing import Dict, Any, Optional, Callable
 import sys
 import asyncio
 import atexit
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from pathlib import Path
 from dotenv import load_dotenv
@@ -29,11 +30,31 @@ from lightrag.utils import logger
 
 # Import configuration and modules
 from raganything.config import RAGAnythingConfig
+from raganything.cache import (
+    ParseCacheStats,
+    DescriptionCache,
+    ImageHashIndex,
+    ImageDedupStats,
+)
 from raganything.query import QueryMixin
 from raganything.processor import ProcessorMixin
 from raganything.batch import BatchMixin
 from raganything.utils import get_processor_supports
 from raganything.parser import MineruParser, DoclingParser
+from raganything.parser_pool import ParserWorkerPool
+from raganything.storage import (
+    ContentListStore,
+    DocStatusWriteBuffer,
+    SQLiteParseCache,
+)
+from raganything.tracing import trace_span
+from raganything.metrics import (
+    CACHE_REQUESTS,
+    REGISTRY,
+    Counter,
+    instrument_model_func,
+    render_gauges,
+)
 
 # Import specialized processors
 from raganything.modalprocessors import (
@@ -93,9 +114,34 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
     parse_cache: Optional[Any] = field(default=None, init=False)
     """Parse result cache storage using LightRAG KV storage."""
 
+    parse_cache_stats: ParseCacheStats = field(
+        default_factory=ParseCacheStats, init=False
+    )
+    """Hit/miss counters for the parse result cache."""
+
     _parser_installation_checked: bool = field(default=False, init=False)
     """Flag to track if parser installation has been checked."""
 
+    _parser_pool: Optional[ParserWorkerPool] = field(default=None, init=False)
+    """Persistent parser worker pool, created on first use when enabled."""
+
+    description_cache: Optional[DescriptionCache] = field(default=None, init=False)
+    """Persistent cache of multimodal descriptions shared by all modal processors."""
+
+    image_hash_index: Optional[ImageHashIndex] = field(default=None, init=False)
+    """Persistent perceptual-hash index for reusing descriptions of near-identical images."""
+
+    image_dedup_stats: ImageDedupStats = field(
+        default_factory=ImageDedupStats, init=False
+    )
+    """Counters for near-duplicate image clustering."""
+
+    doc_status_buffer: Optional[DocStatusWriteBuffer] = field(default=None, init=False)
+    """Write-behind buffer coalescing doc_status updates, created with LightRAG storages."""
+
+    ingestion_traces: OrderedDict = field(default_factory=OrderedDict, init=False)
+    """Most recent ingestion traces, keyed by doc_id (or file path before one is known)."""
+
     def __post_init__(self):
         """Post-initialization setup following LightRAG pattern"""
         # Initialize configuration if not provided
@@ -108,6 +154,13 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
         # Set up logger (use existing logger, don't configure it)
         self.logger = logger
 
+        # Count calls and observe latency of the model functions
+        if self.config.enable_metrics:
+            self.llm_model_func = instrument_model_func(self.llm_model_func, "llm")
+            self.vision_model_func = instrument_model_func(
+                self.vision_model_func, "vlm"
+            )
+
         # Set up document parser
         self.doc_parser = (
             DoclingParser() if self.config.parser == "docling" else MineruParser()
@@ -148,6 +201,22 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
             # Use print instead of logger since logger might be cleaned up already
             print(f"Warning: Failed to finalize RAGAnything storages: {e}")
 
+    def _get_parser_pool(self) -> ParserWorkerPool:
+        """Get the parser worker pool for the configured parser, creating it if needed"""
+        if (
+            self._parser_pool is not None
+            and self._parser_pool.parser_type != self.config.parser
+        ):
+            self._parser_pool.shutdown(wait=False)
+            self._parser_pool = None
+
+        if self._parser_pool is None:
+            self._parser_pool = ParserWorkerPool(
+                parser_type=self.config.parser,
+                max_workers=self.config.parser_pool_workers,
+            )
+        return self._parser_pool
+
     def _create_context_config(self) -> ContextConfig:
         """Create context configuration from RAGAnything config"""
         return ContextConfig(
@@ -181,6 +250,26 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
         # Create context extractor
         self.context_extractor = self._create_context_extractor()
 
+        # Create the description cache shared by all processors
+        if self.description_cache is None and self.config.enable_description_cache:
+            self.description_cache = DescriptionCache(
+                cache_file=os.path.join(self.working_dir, "description_cache.json"),
+                max_entries=self.config.description_cache_max_entries,
+                ttl_seconds=self.config.description_cache_ttl,
+                context_sensitive=self.config.description_cache_context_sensitive,
+            )
+
+        # Near-duplicate images only share descriptions when context is not part of the key
+        if (
+            self.image_hash_index is None
+            and self.config.enable_image_dedup
+            and not self.config.description_cache_context_sensitive
+        ):
+            self.image_hash_index = ImageHashIndex(
+                index_file=os.path.join(self.working_dir, "image_hash_index.json"),
+                max_entries=self.config.description_cache_max_entries,
+            )
+
         # Create different multimodal processors based on configuration
         self.modal_processors = {}
 
@@ -189,6 +278,14 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
                 lightrag=self.lightrag,
                 modal_caption_func=self.vision_model_func or self.llm_model_func,
                 context_extractor=self.context_extractor,
+                description_cache=self.description_cache,
+                model_id=self._get_caption_model_id(
+                    self.vision_model_func or self.llm_model_func
+                ),
+                image_hash_index=self.image_hash_index,
+                image_dedup_threshold=self.config.image_dedup_threshold,
+                batch_size=self.config.image_caption_batch_size,
+                batch_max_bytes=self.config.image_caption_batch_max_bytes,
             )
 
         if self.config.enable_table_processing:
@@ -196,6 +293,8 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
                 lightrag=self.lightrag,
                 modal_caption_func=self.llm_model_func,
                 context_extractor=self.context_extractor,
+                description_cache=self.description_cache,
+                model_id=self._get_caption_model_id(self.llm_model_func),
             )
 
         if self.config.enable_equation_processing:
@@ -203,6 +302,8 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
                 lightrag=self.lightrag,
                 modal_caption_func=self.llm_model_func,
                 context_extractor=self.context_extractor,
+                description_cache=self.description_cache,
+                model_id=self._get_caption_model_id(self.llm_model_func),
             )
 
         # Always include generic processor as fallback
@@ -210,12 +311,47 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
             lightrag=self.lightrag,
             modal_caption_func=self.llm_model_func,
             context_extractor=self.context_extractor,
+            description_cache=self.description_cache,
+            model_id=self._get_caption_model_id(self.llm_model_func),
         )
 
         self.logger.info("Multimodal processors initialized with context support")
         self.logger.info(f"Available processors: {list(self.modal_processors.keys())}")
         self.logger.info(f"Context configuration: {self._create_context_config()}")
 
+    def _get_caption_model_id(self, caption_func) -> str:
+        """Identify the model behind a caption function for description cache keys"""
+        if self.config.description_cache_model_id:
+            return self.config.description_cache_model_id
+        func_name = getattr(caption_func, "__qualname__", type(caption_func).__name__)
+        model_name = getattr(self.lightrag, "llm_model_name", "")
+        return f"{model_name}:{func_name}" if model_name else func_name
+
+    async def flush_description_cache(self):
+        """Persist new entries of the description cache and image hash index"""
+        with trace_span("flush.description_cache"):
+            # Snapshot on the loop, which keeps using the caches during the write
+            for cache in (self.description_cache, self.image_hash_index):
+                if cache is None:
+                    continue
+                entries = cache.snapshot()
+                if entries is not None:
+                    await asyncio.to_thread(cache.write, entries)
+
+    async def compact_parse_cache(self) -> Optional[Dict[str, int]]:
+        """Reclaim the segment space of replaced and deleted parse cache entries
+
+        Only for the sqlite parse cache backend; no other process may use the
+        working directory meanwhile.
+
+        Returns:
+            Optional[Dict[str, int]]: Compaction stats, or None for other backends
+        """
+        await self._ensure_lightrag_initialized()
+        if not isinstance(self.parse_cache, SQLiteParseCache):
+            return None
+        return await self.parse_cache.compact()
+
     def update_config(self, **kwargs):
         """Update configuration with new values"""
         for key, value in kwargs.items():
@@ -264,16 +400,11 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
                         self.logger.info(
                             "Initializing parse cache for pre-provided LightRAG instance"
                         )
-                        self.parse_cache = (
-                            self.lightrag.key_string_value_json_storage_cls(
-                                namespace="parse_cache",
-                                workspace=self.lightrag.workspace,
-                                global_config=self.lightrag.__dict__,
-                                embedding_func=self.embedding_func,
-                            )
-                        )
+                        self.parse_cache = self._create_parse_cache()
                         await self.parse_cache.initialize()
 
+                    await self._initialize_doc_status_buffer()
+
                     # Initialize processors if not already done
                     if not self.modal_processors:
                         self._initialize_processors()
@@ -325,14 +456,10 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
                 await self.lightrag.initialize_storages()
                 await initialize_pipeline_status()
 
-                # Initialize parse cache storage using LightRAG's KV storage
-                self.parse_cache = self.lightrag.key_string_value_json_storage_cls(
-                    namespace="parse_cache",
-                    workspace=self.lightrag.workspace,
-                    global_config=self.lightrag.__dict__,
-                    embedding_func=self.embedding_func,
-                )
+                # Initialize parse cache storage
+                self.parse_cache = self._create_parse_cache()
                 await self.parse_cache.initialize()
+                await self._initialize_doc_status_buffer()
 
                 # Initialize processors after LightRAG is ready
                 self._initialize_processors()
@@ -352,6 +479,57 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
             self.logger.error(error_msg, exc_info=True)
             return {"success": False, "error": error_msg}
 
+    def _create_parse_cache(self):
+        """Create the parse cache storage for the configured backend
+
+        "sqlite" stores one row per entry in working_dir, with content lists in
+        memory-mapped segment files; "kv" uses LightRAG's KV storage; "auto" picks
+        SQLite when LightRAG's KV storage is the JSON file backend, which rewrites
+        the whole cache file on every flush.
+        """
+        backend = self.config.parse_cache_backend
+        if backend == "auto":
+            kv_storage = getattr(self.lightrag, "kv_storage", "JsonKVStorage")
+            backend = "sqlite" if kv_storage == "JsonKVStorage" else "kv"
+
+        if backend == "sqlite":
+            workspace_dir = self.lightrag.working_dir
+            if getattr(self.lightrag, "workspace", ""):
+                workspace_dir = os.path.join(workspace_dir, self.lightrag.workspace)
+            return SQLiteParseCache(
+                os.path.join(workspace_dir, "parse_cache.sqlite"),
+                legacy_json_file=os.path.join(
+                    workspace_dir, "kv_store_parse_cache.json"
+                ),
+                content_store=ContentListStore(
+                    os.path.join(workspace_dir, "parse_cache_segments"),
+                    segment_max_bytes=self.config.parse_cache_segment_max_mb
+                    * 1024
+                    * 1024,
+                ),
+            )
+
+        return self.lightrag.key_string_value_json_storage_cls(
+            namespace="parse_cache",
+            workspace=self.lightrag.workspace,
+            global_config=self.lightrag.__dict__,
+            embedding_func=self.embedding_func,
+        )
+
+    async def _initialize_doc_status_buffer(self):
+        """Create the doc_status write buffer and replay updates journaled before a crash"""
+        if (
+            self.doc_status_buffer is not None
+            or not self.config.enable_doc_status_buffer
+        ):
+            return
+        self.doc_status_buffer = DocStatusWriteBuffer(
+            self.lightrag.doc_status,
+            journal_file=os.path.join(self.working_dir, "doc_status_journal.jsonl"),
+            flush_interval=self.config.doc_status_flush_interval,
+        )
+        await self.doc_status_buffer.recover()
+
     async def finalize_storages(self):
         """Finalize all storages including parse cache and LightRAG storages
 
@@ -377,6 +555,19 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
         try:
             tasks = []
 
+            # Stop parser worker processes
+            if self._parser_pool is not None:
+                self._parser_pool.shutdown(wait=False)
+                self._parser_pool = None
+
+            # Write buffered doc_status updates before its storage is finalized
+            if self.doc_status_buffer is not None:
+                await self.doc_status_buffer.close()
+
+            # Persist multimodal descriptions
+            if self.description_cache is not None or self.image_hash_index is not None:
+                tasks.append(self.flush_description_cache())
+
             # Finalize parse cache if it exists
             if self.parse_cache is not None:
                 tasks.append(self.parse_cache.finalize())
@@ -418,6 +609,58 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
             self.logger.info(f"Parser '{self.config.parser}' installation verified")
         return True
 
+    def render_metrics(self) -> str:
+        """
+        Render metrics in the Prometheus text exposition format
+
+        Combines the process-wide metrics recorded during ingestion and queries
+        with the hit counters of the parse, description and LLM response caches.
+
+        Returns:
+            str: Metrics text
+        """
+        cache_requests = Counter(
+            CACHE_REQUESTS.name, CACHE_REQUESTS.documentation, CACHE_REQUESTS.labelnames
+        )
+        for _, labels, value in CACHE_REQUESTS._samples():
+            cache_requests.inc(value, **labels)
+
+        parse_stats = self.parse_cache_stats.to_dict()
+        cache_requests.inc(parse_stats["path_hits"], cache="parse", result="path_hit")
+        cache_requests.inc(
+            parse_stats["content_hits"], cache="parse", result="content_hit"
+        )
+        cache_requests.inc(parse_stats["misses"], cache="parse", result="miss")
+        if self.description_cache is not None:
+            description_stats = self.description_cache.stats()
+            cache_requests.inc(
+                description_stats["hits"], cache="description", result="hit"
+            )
+            cache_requests.inc(
+                description_stats["misses"], cache="description", result="miss"
+            )
+        if self.lightrag is not None:
+            from lightrag.utils import statistic_data
+
+            cache_requests.inc(statistic_data["llm_cache"], cache="llm", result="hit")
+            cache_requests.inc(statistic_data["llm_call"], cache="llm", result="miss")
+
+        dedup_stats = self.image_dedup_stats.to_dict()
+        text = REGISTRY.render()
+        text += "\n".join(cache_requests.render()) + "\n"
+        text += render_gauges(
+            "raganything_image_dedup",
+            "Near-duplicate image clustering counters since start.",
+            [({"counter": key}, value) for key, value in dedup_stats.items()],
+        )
+        if self.doc_status_buffer is not None:
+            text += render_gauges(
+                "raganything_doc_status_pending",
+                "Documents with doc_status updates waiting in the write buffer.",
+                [({}, self.doc_status_buffer.stats()["pending_documents"])],
+            )
+        return text
+
     def get_config_info(self) -> Dict[str, Any]:
         """Get current configuration information"""
         config_info = {
@@ -429,12 +672,44 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
                 "parser": self.config.parser,
                 "parse_method": self.config.parse_method,
                 "display_content_stats": self.config.display_content_stats,
+                "enable_content_hash_cache": self.config.enable_content_hash_cache,
+                "parser_timeout": self.config.parser_timeout,
+                "use_parser_worker_pool": self.config.use_parser_worker_pool,
+                "parser_pool_workers": self.config.parser_pool_workers,
+                "pdf_shard_pages": self.config.pdf_shard_pages,
+                "pdf_shard_min_pages": self.config.pdf_shard_min_pages,
+                "pdf_shard_workers": self.config.pdf_shard_workers,
+                "parse_cache_backend": self.config.parse_cache_backend,
+                "parse_cache_segment_max_mb": self.config.parse_cache_segment_max_mb,
+            },
+            "tracing": {
+                "enable_metrics": self.config.enable_metrics,
+                "max_ingestion_traces": self.config.max_ingestion_traces,
+                "ingestion_trace_file": self.config.ingestion_trace_file,
             },
             "multimodal_processing": {
                 "enable_image_processing": self.config.enable_image_processing,
                 "enable_table_processing": self.config.enable_table_processing,
                 "enable_equation_processing": self.config.enable_equation_processing,
             },
+            "description_cache": {
+                "enable_description_cache": self.config.enable_description_cache,
+                "description_cache_max_entries": self.config.description_cache_max_entries,
+                "description_cache_ttl": self.config.description_cache_ttl,
+                "description_cache_context_sensitive": self.config.description_cache_context_sensitive,
+            },
+            "image_dedup": {
+                "enable_image_dedup": self.config.enable_image_dedup,
+                "image_dedup_threshold": self.config.image_dedup_threshold,
+            },
+            "image_caption_batching": {
+                "image_caption_batch_size": self.config.image_caption_batch_size,
+                "image_caption_batch_max_bytes": self.config.image_caption_batch_max_bytes,
+            },
+            "doc_status": {
+                "enable_doc_status_buffer": self.config.enable_doc_status_buffer,
+                "doc_status_flush_interval": self.config.doc_status_flush_interval,
+            },
             "context_extraction": {
                 "context_window": self.config.context_window,
                 "context_mode": self.config.context_mode,
@@ -448,6 +723,10 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
                 "supported_file_extensions": self.config.supported_file_extensions,
                 "recursive_folder_processing": self.config.recursive_folder_processing,
             },
+            "streaming_ingestion": {
+                "enable_streaming_ingestion": self.config.enable_streaming_ingestion,
+                "streaming_queue_size": self.config.streaming_queue_size,
+            },
             "logging": {
                 "note": "Logging fields have been removed - configure logging externally",
             },
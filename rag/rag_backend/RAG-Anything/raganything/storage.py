@@ -0,0 +1,583 @@
+"""
+Storage helpers for RAGAnything
+
+Contains a write-behind buffer that coalesces document status updates before
+they reach LightRAG's doc_status storage, and a SQLite backend for the parse
+result cache whose content lists live in memory-mapped segment files
+"""
+
+import asyncio
+import json
+import mmap
+import os
+import sqlite3
+import threading
+import zlib
+from typing import Dict, Any, List, Optional
+
+from lightrag.utils import logger
+
+
+class DocStatusWriteBuffer:
+    """Write-behind buffer for LightRAG doc_status updates
+
+    Field updates are merged per doc_id in memory and written with a single
+    upsert and index_done_callback() per flush, instead of one storage rewrite
+    per update. Every update is appended to a journal file first, so updates
+    buffered when the process dies are replayed by recover() on the next start.
+    """
+
+    def __init__(
+        self,
+        doc_status,
+        journal_file: Optional[str] = None,
+        flush_interval: float = 2.0,
+    ):
+        """Initialize the buffer
+
+        Args:
+            doc_status: LightRAG doc_status storage
+            journal_file: JSON lines file journaling buffered updates (None disables journaling)
+            flush_interval: Seconds between background flushes (0 flushes only on demand)
+        """
+        self.doc_status = doc_status
+        self.journal_file = journal_file
+        self.flush_interval = flush_interval
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self.flush_count = 0
+        self.coalesced_updates = 0
+
+    async def get(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        """Get a document status with buffered updates applied
+
+        Args:
+            doc_id: Document ID
+
+        Returns:
+            Optional[Dict[str, Any]]: Current status record, or None if the document
+            has neither a stored record nor buffered updates
+        """
+        stored = await self.doc_status.get_by_id(doc_id)
+        pending = self._pending.get(doc_id)
+        if pending is None:
+            return stored
+        return {**(stored or {}), **pending}
+
+    async def update(self, doc_id: str, fields: Dict[str, Any]):
+        """Buffer field updates for a document
+
+        Args:
+            doc_id: Document ID
+            fields: Fields to set; later updates of the same field win
+        """
+        async with self._lock:
+            if self.journal_file:
+                await asyncio.to_thread(self._append_journal, doc_id, fields)
+            if doc_id in self._pending:
+                self.coalesced_updates += 1
+                self._pending[doc_id].update(fields)
+            else:
+                self._pending[doc_id] = dict(fields)
+        self._ensure_flush_task()
+
+    async def flush(self):
+        """Write all buffered updates to doc_status and persist it once"""
+        async with self._lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, {}
+            try:
+                records = {}
+                for doc_id, fields in pending.items():
+                    stored = await self.doc_status.get_by_id(doc_id)
+                    records[doc_id] = {**(stored or {}), **fields}
+                await self.doc_status.upsert(records)
+                await self.doc_status.index_done_callback()
+            except Exception:
+                # Keep the updates, merged under any made since, for the next flush
+                for doc_id, fields in pending.items():
+                    self._pending[doc_id] = {**fields, **self._pending.get(doc_id, {})}
+                raise
+            self.flush_count += 1
+            if self.journal_file and not self._pending:
+                await asyncio.to_thread(self._truncate_journal)
+            logger.debug(f"Flushed doc_status updates for {len(records)} documents")
+
+    async def recover(self) -> int:
+        """Replay journaled updates left by a previous process and flush them
+
+        Returns:
+            int: Number of documents recovered
+        """
+        if not self.journal_file or not os.path.exists(self.journal_file):
+            return 0
+
+        recovered: Dict[str, Dict[str, Any]] = {}
+        with open(self.journal_file, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final line from a crash mid-write
+                    continue
+                recovered.setdefault(entry["doc_id"], {}).update(entry["fields"])
+
+        if recovered:
+            async with self._lock:
+                for doc_id, fields in recovered.items():
+                    self._pending[doc_id] = {**fields, **self._pending.get(doc_id, {})}
+            logger.info(
+                f"Recovered buffered doc_status updates for {len(recovered)} documents"
+            )
+        await self.flush()
+        if not recovered:
+            await asyncio.to_thread(self._truncate_journal)
+        return len(recovered)
+
+    async def close(self):
+        """Stop the background flusher and flush remaining updates"""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        """Export buffer counters"""
+        return {
+            "pending_documents": len(self._pending),
+            "flushes": self.flush_count,
+            "coalesced_updates": self.coalesced_updates,
+        }
+
+    def _ensure_flush_task(self):
+        """Start the periodic flusher on the running event loop"""
+        if self.flush_interval <= 0:
+            return
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+        self._flush_task = asyncio.get_running_loop().create_task(self._flush_loop())
+
+    async def _flush_loop(self):
+        """Flush buffered updates every flush_interval seconds"""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.warning(f"Background doc_status flush failed: {e}")
+
+    def _append_journal(self, doc_id: str, fields: Dict[str, Any]):
+        """Append one update to the journal"""
+        with open(self.journal_file, "a", encoding="utf-8") as f:
+            f.write(
+                json.dumps(
+                    {"doc_id": doc_id, "fields": fields},
+                    ensure_ascii=False,
+                    default=str,
+                )
+                + "\n"
+            )
+            f.flush()
+
+    def _truncate_journal(self):
+        """Clear the journal once its updates are persisted"""
+        if os.path.exists(self.journal_file):
+            with open(self.journal_file, "w", encoding="utf-8"):
+                pass
+
+
+class ContentListStore:
+    """Append-only segment files holding compressed content lists
+
+    Each content list is stored as one zlib-compressed JSON record and addressed
+    by a (segment, offset, length) reference. Segments are memory-mapped on first
+    read, so a record is only decoded when its content list is requested and
+    untouched records cost neither memory nor startup time.
+
+    Records are appended with O_APPEND and addressed by the position the write
+    ended at, so processes sharing the directory can append concurrently.
+    Replaced and deleted records stay in their segments until compact() copies
+    the live records to a fresh segment; compaction must not run while another
+    process uses the store.
+    """
+
+    SEGMENT_PREFIX = "segment-"
+
+    def __init__(self, directory: str, segment_max_bytes: int = 256 * 1024 * 1024):
+        """Initialize the store
+
+        Args:
+            directory: Directory holding the segment files
+            segment_max_bytes: Size after which writes roll over to a new segment
+        """
+        self.directory = directory
+        self.segment_max_bytes = segment_max_bytes
+        self._lock = threading.Lock()
+        self._maps: Dict[int, mmap.mmap] = {}
+        self._map_files: Dict[int, Any] = {}
+        self._active_segment: Optional[int] = None
+
+    def write(self, content_list: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Append a content list
+
+        Args:
+            content_list: Content list to store
+
+        Returns:
+            Dict[str, int]: Reference with segment, offset and length
+        """
+        record = zlib.compress(
+            json.dumps(content_list, ensure_ascii=False, default=str).encode("utf-8")
+        )
+        with self._lock:
+            return self._append(record)
+
+    def read(self, ref: Dict[str, int]) -> List[Dict[str, Any]]:
+        """Decode the content list behind a reference
+
+        Args:
+            ref: Reference returned by write()
+
+        Returns:
+            List[Dict[str, Any]]: Stored content list
+        """
+        with self._lock:
+            record = self._read_record(ref)
+        return json.loads(zlib.decompress(record).decode("utf-8"))
+
+    def compact(self, refs: Dict[str, Dict[str, int]]):
+        """Copy live records to a fresh segment, leaving the old segments stale
+
+        Args:
+            refs: Reference of every live record, by any key
+
+        Returns:
+            Tuple[Dict[str, Dict[str, int]], List[int]]: New reference per key, and
+            the stale segments to pass to remove_segments() once the new
+            references are stored
+        """
+        with self._lock:
+            stale = self._segments()
+            self._active_segment = max(stale, default=0) + 1
+            new_refs = {
+                key: self._append(self._read_record(ref)) for key, ref in refs.items()
+            }
+        return new_refs, stale
+
+    def remove_segments(self, segments: List[int]) -> int:
+        """Delete segments left stale by compact()
+
+        Args:
+            segments: Segment numbers returned by compact()
+
+        Returns:
+            int: Bytes of the deleted segments
+        """
+        freed = 0
+        with self._lock:
+            for segment in segments:
+                self._unmap_segment(segment)
+                path = self._segment_path(segment)
+                try:
+                    freed += os.path.getsize(path)
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+        return freed
+
+    def close(self):
+        """Unmap all segments"""
+        with self._lock:
+            for segment in list(self._maps):
+                self._unmap_segment(segment)
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.directory, f"{self.SEGMENT_PREFIX}{segment:06d}.bin")
+
+    def _segments(self) -> List[int]:
+        """Numbers of the segment files on disk"""
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(
+            int(name[len(self.SEGMENT_PREFIX) : -len(".bin")])
+            for name in os.listdir(self.directory)
+            if name.startswith(self.SEGMENT_PREFIX) and name.endswith(".bin")
+        )
+
+    def _append(self, record: bytes) -> Dict[str, int]:
+        """Append a record to the writable segment (called with the lock held)"""
+        segment = self._writable_segment(len(record))
+        fd = os.open(
+            self._segment_path(segment),
+            os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0),
+            0o644,
+        )
+        try:
+            written = os.write(fd, record)
+            # With O_APPEND the write lands at the current end of the file, which
+            # another process may have moved since this one last looked
+            end = os.lseek(fd, 0, os.SEEK_CUR)
+        finally:
+            os.close(fd)
+        if written != len(record):
+            raise OSError(f"Short write to content list segment {segment}")
+        return {"segment": segment, "offset": end - len(record), "length": len(record)}
+
+    def _read_record(self, ref: Dict[str, int]) -> bytes:
+        """Compressed bytes of a record (called with the lock held)"""
+        segment, offset, length = ref["segment"], ref["offset"], ref["length"]
+        mapped = self._maps.get(segment)
+        if mapped is None or len(mapped) < offset + length:
+            # Not mapped yet, or the segment grew since it was mapped
+            mapped = self._map_segment(segment)
+        return mapped[offset : offset + length]
+
+    def _writable_segment(self, record_size: int) -> int:
+        """Pick the segment the next record is appended to"""
+        if self._active_segment is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._active_segment = max(self._segments(), default=1)
+
+        path = self._segment_path(self._active_segment)
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        if size and size + record_size > self.segment_max_bytes:
+            self._active_segment += 1
+        return self._active_segment
+
+    def _map_segment(self, segment: int) -> mmap.mmap:
+        self._unmap_segment(segment)
+        f = open(self._segment_path(segment), "rb")
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            f.close()
+            raise
+        self._maps[segment] = mapped
+        self._map_files[segment] = f
+        return mapped
+
+    def _unmap_segment(self, segment: int):
+        mapped = self._maps.pop(segment, None)
+        if mapped is not None:
+            mapped.close()
+        f = self._map_files.pop(segment, None)
+        if f is not None:
+            f.close()
+
+
+class SQLiteParseCache:
+    """Parse result cache stored in SQLite, one row per cache entry
+
+    Implements the subset of LightRAG's KV storage interface used for the parse
+    cache. Unlike the JSON KV storage, which keeps every cached content list in
+    memory and rewrites the whole file on each flush, entries are read on demand
+    and each upsert writes only the touched rows. With a content store, content
+    lists are kept out of the rows and replaced by a reference into its segments;
+    the space of replaced and deleted content lists is reclaimed by compact().
+    """
+
+    def __init__(
+        self,
+        db_file: str,
+        legacy_json_file: Optional[str] = None,
+        content_store: Optional[ContentListStore] = None,
+    ):
+        """Initialize the cache
+
+        Args:
+            db_file: SQLite database file
+            legacy_json_file: JSON KV storage file of the parse cache, imported once
+                into an empty database
+            content_store: Segment store for content lists (None keeps them inline)
+        """
+        self.db_file = db_file
+        self.legacy_json_file = legacy_json_file
+        self.content_store = content_store
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._content_lock = threading.Lock()
+        """Held while rows and their content lists are read or written together,
+        so compaction does not move content lists under a reader or writer."""
+
+    async def initialize(self):
+        """Open the database, creating the table and importing legacy entries"""
+        await asyncio.to_thread(self._open)
+
+    async def get_by_id(self, id: str) -> Optional[Dict[str, Any]]:
+        """Get one cache entry
+
+        Args:
+            id: Cache key
+
+        Returns:
+            Optional[Dict[str, Any]]: Entry, or None if not cached
+        """
+        return await asyncio.to_thread(self._get, id)
+
+    async def upsert(self, data: Dict[str, Dict[str, Any]]):
+        """Insert or replace cache entries
+
+        Args:
+            data: Mapping of cache key to entry
+        """
+        if not data:
+            return
+        await asyncio.to_thread(self._write, data)
+
+    async def delete(self, ids: List[str]):
+        """Delete cache entries
+
+        Args:
+            ids: Cache keys to delete
+        """
+        await asyncio.to_thread(
+            self._executemany,
+            "DELETE FROM parse_cache WHERE key = ?",
+            [(key,) for key in ids],
+        )
+
+    async def compact(self) -> Dict[str, int]:
+        """Rewrite the live content lists into a fresh segment and delete the old ones
+
+        Segments only grow: replacing or deleting an entry leaves its content list
+        behind. Compaction must not run while another process uses the cache.
+
+        Returns:
+            Dict[str, int]: Number of entries moved, segments removed and bytes freed
+        """
+        if self.content_store is None:
+            return {"entries": 0, "segments_removed": 0, "bytes_freed": 0}
+        return await asyncio.to_thread(self._compact)
+
+    async def index_done_callback(self):
+        """Nothing to persist: every upsert is committed on its own"""
+
+    async def finalize(self):
+        """Close the database and the content store"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+        if self.content_store is not None:
+            self.content_store.close()
+
+    def _open(self):
+        """Open the connection (runs in a worker thread)"""
+        os.makedirs(os.path.dirname(self.db_file) or ".", exist_ok=True)
+        with self._lock:
+            self._conn = sqlite3.connect(self.db_file, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS parse_cache "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+            self._conn.commit()
+            empty = (
+                self._conn.execute("SELECT 1 FROM parse_cache LIMIT 1").fetchone()
+                is None
+            )
+        if empty and self.legacy_json_file and os.path.exists(self.legacy_json_file):
+            self._import_legacy_json()
+
+    def _import_legacy_json(self):
+        """Copy the entries of a JSON KV parse cache into the database"""
+        try:
+            with open(self.legacy_json_file, "r", encoding="utf-8") as f:
+                legacy_data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Could not import legacy parse cache: {e}")
+            return
+        entries = {
+            key: value for key, value in legacy_data.items() if isinstance(value, dict)
+        }
+        self._write(entries)
+        logger.info(
+            f"Imported {len(entries)} parse cache entries from {self.legacy_json_file}"
+        )
+
+    def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Read one entry, decoding its content list from the content store"""
+        with self._content_lock:
+            rows = self._execute("SELECT value FROM parse_cache WHERE key = ?", (key,))
+            if not rows:
+                return None
+            value = json.loads(rows[0][0])
+            ref = value.pop("content_list_ref", None)
+            if ref is not None:
+                value["content_list"] = self.content_store.read(ref)
+        return value
+
+    def _write(self, data: Dict[str, Dict[str, Any]]):
+        """Write entries, moving content lists to the content store"""
+        with self._content_lock:
+            rows = []
+            for key, value in data.items():
+                if self.content_store is not None and "content_list" in value:
+                    value = dict(value)
+                    value["content_list_ref"] = self.content_store.write(
+                        value.pop("content_list")
+                    )
+                rows.append((key, json.dumps(value, ensure_ascii=False, default=str)))
+            self._executemany(
+                "INSERT OR REPLACE INTO parse_cache (key, value) VALUES (?, ?)", rows
+            )
+
+    def _compact(self) -> Dict[str, int]:
+        """Move the referenced content lists to a fresh segment (runs in a worker thread)"""
+        with self._content_lock:
+            values = {
+                key: json.loads(value)
+                for key, value in self._execute("SELECT key, value FROM parse_cache")
+            }
+            refs = {
+                key: value["content_list_ref"]
+                for key, value in values.items()
+                if "content_list_ref" in value
+            }
+            new_refs, stale = self.content_store.compact(refs)
+            rows = []
+            for key, ref in new_refs.items():
+                values[key]["content_list_ref"] = ref
+                rows.append(
+                    (key, json.dumps(values[key], ensure_ascii=False, default=str))
+                )
+            # The rows point at the new segment before the old ones are deleted,
+            # so a crash in between leaves only unreferenced segments behind
+            self._executemany(
+                "INSERT OR REPLACE INTO parse_cache (key, value) VALUES (?, ?)", rows
+            )
+            # Net of the copies written to the new segment
+            freed = self.content_store.remove_segments(stale) - sum(
+                ref["length"] for ref in new_refs.values()
+            )
+        logger.info(
+            f"Compacted parse cache: {len(refs)} content lists kept, "
+            f"{len(stale)} segments removed, {freed} bytes freed"
+        )
+        return {
+            "entries": len(refs),
+            "segments_removed": len(stale),
+            "bytes_freed": freed,
+        }
+
+    def _execute(self, sql: str, params: tuple = ()) -> list:
+        """Run a query and fetch all rows (runs in a worker thread)"""
+        with self._lock:
+            if self._conn is None:
+                raise RuntimeError("Parse cache database is not initialized")
+            return self._conn.execute(sql, params).fetchall()
+
+    def _executemany(self, sql: str, rows: list):
+        """Run a statement for many rows in one transaction (runs in a worker thread)"""
+        with self._lock:
+            if self._conn is None:
+                raise RuntimeError("Parse cache database is not initialized")
+            with self._conn:
+                self._conn.executemany(sql, rows)
@@ -0,0 +1,325 @@
+"""
+Ingestion tracing for RAGAnything
+
+Records timing spans around the stages of document ingestion (parsing, text
+insertion, multimodal description, entity extraction, merging, storage flushes)
+into a per-document trace, exportable as JSON or as OpenTelemetry-compatible
+span records
+"""
+
+import functools
+import inspect
+import json
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Any, Callable, Iterator, List, Optional
+
+from lightrag.utils import logger
+
+from raganything.metrics import INGESTION_STAGE_SECONDS
+
+_current_trace: ContextVar[Optional["IngestionTrace"]] = ContextVar(
+    "raganything_ingestion_trace", default=None
+)
+_current_span_id: ContextVar[Optional[str]] = ContextVar(
+    "raganything_ingestion_span", default=None
+)
+_in_traced_ingestion: ContextVar[bool] = ContextVar(
+    "raganything_in_traced_ingestion", default=False
+)
+
+
+@dataclass
+class Span:
+    """One timed operation within an ingestion trace"""
+
+    name: str
+    span_id: str
+    parent_id: Optional[str]
+    start_time: float
+    """Wall clock start, seconds since the epoch."""
+
+    duration: float = 0.0
+    """Elapsed seconds, measured with a monotonic clock."""
+
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Export the span as a JSON-serializable dict"""
+        return {
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": self.start_time,
+            "duration": round(self.duration, 6),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+@dataclass
+class IngestionTrace:
+    """Spans recorded while ingesting one document"""
+
+    name: str
+    trace_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    start_time: float = field(default_factory=time.time)
+    spans: List[Span] = field(default_factory=list)
+    exported_spans: int = 0
+    """Number of leading spans already written by export()."""
+
+    listeners: List[Callable[[str, Span], None]] = field(
+        default_factory=list, repr=False, compare=False
+    )
+    """Called with ("start" or "end", span) as spans open and close, and with
+    ("progress", span) as a span reports progress, possibly from a parser thread."""
+
+    def notify(self, phase: str, span: Span):
+        """Call the span listeners; a failing listener does not affect ingestion"""
+        for listener in self.listeners:
+            try:
+                listener(phase, span)
+            except Exception as e:
+                logger.debug(f"Ingestion trace listener failed: {e}")
+
+    @property
+    def duration(self) -> float:
+        """Seconds from the trace start to the end of its last span"""
+        if not self.spans:
+            return 0.0
+        return max(s.start_time + s.duration for s in self.spans) - self.start_time
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Aggregate span durations per span name
+
+        Returns:
+            Dict[str, Dict[str, Any]]: count, total_seconds and max_seconds per name,
+            ordered by total time spent
+        """
+        stages: Dict[str, Dict[str, Any]] = {}
+        for span in self.spans:
+            stage = stages.setdefault(
+                span.name, {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+            )
+            stage["count"] += 1
+            stage["total_seconds"] += span.duration
+            stage["max_seconds"] = max(stage["max_seconds"], span.duration)
+        for stage in stages.values():
+            stage["total_seconds"] = round(stage["total_seconds"], 6)
+            stage["max_seconds"] = round(stage["max_seconds"], 6)
+        return dict(sorted(stages.items(), key=lambda item: -item[1]["total_seconds"]))
+
+    def to_dict(self, include_spans: bool = True) -> Dict[str, Any]:
+        """Export the trace as a JSON-serializable dict
+
+        Args:
+            include_spans: Include every span, not only the per-stage summary
+        """
+        data = {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "attributes": self.attributes,
+            "start_time": self.start_time,
+            "duration": round(self.duration, 6),
+            "stages": self.summary(),
+        }
+        if include_spans:
+            data["spans"] = [span.to_dict() for span in self.spans]
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "IngestionTrace":
+        """Rebuild a trace exported by to_dict(include_spans=True)"""
+        return cls(
+            name=data["name"],
+            trace_id=data["trace_id"],
+            attributes=dict(data.get("attributes") or {}),
+            start_time=data["start_time"],
+            spans=[Span(**span) for span in data.get("spans", [])],
+        )
+
+    def to_otel(self, start: int = 0) -> List[Dict[str, Any]]:
+        """Export the spans in the OpenTelemetry (OTLP JSON) span format
+
+        Args:
+            start: Index of the first span to export
+        """
+        records = []
+        for span in self.spans[start:]:
+            attributes = {**self.attributes, **span.attributes}
+            records.append(
+                {
+                    "traceId": self.trace_id,
+                    "spanId": span.span_id,
+                    "parentSpanId": span.parent_id or "",
+                    "name": span.name,
+                    "kind": 1,
+                    "startTimeUnixNano": int(span.start_time * 1e9),
+                    "endTimeUnixNano": int((span.start_time + span.duration) * 1e9),
+                    "attributes": [
+                        {"key": key, "value": _otel_value(value)}
+                        for key, value in attributes.items()
+                    ],
+                    "status": (
+                        {"code": 2, "message": span.error}
+                        if span.error
+                        else {"code": 1}
+                    ),
+                }
+            )
+        return records
+
+    def export(self, file_path: str):
+        """Append OpenTelemetry span records of spans not exported yet to a JSON lines file"""
+        records = self.to_otel(self.exported_spans)
+        self.exported_spans += len(records)
+        os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+        with open(file_path, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+
+
+def _otel_value(value: Any) -> Dict[str, Any]:
+    """Wrap an attribute value in its OTLP AnyValue field"""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def get_current_trace() -> Optional[IngestionTrace]:
+    """Get the trace active in the current context, if any"""
+    return _current_trace.get()
+
+
+def annotate_trace(**attributes):
+    """Record attributes, such as the resolved doc_id, on the active trace"""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.attributes.update(attributes)
+
+
+def span_progress_callback(
+    span: Optional[Span],
+) -> Optional[Callable[[Dict[str, Any]], None]]:
+    """Build a callback recording progress dicts on a span of the active trace
+
+    Each call stores the progress in the span's "progress" attribute and notifies
+    the trace listeners with phase "progress". Returns None when no trace is active.
+    """
+    trace = _current_trace.get()
+    if trace is None or span is None:
+        return None
+
+    def report(progress: Dict[str, Any]):
+        span.attributes["progress"] = progress
+        trace.notify("progress", span)
+
+    return report
+
+
+@contextmanager
+def ingestion_trace(name: str, **attributes) -> Iterator[IngestionTrace]:
+    """Activate a trace for the enclosed ingestion work
+
+    Reuses the active trace when there is one, so a caller can open a trace
+    around several ingestion calls and collect all their spans.
+
+    Args:
+        name: Trace name, typically the file being ingested
+        **attributes: Attributes recorded on the trace
+    """
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.attributes.update(attributes)
+        yield trace
+        return
+
+    trace = IngestionTrace(name=name, attributes=dict(attributes))
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+
+
+@contextmanager
+def trace_span(
+    name: str, *, nest: bool = True, **attributes
+) -> Iterator[Optional[Span]]:
+    """Time the enclosed block as a span of the active trace
+
+    Does nothing (and yields None) when no trace is active. Asyncio tasks
+    created inside the block inherit it as their parent span.
+
+    Args:
+        name: Span name
+        nest: Make the span the parent of spans opened inside the block. Pass
+            False around the yields of an async generator, where the consumer's
+            code runs inside the block
+        **attributes: Attributes recorded on the span
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+
+    span = Span(
+        name=name,
+        span_id=os.urandom(8).hex(),
+        parent_id=_current_span_id.get(),
+        start_time=time.time(),
+        attributes=dict(attributes),
+    )
+    token = _current_span_id.set(span.span_id) if nest else None
+    trace.notify("start", span)
+    started = time.perf_counter()
+    try:
+        yield span
+    except BaseException as e:
+        span.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        span.duration = time.perf_counter() - started
+        if token is not None:
+            _current_span_id.reset(token)
+        trace.spans.append(span)
+        INGESTION_STAGE_SECONDS.observe(span.duration, stage=name)
+        trace.notify("end", span)
+
+
+def traced_ingestion(func):
+    """Run an async RAGAnything ingestion method inside a trace
+
+    The method runs as a span of the active trace, or of a new trace named after
+    its file_path argument. Unless it was called from another traced ingestion
+    method, the trace is handed to the instance's _record_ingestion_trace() when
+    the method returns or raises.
+    """
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    async def wrapper(self, *args, **kwargs):
+        bound = signature.bind_partial(self, *args, **kwargs)
+        name = str(bound.arguments.get("file_path") or func.__name__)
+        is_outermost = not _in_traced_ingestion.get()
+        with ingestion_trace(name) as trace:
+            token = _in_traced_ingestion.set(True)
+            try:
+                with trace_span(func.__name__):
+                    return await func(self, *args, **kwargs)
+            finally:
+                _in_traced_ingestion.reset(token)
+                if is_outermost:
+                    self._record_ingestion_trace(trace)
+
+    return wrapper
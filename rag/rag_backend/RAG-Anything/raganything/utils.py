@@ -5,7 +5,8 @@ Contains helper functions for content separation, text insertion, and other util
 """
 
 import base64
-from typing import Dict, List, Any, Tuple
+import hashlib
+from typing import Dict, List, Any, Optional, Tuple, Union
 from pathlib import Path
 from lightrag.utils import logger
 
@@ -75,6 +76,91 @@ def encode_image_to_base64(image_path: str) -> str:
         return ""
 
 
+def compute_file_fingerprint(
+    file_path: Union[str, Path], sample_size: int = 64 * 1024
+) -> str:
+    """
+    Compute a cheap fingerprint of a file from its size plus head and tail bytes
+
+    Two files with different fingerprints can never have identical content, so the
+    fingerprint is used as a pre-check before streaming the whole file through
+    compute_file_content_hash.
+
+    Args:
+        file_path: Path to the file
+        sample_size: Number of bytes sampled from the head and from the tail
+
+    Returns:
+        str: Fingerprint in the form "<size>-<md5 of head+tail>"
+    """
+    path = Path(file_path)
+    size = path.stat().st_size
+    hasher = hashlib.md5()
+    with open(path, "rb") as f:
+        hasher.update(f.read(sample_size))
+        if size > sample_size:
+            f.seek(max(sample_size, size - sample_size))
+            hasher.update(f.read(sample_size))
+    return f"{size}-{hasher.hexdigest()}"
+
+
+def compute_file_content_hash(
+    file_path: Union[str, Path], block_size: int = 1024 * 1024
+) -> str:
+    """
+    Compute the SHA-256 hash of a file's bytes without loading it into memory
+
+    Args:
+        file_path: Path to the file
+        block_size: Number of bytes read per iteration
+
+    Returns:
+        str: Hex digest of the file content
+    """
+    hasher = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+def compute_image_dhash(
+    image_path: Union[str, Path], hash_size: int = 8
+) -> Optional[int]:
+    """
+    Compute the difference hash (dHash) of an image
+
+    Near-identical images (re-rendered charts, different JPEG quality or scale)
+    get hashes within a small Hamming distance of each other.
+
+    Args:
+        image_path: Path to the image file
+        hash_size: Hash side length, the hash has hash_size * hash_size bits
+
+    Returns:
+        Optional[int]: Hash as an integer, or None if Pillow is missing or the image is unreadable
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        logger.debug("Pillow is not installed, perceptual image hashing is disabled")
+        return None
+
+    try:
+        with Image.open(image_path) as img:
+            pixels = list(img.convert("L").resize((hash_size + 1, hash_size)).getdata())
+    except Exception as e:
+        logger.debug(f"Could not compute perceptual hash of {image_path}: {e}")
+        return None
+
+    dhash = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            dhash = (dhash << 1) | int(pixels[offset + col] > pixels[offset + col + 1])
+    return dhash
+
+
 def validate_image_file(image_path: str, max_size_mb: int = 50) -> bool:
     """
     Validate if a file is a valid image file
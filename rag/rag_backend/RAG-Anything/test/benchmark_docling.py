@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Docling Conversion Benchmark for RAG-Anything
+
+Compares the former two-pass Docling conversion (one `docling --to json` run
+followed by one `docling --to md` run) with the single-pass conversion used by
+DoclingParser, which emits both outputs from one run.
+
+Requirements:
+- Docling installed (`pip install docling`)
+- RAG-Anything package
+
+Usage:
+    python benchmark_docling.py                      # generated sample document
+    python benchmark_docling.py --file doc.pdf --file slides.pptx --runs 3
+"""
+
+import argparse
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from raganything.parser import DoclingParser
+
+
+def write_sample_document(directory: Path, sections: int = 20) -> Path:
+    """Write an HTML document with headings, paragraphs and tables to convert"""
+    parts = ["<html><head><title>Benchmark sample</title></head><body>"]
+    for i in range(1, sections + 1):
+        parts.append(f"<h2>Section {i}</h2>")
+        parts.append(
+            "<p>"
+            + " ".join(
+                f"Sentence {j} of section {i} describes the benchmark sample."
+                for j in range(1, 9)
+            )
+            + "</p>"
+        )
+        parts.append("<table><tr><th>Metric</th><th>Value</th></tr>")
+        parts.extend(
+            f"<tr><td>metric {i}.{j}</td><td>{i * j}</td></tr>" for j in range(1, 6)
+        )
+        parts.append("</table>")
+    parts.append("</body></html>")
+
+    sample_path = directory / "benchmark_sample.html"
+    sample_path.write_text("\n".join(parts), encoding="utf-8")
+    return sample_path
+
+
+def run_two_pass(input_path: Path, output_dir: Path) -> None:
+    """Convert with one docling run per output format"""
+    file_output_dir = output_dir / input_path.stem / "docling"
+    file_output_dir.mkdir(parents=True, exist_ok=True)
+    for to_format in ("json", "md"):
+        subprocess.run(
+            [
+                "docling",
+                "--output",
+                str(file_output_dir),
+                "--to",
+                to_format,
+                str(input_path),
+            ],
+            capture_output=True,
+            check=True,
+        )
+
+
+def run_single_pass(input_path: Path, output_dir: Path) -> None:
+    """Convert with DoclingParser's single docling run"""
+    DoclingParser()._run_docling_command(
+        input_path=input_path, output_dir=output_dir, file_stem=input_path.stem
+    )
+
+
+def time_conversion(convert, input_path: Path, runs: int) -> list:
+    """Time a conversion function over several runs, each in a fresh directory"""
+    timings = []
+    for _ in range(runs):
+        output_dir = Path(tempfile.mkdtemp(prefix="docling_bench_"))
+        try:
+            start = time.perf_counter()
+            convert(input_path, output_dir)
+            timings.append(time.perf_counter() - start)
+        finally:
+            shutil.rmtree(output_dir, ignore_errors=True)
+    return timings
+
+
+def benchmark(files: list, runs: int) -> int:
+    """Print the median conversion time of each file in both modes"""
+    print(f"{'file':<40} {'two-pass (s)':>14} {'single-pass (s)':>16} {'speedup':>9}")
+    total_two, total_single = 0.0, 0.0
+    for input_path in files:
+        if not input_path.exists():
+            print(f"❌ File does not exist: {input_path}")
+            continue
+        two_pass = statistics.median(time_conversion(run_two_pass, input_path, runs))
+        single_pass = statistics.median(
+            time_conversion(run_single_pass, input_path, runs)
+        )
+        total_two += two_pass
+        total_single += single_pass
+        print(
+            f"{input_path.name:<40} {two_pass:>14.2f} {single_pass:>16.2f} "
+            f"{two_pass / single_pass:>8.2f}x"
+        )
+
+    if total_single:
+        print(
+            f"{'total':<40} {total_two:>14.2f} {total_single:>16.2f} "
+            f"{total_two / total_single:>8.2f}x"
+        )
+    return 0
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(
+        description="Benchmark two-pass vs single-pass Docling conversion"
+    )
+    parser.add_argument(
+        "--file",
+        action="append",
+        help="File to convert (repeatable, defaults to a generated HTML sample)",
+    )
+    parser.add_argument(
+        "--runs", type=int, default=2, help="Timed runs per file and mode"
+    )
+    args = parser.parse_args()
+
+    if not DoclingParser().check_installation():
+        print("❌ Docling is not installed. Please install it with: pip install docling")
+        return 1
+
+    sample_dir = None
+    if args.file:
+        files = [Path(f) for f in args.file]
+    else:
+        sample_dir = Path(tempfile.mkdtemp(prefix="docling_sample_"))
+        files = [write_sample_document(sample_dir)]
+
+    try:
+        return benchmark(files, args.runs)
+    finally:
+        if sample_dir is not None:
+            shutil.rmtree(sample_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
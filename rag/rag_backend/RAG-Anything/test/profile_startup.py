@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Startup Profiling Report for RAG-Anything
+
+Imports each target module in a fresh interpreter with `python -X importtime`
+and reports the wall time together with the modules that dominate it. The
+`construct` target also builds a RAGAnything instance, which must not create
+the LightRAG instance or its storages before the first document or query.
+
+Usage:
+    python profile_startup.py                         # default targets
+    python profile_startup.py --module raganything.parser --top 20
+"""
+
+import argparse
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+PACKAGE_ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_TARGETS = [
+    "raganything",
+    "raganything.parser",
+    "raganything.config",
+    "raganything.raganything",
+    "construct",
+]
+
+CONSTRUCT_CODE = """
+import logging, sys, tempfile
+from raganything import RAGAnything, RAGAnythingConfig
+logging.getLogger("lightrag").setLevel(logging.WARNING)
+rag = RAGAnything(config=RAGAnythingConfig(working_dir=tempfile.mkdtemp()))
+print("LightRAG instance created:", rag.lightrag is not None, file=sys.stderr)
+"""
+
+
+def profile_target(target: str) -> tuple:
+    """Run one target under -X importtime
+
+    Returns:
+        tuple: (wall seconds, list of (cumulative us, self us, module), extra stderr lines)
+    """
+    code = CONSTRUCT_CODE if target == "construct" else f"import {target}"
+    # Interpreter startup imports are reported before the marker and skipped
+    timer = (
+        "import sys, time; print('start', file=sys.stderr)\n"
+        "_t = time.perf_counter()\n"
+        f"exec({code!r})\n"
+        "print(f'wall {time.perf_counter() - _t:.6f}', file=sys.stderr)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", timer],
+        capture_output=True,
+        text=True,
+        cwd=tempfile.gettempdir(),
+        env={"PYTHONPATH": str(PACKAGE_ROOT), "PATH": ""},
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    wall, modules, extra = 0.0, [], []
+    lines = result.stderr.splitlines()
+    for line in lines[lines.index("start") + 1 :]:
+        if line.startswith("import time:"):
+            fields = line[len("import time:") :].split("|")
+            if fields[0].strip().isdigit():
+                modules.append(
+                    (int(fields[1]), int(fields[0]), fields[2].rstrip().strip())
+                )
+        elif line.startswith("wall "):
+            wall = float(line.split()[1])
+        elif line.strip():
+            extra.append(line.strip())
+    return wall, modules, extra
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Profile RAG-Anything startup")
+    parser.add_argument(
+        "--module",
+        action="append",
+        help="Module to import (repeatable, 'construct' builds a RAGAnything)",
+    )
+    parser.add_argument(
+        "--top", type=int, default=10, help="Slowest modules to list per target"
+    )
+    args = parser.parse_args()
+
+    for target in args.module or DEFAULT_TARGETS:
+        try:
+            wall, modules, extra = profile_target(target)
+        except RuntimeError as e:
+            print(f"❌ {target}: {e}\n")
+            continue
+
+        print(f"{target}: {wall * 1000:.0f} ms, {len(modules)} modules imported")
+        for line in extra:
+            print(f"  {line}")
+        print(f"  {'cumulative (ms)':>15} {'self (ms)':>10}  module")
+        for cumulative, self_time, module in sorted(modules, reverse=True)[: args.top]:
+            print(f"  {cumulative / 1000:>15.1f} {self_time / 1000:>10.1f}  {module}")
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
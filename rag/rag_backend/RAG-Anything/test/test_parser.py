@@ -0,0 +1,162 @@
+"""
+Tests for the native text and Markdown parsing in raganything.parser
+"""
+
+import pytest
+
+from raganything.parser import Parser
+
+
+def texts(content_list):
+    return [item.get("text") for item in content_list]
+
+
+# markdown_to_content_list
+
+
+@pytest.mark.parametrize(
+    "line, text, level",
+    [
+        ("# Title", "Title", 1),
+        ("###### Deepest", "Deepest", 6),
+        ("## Closed heading ##", "Closed heading", 2),
+        ("## Trailing spaces #   ", "Trailing spaces", 2),
+        # A "#" is only part of a closing sequence after whitespace
+        ("## Intro to C#", "Intro to C#", 2),
+        ("## Issue #42", "Issue #42", 2),
+    ],
+)
+def test_headings(line, text, level):
+    assert Parser.markdown_to_content_list(line) == [
+        {"type": "text", "text": text, "text_level": level, "page_idx": 0}
+    ]
+
+
+def test_hashes_without_space_are_not_headings():
+    content_list = Parser.markdown_to_content_list("#hashtag\n####### seven")
+    assert content_list == [
+        {"type": "text", "text": "#hashtag\n####### seven", "page_idx": 0}
+    ]
+
+
+def test_paragraphs_are_split_on_blank_lines():
+    content_list = Parser.markdown_to_content_list(
+        "First line\nsame paragraph\n\n\nSecond paragraph\n# Heading\nThird"
+    )
+    assert texts(content_list) == [
+        "First line\nsame paragraph",
+        "Second paragraph",
+        "Heading",
+        "Third",
+    ]
+
+
+def test_pipe_table():
+    content_list = Parser.markdown_to_content_list(
+        "Intro\n| a | b |\n|---|:---:|\n| 1 | 2 |\n| 3 | 4 |\nAfter"
+    )
+
+    assert [item["type"] for item in content_list] == ["text", "table", "text"]
+    table = content_list[1]
+    assert table["table_body"] == "| a | b |\n|---|:---:|\n| 1 | 2 |\n| 3 | 4 |"
+    assert table["table_caption"] == []
+    assert table["table_footnote"] == []
+
+
+def test_pipe_row_without_separator_is_text():
+    content_list = Parser.markdown_to_content_list("| not | a table |\n| x | y |")
+    assert [item["type"] for item in content_list] == ["text"]
+
+
+def test_display_equations():
+    content_list = Parser.markdown_to_content_list(
+        "$$E = mc^2$$\n\n$$\n\\int_0^1 x\\,dx\n$$\nText"
+    )
+
+    assert content_list[:2] == [
+        {
+            "type": "equation",
+            "text": "$$E = mc^2$$",
+            "text_format": "latex",
+            "page_idx": 0,
+        },
+        {
+            "type": "equation",
+            "text": "$$\n\\int_0^1 x\\,dx\n$$",
+            "text_format": "latex",
+            "page_idx": 0,
+        },
+    ]
+    assert texts(content_list[2:]) == ["Text"]
+
+
+def test_fenced_code_is_kept_verbatim():
+    markdown = "```python\n# not a heading\n\n| a | b |\n```\nAfter"
+    content_list = Parser.markdown_to_content_list(markdown)
+
+    assert texts(content_list) == [
+        "```python\n# not a heading\n\n| a | b |\n```",
+        "After",
+    ]
+    assert "text_level" not in content_list[0]
+
+
+def test_unclosed_fence_runs_to_the_end():
+    content_list = Parser.markdown_to_content_list("~~~\ncode\n# still code")
+    assert texts(content_list) == ["~~~\ncode\n# still code"]
+
+
+def test_image_links_to_local_files(tmp_path):
+    (tmp_path / "figure.png").write_bytes(b"\x89PNG")
+    content_list = Parser.markdown_to_content_list(
+        '![A figure](figure.png "title")\n\n![Missing](missing.png)',
+        base_dir=tmp_path,
+    )
+
+    assert content_list[0] == {
+        "type": "image",
+        "img_path": str((tmp_path / "figure.png").resolve()),
+        "image_caption": ["A figure"],
+        "image_footnote": [],
+        "page_idx": 0,
+    }
+    # Links to files that do not exist stay text
+    assert content_list[1]["type"] == "text"
+    assert content_list[1]["text"] == "![Missing](missing.png)"
+
+
+def test_markdown_blocks_get_synthetic_pages():
+    page_chars = Parser.TEXT_PAGE_CHARS
+    markdown = "\n\n".join(["a" * (page_chars - 1), "b" * 10, "c" * page_chars, "d"])
+
+    content_list = Parser.markdown_to_content_list(markdown)
+
+    assert [item["page_idx"] for item in content_list] == [0, 0, 1, 2]
+
+
+# plain_text_to_content_list
+
+
+def test_plain_text_paragraphs():
+    content_list = Parser.plain_text_to_content_list(
+        "  # Not a heading\nline two  \n \t\n\n| a | b |\n|---|---|\n\n\n"
+    )
+
+    assert content_list == [
+        {"type": "text", "text": "# Not a heading\nline two", "page_idx": 0},
+        {"type": "text", "text": "| a | b |\n|---|---|", "page_idx": 0},
+    ]
+
+
+def test_plain_text_pages():
+    page_chars = Parser.TEXT_PAGE_CHARS
+    text = "\n\n".join(["x" * page_chars, "y" * page_chars, "z"])
+
+    content_list = Parser.plain_text_to_content_list(text)
+
+    assert [item["page_idx"] for item in content_list] == [0, 1, 2]
+
+
+def test_empty_text():
+    assert Parser.plain_text_to_content_list(" \n\n ") == []
+    assert Parser.markdown_to_content_list("") == []
@@ -0,0 +1,366 @@
+"""
+Tests for the parse cache tiers and the page-sharded PDF parsing of
+raganything.processor
+"""
+
+import asyncio
+import json
+import logging
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from raganything.cache import ParseCacheStats
+from raganything.config import RAGAnythingConfig
+from raganything.processor import ProcessorMixin
+
+
+class StubProcessor(ProcessorMixin):
+    """ProcessorMixin with only what parsing and the parse cache need"""
+
+    def __init__(self, parse_cache=None, **config):
+        self.config = RAGAnythingConfig(use_parser_worker_pool=False, **config)
+        self.logger = logging.getLogger("test_processor")
+        self.parse_cache = parse_cache
+        self.parse_cache_stats = ParseCacheStats()
+
+
+class FakeKVStorage:
+    """In-memory stand-in for the parse cache KV storage"""
+
+    def __init__(self):
+        self.records = {}
+
+    async def get_by_id(self, id):
+        record = self.records.get(id)
+        # Callers get a copy, like from a real storage
+        return json.loads(json.dumps(record)) if record is not None else None
+
+    async def upsert(self, data):
+        for key, value in data.items():
+            self.records[key] = json.loads(json.dumps(value))
+
+    async def index_done_callback(self):
+        pass
+
+
+class CountingProcessor(StubProcessor):
+    """Parses a text file into one block per line and counts the parses"""
+
+    def __init__(self, **config):
+        super().__init__(parse_cache=FakeKVStorage(), **config)
+        self.parsed = []
+
+    async def _parse_uncached(self, file_path, output_dir, parse_method, **kwargs):
+        self.parsed.append(file_path.name)
+        return [
+            {"type": "text", "text": line, "page_idx": 0}
+            for line in file_path.read_text(encoding="utf-8").splitlines()
+        ]
+
+    def entries(self, prefix):
+        return {
+            key: value
+            for key, value in self.parse_cache.records.items()
+            if key.startswith(prefix)
+        }
+
+
+class StubPdfParser:
+    """Parses page ranges like MinerU: page_idx relative to the range, images
+    under the range's own output directory"""
+
+    def __init__(self):
+        self.started = []
+        self.running = 0
+        self.max_running = 0
+
+    async def aparse_pdf(self, pdf_path, output_dir, method, start_page, end_page):
+        self.started.append((start_page, end_page))
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            # Later shards finish first
+            await asyncio.sleep(0.01 * (10 - start_page % 10))
+        finally:
+            self.running -= 1
+        content_list = []
+        for page in range(start_page, end_page + 1):
+            content_list.append(
+                {"type": "text", "text": f"page {page}", "page_idx": page - start_page}
+            )
+            content_list.append(
+                {
+                    "type": "image",
+                    "img_path": str(Path(output_dir) / "images" / "figure.jpg"),
+                    "page_idx": page - start_page,
+                }
+            )
+        return content_list
+
+
+async def settle():
+    """Let started shard parses run to completion"""
+    await asyncio.sleep(0.2)
+
+
+# Parse cache tiers
+
+
+@pytest.fixture
+def document(tmp_path):
+    path = tmp_path / "a.txt"
+    path.write_text("first line\nsecond line\n", encoding="utf-8")
+    return path
+
+
+def stats(processor, *names):
+    counters = processor.get_parse_cache_stats()
+    return {name: counters[name] for name in names}
+
+
+@pytest.mark.asyncio
+async def test_path_tier_serves_the_shared_content_entry(tmp_path, document):
+    processor = CountingProcessor()
+
+    content_list, doc_id = await processor.parse_document(str(document), str(tmp_path))
+    cached = await processor.parse_document(str(document), str(tmp_path))
+
+    assert cached == (content_list, doc_id)
+    assert processor.parsed == ["a.txt"]
+    assert stats(processor, "path_hits", "content_hits", "misses") == {
+        "path_hits": 1,
+        "content_hits": 0,
+        "misses": 1,
+    }
+
+    # The path entry only references the content entry holding the content list
+    path_key = processor._generate_cache_key(document, "auto")
+    path_entry = processor.parse_cache.records[path_key]
+    assert "content_list" not in path_entry
+    content_entry = processor.parse_cache.records[path_entry["content_cache_key"]]
+    assert content_entry["content_list"] == content_list
+    assert content_entry["doc_id"] == doc_id
+    fingerprints = processor.entries("fingerprint-")
+    assert [value["content_hashes"] for value in fingerprints.values()] == [
+        [content_entry["content_hash"]]
+    ]
+
+
+@pytest.mark.asyncio
+async def test_identical_bytes_under_another_path_hit_the_content_tier(
+    tmp_path, document
+):
+    processor = CountingProcessor()
+    content_list, doc_id = await processor.parse_document(str(document), str(tmp_path))
+    copy = tmp_path / "copy.txt"
+    shutil.copyfile(document, copy)
+
+    assert await processor.parse_document(str(copy), str(tmp_path)) == (
+        content_list,
+        doc_id,
+    )
+    # The copy's path now points at the same content entry
+    assert await processor.parse_document(str(copy), str(tmp_path)) == (
+        content_list,
+        doc_id,
+    )
+
+    assert processor.parsed == ["a.txt"]
+    assert stats(processor, "path_hits", "content_hits", "misses") == {
+        "path_hits": 1,
+        "content_hits": 1,
+        "misses": 1,
+    }
+    assert len(processor.entries("content-")) == 1
+    copy_entry = processor.parse_cache.records[
+        processor._generate_cache_key(copy, "auto")
+    ]
+    assert copy_entry["content_cache_key"] in processor.entries("content-")
+
+
+@pytest.mark.asyncio
+async def test_touched_file_hits_the_content_tier(tmp_path, document):
+    processor = CountingProcessor()
+    await processor.parse_document(str(document), str(tmp_path))
+    stat = document.stat()
+    os.utime(document, (stat.st_atime, stat.st_mtime + 10))
+
+    await processor.parse_document(str(document), str(tmp_path))
+
+    assert processor.parsed == ["a.txt"]
+    assert stats(processor, "content_hits")["content_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_unseen_fingerprint_is_rejected_without_hashing(tmp_path, document):
+    processor = CountingProcessor()
+    await processor.parse_document(str(document), str(tmp_path))
+    hashed_bytes = processor.parse_cache_stats.hashed_bytes
+    # The first lookup, in an empty cache, was rejected as well
+    assert processor.parse_cache_stats.precheck_rejects == 1
+    other = tmp_path / "other.txt"
+    other.write_text("a different length\n", encoding="utf-8")
+
+    cached, fingerprint, content_hash = await processor._lookup_parse_cache(
+        other, processor._generate_cache_key(other, "auto"), "auto"
+    )
+
+    assert cached is None
+    assert fingerprint is not None
+    assert content_hash is None
+    assert processor.parse_cache_stats.precheck_rejects == 2
+    assert processor.parse_cache_stats.hashed_bytes == hashed_bytes
+
+
+@pytest.mark.asyncio
+async def test_fingerprint_collision_is_resolved_by_the_content_hash(tmp_path):
+    # Same size, head and tail: only the full hash tells the files apart
+    head_tail = "x" * (64 * 1024) + "\n"
+    first = tmp_path / "first.txt"
+    second = tmp_path / "second.txt"
+    first.write_text(head_tail + "middle one\n" + head_tail, encoding="utf-8")
+    second.write_text(head_tail + "middle two\n" + head_tail, encoding="utf-8")
+    processor = CountingProcessor()
+
+    first_result = await processor.parse_document(str(first), str(tmp_path))
+    second_result = await processor.parse_document(str(second), str(tmp_path))
+
+    assert processor.parsed == ["first.txt", "second.txt"]
+    assert first_result != second_result
+    # Only the lookup in the empty cache is rejected without hashing
+    assert processor.parse_cache_stats.precheck_rejects == 1
+    fingerprints = list(processor.entries("fingerprint-").values())
+    assert len(fingerprints) == 1
+    assert len(fingerprints[0]["content_hashes"]) == 2
+    assert len(processor.entries("content-")) == 2
+
+
+@pytest.mark.asyncio
+async def test_parse_config_is_part_of_both_tiers(tmp_path, document):
+    processor = CountingProcessor()
+    await processor.parse_document(str(document), str(tmp_path), lang="en")
+    copy = tmp_path / "copy.txt"
+    shutil.copyfile(document, copy)
+
+    await processor.parse_document(str(document), str(tmp_path), lang="ch")
+    await processor.parse_document(str(copy), str(tmp_path), parse_method="ocr")
+    await processor.parse_document(str(copy), str(tmp_path), lang="en")
+
+    assert processor.parsed == ["a.txt", "a.txt", "copy.txt"]
+    assert stats(processor, "content_hits")["content_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_path_entry_without_its_content_entry_is_a_miss(tmp_path, document):
+    processor = CountingProcessor()
+    await processor.parse_document(str(document), str(tmp_path))
+    for key in processor.entries("content-"):
+        del processor.parse_cache.records[key]
+
+    await processor.parse_document(str(document), str(tmp_path))
+
+    assert processor.parsed == ["a.txt", "a.txt"]
+
+
+@pytest.mark.asyncio
+async def test_disabled_content_tier_stores_content_in_the_path_entry(
+    tmp_path, document
+):
+    processor = CountingProcessor(enable_content_hash_cache=False)
+    content_list, _ = await processor.parse_document(str(document), str(tmp_path))
+    copy = tmp_path / "copy.txt"
+    shutil.copyfile(document, copy)
+    await processor.parse_document(str(copy), str(tmp_path))
+
+    assert processor.parsed == ["a.txt", "copy.txt"]
+    assert processor.entries("content-") == {}
+    assert processor.entries("fingerprint-") == {}
+    path_entry = processor.parse_cache.records[
+        processor._generate_cache_key(document, "auto")
+    ]
+    assert path_entry["content_list"] == content_list
+    assert processor.parse_cache_stats.hashed_bytes == 0
+
+
+# Sharded PDF parsing
+
+
+@pytest.mark.asyncio
+async def test_shards_start_only_when_the_consumer_takes_results(tmp_path):
+    processor = StubProcessor(pdf_shard_pages=2, pdf_shard_workers=2)
+    parser = StubPdfParser()
+    shards = processor._iter_pdf_shards(
+        parser, tmp_path / "doc.pdf", str(tmp_path), "auto", page_count=10
+    )
+
+    first = await anext(shards)
+    await settle()
+    # One shard taken, one parsed ahead and waiting, none started beyond
+    assert [item["page_idx"] for item in first if item["type"] == "text"] == [0, 1]
+    assert parser.started == [(0, 1), (2, 3)]
+
+    await anext(shards)
+    await settle()
+    assert parser.started == [(0, 1), (2, 3), (4, 5)]
+
+    await shards.aclose()
+    assert parser.max_running <= 2
+
+
+@pytest.mark.asyncio
+async def test_sharded_parse_merges_shards_in_document_page_order(tmp_path):
+    processor = StubProcessor(pdf_shard_pages=3, pdf_shard_workers=3)
+    parser = StubPdfParser()
+
+    content_list = await processor._parse_pdf_sharded(
+        parser, tmp_path / "doc.pdf", str(tmp_path), "auto", page_count=7
+    )
+
+    # The last shard is shorter; end pages are inclusive
+    assert sorted(parser.started) == [(0, 2), (3, 5), (6, 6)]
+    text = [item for item in content_list if item["type"] == "text"]
+    assert [item["text"] for item in text] == [f"page {page}" for page in range(7)]
+    assert [item["page_idx"] for item in text] == list(range(7))
+
+
+@pytest.mark.asyncio
+async def test_sharded_parse_keeps_images_in_their_shard_directory(tmp_path):
+    processor = StubProcessor(pdf_shard_pages=2, pdf_shard_workers=2)
+
+    content_list = await processor._parse_pdf_sharded(
+        StubPdfParser(), tmp_path / "doc.pdf", str(tmp_path), "auto", page_count=4
+    )
+
+    images = [item for item in content_list if item["type"] == "image"]
+    shard_root = tmp_path / "doc_shards"
+    assert [(item["page_idx"], item["img_path"]) for item in images] == [
+        (0, str(shard_root / "pages_0_1" / "images" / "figure.jpg")),
+        (1, str(shard_root / "pages_0_1" / "images" / "figure.jpg")),
+        (2, str(shard_root / "pages_2_3" / "images" / "figure.jpg")),
+        (3, str(shard_root / "pages_2_3" / "images" / "figure.jpg")),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_failing_shard_cancels_the_others(tmp_path):
+    class FailingParser(StubPdfParser):
+        async def aparse_pdf(self, pdf_path, output_dir, method, start_page, end_page):
+            if start_page == 2:
+                raise RuntimeError("shard failed")
+            return await super().aparse_pdf(
+                pdf_path, output_dir, method, start_page, end_page
+            )
+
+    processor = StubProcessor(pdf_shard_pages=2, pdf_shard_workers=2)
+    parser = FailingParser()
+
+    with pytest.raises(RuntimeError, match="shard failed"):
+        await processor._parse_pdf_sharded(
+            parser, tmp_path / "doc.pdf", str(tmp_path), "auto", page_count=8
+        )
+    await settle()
+    assert parser.running == 0
+    assert (6, 7) not in parser.started
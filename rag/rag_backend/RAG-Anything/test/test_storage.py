@@ -0,0 +1,375 @@
+"""
+Tests for the doc_status write buffer, the SQLite parse cache and the content
+list segment store in raganything.storage
+"""
+
+import json
+import os
+import sqlite3
+
+import pytest
+
+from raganything.storage import (
+    ContentListStore,
+    DocStatusWriteBuffer,
+    SQLiteParseCache,
+)
+
+
+class FakeDocStatus:
+    """In-memory stand-in for LightRAG's doc_status storage"""
+
+    def __init__(self, records=None):
+        self.records = dict(records or {})
+        self.upserts = 0
+        self.index_done_calls = 0
+        self.fail = False
+
+    async def get_by_id(self, doc_id):
+        record = self.records.get(doc_id)
+        return dict(record) if record is not None else None
+
+    async def upsert(self, data):
+        if self.fail:
+            raise OSError("storage unavailable")
+        self.upserts += 1
+        for doc_id, record in data.items():
+            self.records[doc_id] = dict(record)
+
+    async def index_done_callback(self):
+        self.index_done_calls += 1
+
+
+def read_journal(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+# DocStatusWriteBuffer
+
+
+@pytest.mark.asyncio
+async def test_get_merges_buffered_fields_over_stored_record():
+    doc_status = FakeDocStatus({"doc-1": {"status": "processed", "chunks": 3}})
+    buffer = DocStatusWriteBuffer(doc_status, flush_interval=0)
+
+    await buffer.update("doc-1", {"multimodal_processed": True})
+    await buffer.update("doc-2", {"status": "processing"})
+
+    assert await buffer.get("doc-1") == {
+        "status": "processed",
+        "chunks": 3,
+        "multimodal_processed": True,
+    }
+    assert await buffer.get("doc-2") == {"status": "processing"}
+    assert await buffer.get("doc-3") is None
+    # Nothing reaches the storage before a flush
+    assert doc_status.upserts == 0
+
+
+@pytest.mark.asyncio
+async def test_flush_coalesces_updates_into_one_write():
+    doc_status = FakeDocStatus({"doc-1": {"status": "processing"}})
+    buffer = DocStatusWriteBuffer(doc_status, flush_interval=0)
+
+    await buffer.update("doc-1", {"status": "processed"})
+    await buffer.update("doc-1", {"multimodal_processed": True})
+    await buffer.flush()
+
+    assert doc_status.records["doc-1"] == {
+        "status": "processed",
+        "multimodal_processed": True,
+    }
+    assert doc_status.upserts == 1
+    assert doc_status.index_done_calls == 1
+    assert buffer.stats() == {
+        "pending_documents": 0,
+        "flushes": 1,
+        "coalesced_updates": 1,
+    }
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_updates_for_the_next_flush():
+    doc_status = FakeDocStatus({"doc-1": {"status": "processing"}})
+    buffer = DocStatusWriteBuffer(doc_status, flush_interval=0)
+    await buffer.update("doc-1", {"status": "processed"})
+
+    doc_status.fail = True
+    with pytest.raises(OSError):
+        await buffer.flush()
+
+    assert buffer.stats()["pending_documents"] == 1
+    assert await buffer.get("doc-1") == {"status": "processed"}
+
+    await buffer.update("doc-1", {"status": "failed"})
+    doc_status.fail = False
+    await buffer.flush()
+
+    # The update made after the failed flush wins over the restored one
+    assert doc_status.records["doc-1"] == {"status": "failed"}
+    assert buffer.stats()["pending_documents"] == 0
+
+
+@pytest.mark.asyncio
+async def test_journal_is_truncated_once_updates_are_persisted(tmp_path):
+    journal = tmp_path / "doc_status.journal"
+    doc_status = FakeDocStatus()
+    buffer = DocStatusWriteBuffer(doc_status, str(journal), flush_interval=0)
+
+    await buffer.update("doc-1", {"status": "processing"})
+    await buffer.update("doc-1", {"status": "processed"})
+    assert read_journal(journal) == [
+        {"doc_id": "doc-1", "fields": {"status": "processing"}},
+        {"doc_id": "doc-1", "fields": {"status": "processed"}},
+    ]
+
+    doc_status.fail = True
+    with pytest.raises(OSError):
+        await buffer.flush()
+    # Updates that are not persisted stay journaled
+    assert len(read_journal(journal)) == 2
+
+    doc_status.fail = False
+    await buffer.flush()
+    assert journal.read_text(encoding="utf-8") == ""
+
+
+@pytest.mark.asyncio
+async def test_recover_replays_journal_and_skips_torn_last_line(tmp_path):
+    journal = tmp_path / "doc_status.journal"
+    journal.write_text(
+        json.dumps({"doc_id": "doc-1", "fields": {"status": "processing"}})
+        + "\n"
+        + json.dumps({"doc_id": "doc-1", "fields": {"status": "processed"}})
+        + "\n"
+        + json.dumps({"doc_id": "doc-2", "fields": {"chunks": 2}})
+        + "\n"
+        + '{"doc_id": "doc-3", "fie',
+        encoding="utf-8",
+    )
+    doc_status = FakeDocStatus({"doc-2": {"status": "processed"}})
+    buffer = DocStatusWriteBuffer(doc_status, str(journal), flush_interval=0)
+
+    assert await buffer.recover() == 2
+
+    assert doc_status.records == {
+        "doc-1": {"status": "processed"},
+        "doc-2": {"status": "processed", "chunks": 2},
+    }
+    assert journal.read_text(encoding="utf-8") == ""
+
+
+@pytest.mark.asyncio
+async def test_recover_without_journal(tmp_path):
+    buffer = DocStatusWriteBuffer(
+        FakeDocStatus(), str(tmp_path / "missing.journal"), flush_interval=0
+    )
+    assert await buffer.recover() == 0
+
+
+# ContentListStore
+
+
+def test_content_list_store_rolls_over_to_new_segments(tmp_path):
+    store = ContentListStore(str(tmp_path / "segments"), segment_max_bytes=300)
+    content_lists = [
+        # Random text, so records stay large after compression
+        [{"type": "text", "text": os.urandom(120).hex(), "page_idx": i}]
+        for i in range(5)
+    ]
+
+    refs = [store.write(content_list) for content_list in content_lists]
+
+    segments = [ref["segment"] for ref in refs]
+    assert segments == sorted(segments)
+    assert len(set(segments)) > 1
+    for ref, content_list in zip(refs, content_lists):
+        assert store.read(ref) == content_list
+    store.close()
+
+    # A new store keeps appending to the last segment and still reads old ones
+    reopened = ContentListStore(str(tmp_path / "segments"), segment_max_bytes=300)
+    ref = reopened.write([{"type": "text", "text": "later"}])
+    assert ref["segment"] >= segments[-1]
+    assert reopened.read(refs[0]) == content_lists[0]
+    assert reopened.read(ref) == [{"type": "text", "text": "later"}]
+    reopened.close()
+
+
+def test_content_list_store_reads_records_appended_after_mapping(tmp_path):
+    store = ContentListStore(str(tmp_path / "segments"))
+    first = store.write([{"type": "text", "text": "first"}])
+    assert store.read(first) == [{"type": "text", "text": "first"}]
+
+    # The segment is mapped now; a later record lies beyond the mapping
+    second = store.write([{"type": "text", "text": "second"}])
+    assert second["segment"] == first["segment"]
+    assert store.read(second) == [{"type": "text", "text": "second"}]
+    store.close()
+
+
+def test_content_list_stores_sharing_a_directory_append_safely(tmp_path):
+    # Two stores stand in for two processes appending to the same segment
+    first = ContentListStore(str(tmp_path / "segments"))
+    second = ContentListStore(str(tmp_path / "segments"))
+
+    refs = []
+    for i in range(4):
+        store = first if i % 2 == 0 else second
+        refs.append((store.write([{"type": "text", "text": f"text {i}"}]), i))
+
+    assert len({ref["segment"] for ref, _ in refs}) == 1
+    for ref, i in refs:
+        assert first.read(ref) == [{"type": "text", "text": f"text {i}"}]
+        assert second.read(ref) == [{"type": "text", "text": f"text {i}"}]
+    first.close()
+    second.close()
+
+
+# SQLiteParseCache
+
+
+def make_entry(text):
+    return {
+        "content_list": [{"type": "text", "text": text, "page_idx": 0}],
+        "doc_id": f"doc-{text}",
+        "parse_config": {"parse_method": "auto"},
+    }
+
+
+def stored_value(db_file, key):
+    with sqlite3.connect(db_file) as conn:
+        row = conn.execute(
+            "SELECT value FROM parse_cache WHERE key = ?", (key,)
+        ).fetchone()
+    return json.loads(row[0]) if row else None
+
+
+@pytest.mark.asyncio
+async def test_parse_cache_imports_legacy_json_once(tmp_path):
+    legacy = tmp_path / "kv_store_parse_cache.json"
+    legacy.write_text(
+        json.dumps({"a": make_entry("a"), "b": make_entry("b"), "junk": "not a dict"}),
+        encoding="utf-8",
+    )
+    db_file = str(tmp_path / "parse_cache.sqlite")
+    cache = SQLiteParseCache(
+        db_file,
+        legacy_json_file=str(legacy),
+        content_store=ContentListStore(str(tmp_path / "segments")),
+    )
+    await cache.initialize()
+
+    assert await cache.get_by_id("a") == make_entry("a")
+    assert await cache.get_by_id("b") == make_entry("b")
+    assert await cache.get_by_id("junk") is None
+    # Imported content lists live in the segment store, not in the rows
+    assert "content_list" not in stored_value(db_file, "a")
+    assert "content_list_ref" in stored_value(db_file, "a")
+    await cache.finalize()
+
+    # A database with entries does not import the legacy file again
+    legacy.write_text(json.dumps({"c": make_entry("c")}), encoding="utf-8")
+    cache = SQLiteParseCache(db_file, legacy_json_file=str(legacy))
+    await cache.initialize()
+    assert await cache.get_by_id("c") is None
+    await cache.finalize()
+
+
+@pytest.mark.asyncio
+async def test_parse_cache_reads_inline_rows_with_content_store(tmp_path):
+    db_file = str(tmp_path / "parse_cache.sqlite")
+    cache = SQLiteParseCache(db_file)
+    await cache.initialize()
+    await cache.upsert({"inline": make_entry("inline")})
+    await cache.finalize()
+    assert stored_value(db_file, "inline")["content_list"] == [
+        {"type": "text", "text": "inline", "page_idx": 0}
+    ]
+
+    # Rows written without a content store stay readable once one is configured
+    cache = SQLiteParseCache(
+        db_file, content_store=ContentListStore(str(tmp_path / "segments"))
+    )
+    await cache.initialize()
+    assert await cache.get_by_id("inline") == make_entry("inline")
+
+    await cache.upsert({"segmented": make_entry("segmented")})
+    assert await cache.get_by_id("segmented") == make_entry("segmented")
+    assert "content_list_ref" in stored_value(db_file, "segmented")
+
+    await cache.delete(["inline"])
+    assert await cache.get_by_id("inline") is None
+    await cache.finalize()
+
+
+def segment_bytes(directory):
+    return sum(path.stat().st_size for path in directory.iterdir())
+
+
+@pytest.mark.asyncio
+async def test_compact_reclaims_replaced_and_deleted_content_lists(tmp_path):
+    segments = tmp_path / "segments"
+    db_file = str(tmp_path / "parse_cache.sqlite")
+    cache = SQLiteParseCache(
+        db_file, content_store=ContentListStore(str(segments), segment_max_bytes=200)
+    )
+    await cache.initialize()
+    entries = {
+        key: {**make_entry(key), "content_list": [{"type": "text", "text": text}]}
+        for key, text in (("a", os.urandom(60).hex()), ("b", os.urandom(60).hex()))
+    }
+    await cache.upsert(entries)
+    # Replaced and deleted entries leave their content lists behind
+    for page in range(3):
+        entries["a"]["content_list"][0]["page_idx"] = page
+        await cache.upsert({"a": entries["a"]})
+    await cache.upsert({"gone": make_entry("gone")})
+    await cache.delete(["gone"])
+    before = segment_bytes(segments)
+    old_segments = {path.name for path in segments.iterdir()}
+
+    stats = await cache.compact()
+
+    assert stats["entries"] == 2
+    assert stats["segments_removed"] == len(old_segments)
+    assert stats["bytes_freed"] == before - segment_bytes(segments)
+    assert stats["bytes_freed"] > 0
+    assert not old_segments & {path.name for path in segments.iterdir()}
+    assert await cache.get_by_id("a") == entries["a"]
+    assert await cache.get_by_id("b") == entries["b"]
+
+    # New entries go after the compacted records
+    await cache.upsert({"c": make_entry("c")})
+    assert await cache.get_by_id("c") == make_entry("c")
+    await cache.finalize()
+
+    cache = SQLiteParseCache(db_file, content_store=ContentListStore(str(segments)))
+    await cache.initialize()
+    assert await cache.get_by_id("a") == entries["a"]
+    assert await cache.get_by_id("c") == make_entry("c")
+    await cache.finalize()
+
+
+@pytest.mark.asyncio
+async def test_compact_keeps_inline_rows(tmp_path):
+    db_file = str(tmp_path / "parse_cache.sqlite")
+    cache = SQLiteParseCache(db_file)
+    await cache.initialize()
+    await cache.upsert({"inline": make_entry("inline")})
+    assert await cache.compact() == {
+        "entries": 0,
+        "segments_removed": 0,
+        "bytes_freed": 0,
+    }
+    await cache.finalize()
+
+    cache = SQLiteParseCache(
+        db_file, content_store=ContentListStore(str(tmp_path / "segments"))
+    )
+    await cache.initialize()
+    stats = await cache.compact()
+    assert stats["entries"] == 0
+    assert await cache.get_by_id("inline") == make_entry("inline")
+    await cache.finalize()
@@ -1,6 +1,17 @@
+import os
+import threading
+
 from django.apps import AppConfig
 
 
 class RagBackendConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "rag_backend"
+
+    def ready(self):
+        # RAG_PRELOAD=true builds the RAG instance in the background after startup,
+        # so the first request does not pay for importing LightRAG
+        if os.getenv("RAG_PRELOAD", "false").strip().lower() in ("true", "1", "yes"):
+            from . import views
+
+            threading.Thread(target=views.get_rag, daemon=True).start()
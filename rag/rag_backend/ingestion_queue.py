@@ -0,0 +1,199 @@
+"""
+Bounded ingestion job queue for the Django backend
+
+Document processing requests are queued with a priority and run by a fixed
+pool of worker threads, each handing its document to the shared RAG service
+loop. Submissions of a file that is already queued or processing, by path or
+by content hash, return the existing job instead of a new one; a full queue
+rejects new jobs so the view can answer with HTTP 429; and shutdown stops
+accepting jobs and lets the workers drain the queue.
+"""
+
+import atexit
+import hashlib
+import itertools
+import logging
+import os
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+PRIORITIES = {"high": 0, "normal": 1, "low": 2}
+
+# Sorts after every job, so workers stop only once the queue is drained
+_STOP_PRIORITY = len(PRIORITIES)
+
+
+class QueueFull(Exception):
+    """The ingestion queue has no room for another job"""
+
+
+class QueueClosed(Exception):
+    """The ingestion queue is shutting down and accepts no more jobs"""
+
+
+def file_content_hash(file_path: str, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of a file's content, read in chunks"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class IngestionQueue:
+    """Priority queue of ingestion jobs run by a fixed pool of worker threads"""
+
+    def __init__(self, handler, workers: int = 2, max_size: int = 32):
+        """
+        Args:
+            handler: Callable run by a worker for each job, with the job's arguments
+            workers: Number of worker threads, i.e. documents ingested concurrently
+            max_size: Maximum number of jobs waiting for a worker
+        """
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.max_size = max(1, max_size)
+        self._queue = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._active_keys = {}
+        """Dedup key -> job id of queued and running jobs."""
+
+        self._threads = []
+        self._closed = False
+        atexit.register(self.shutdown)
+
+    @property
+    def pending(self) -> int:
+        """Jobs waiting for a worker"""
+        return self._pending
+
+    def submit(
+        self, job_id: str, args: tuple, keys=(), priority: str = "normal"
+    ) -> str:
+        """
+        Queue a job unless an identical one is queued or running
+
+        Args:
+            job_id: Id of the new job
+            args: Arguments passed to the handler
+            keys: Dedup keys of the job, e.g. its file path and content hash
+            priority: "high", "normal" or "low"
+
+        Returns:
+            str: job_id, or the id of the queued or running job sharing a key
+
+        Raises:
+            ValueError: Unknown priority
+            QueueFull: max_size jobs are already waiting
+            QueueClosed: The queue is shutting down
+        """
+        with self._lock:
+            active_id = self._check(keys, priority)
+            if active_id is not None:
+                return active_id
+
+            self._start_workers()
+            for key in keys:
+                self._active_keys[key] = job_id
+            self._pending += 1
+            self._queue.put(
+                (PRIORITIES[priority], next(self._sequence), job_id, args, tuple(keys))
+            )
+        logger.info(f"Queued ingestion job {job_id} with {priority} priority")
+        return job_id
+
+    def precheck(self, keys=(), priority: str = "normal"):
+        """
+        Check whether submit() would accept a job, without queueing it
+
+        Lets callers answer duplicates and a full queue before doing costly
+        work such as hashing the file; submit() checks again.
+
+        Args:
+            keys: Dedup keys known so far, e.g. the file path
+            priority: "high", "normal" or "low"
+
+        Returns:
+            str: Id of the queued or running job sharing a key, or None
+
+        Raises:
+            ValueError, QueueFull, QueueClosed: As submit()
+        """
+        with self._lock:
+            return self._check(keys, priority)
+
+    def _check(self, keys, priority):
+        # Called with the lock held
+        if priority not in PRIORITIES:
+            raise ValueError(
+                f"Unknown priority {priority!r}, expected one of {list(PRIORITIES)}"
+            )
+        if self._closed:
+            raise QueueClosed("Ingestion queue is shutting down")
+        for key in keys:
+            if key in self._active_keys:
+                return self._active_keys[key]
+        if self._pending >= self.max_size:
+            raise QueueFull(f"Ingestion queue is full ({self.max_size} jobs)")
+        return None
+
+    def _start_workers(self):
+        # Workers start with the first job, so management commands start none
+        if self._threads:
+            return
+        for i in range(self.workers):
+            thread = threading.Thread(
+                target=self._work, name=f"ingestion-worker-{i}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def _work(self):
+        while True:
+            priority, _, job_id, args, keys = self._queue.get()
+            if priority == _STOP_PRIORITY:
+                return
+            with self._lock:
+                self._pending -= 1
+            try:
+                self.handler(*args)
+            except Exception as e:
+                logger.error(f"Ingestion job {job_id} failed: {e}")
+            finally:
+                with self._lock:
+                    for key in keys:
+                        if self._active_keys.get(key) == job_id:
+                            del self._active_keys[key]
+
+    def shutdown(self, timeout: float = None):
+        """
+        Stop accepting jobs and wait for the workers to drain the queue
+
+        Args:
+            timeout: Seconds to wait for queued and running jobs, defaults to
+                INGESTION_DRAIN_TIMEOUT (600); jobs still running afterwards are
+                abandoned with the process
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            threads = list(self._threads)
+        if not threads:
+            return
+        if timeout is None:
+            timeout = float(os.getenv("INGESTION_DRAIN_TIMEOUT", "600"))
+
+        logger.info(f"Draining ingestion queue ({self._pending} jobs waiting)")
+        for _ in threads:
+            self._queue.put((_STOP_PRIORITY, next(self._sequence), None, (), ()))
+        deadline = time.monotonic() + timeout
+        for thread in threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+        if any(thread.is_alive() for thread in threads):
+            logger.warning("Ingestion queue not drained before the timeout")
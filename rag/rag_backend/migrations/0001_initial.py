@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="Task",
+            fields=[
+                (
+                    "task_id",
+                    models.CharField(max_length=64, primary_key=True, serialize=False),
+                ),
+                ("file_path", models.TextField()),
+                ("status", models.CharField(db_index=True, max_length=16)),
+                ("progress", models.IntegerField(default=0)),
+                ("logs", models.JSONField(default=list)),
+                ("result", models.JSONField(null=True)),
+                ("error", models.TextField(null=True)),
+                ("stages", models.JSONField(null=True)),
+                ("trace", models.JSONField(null=True)),
+                ("start_time", models.FloatField()),
+                ("end_time", models.FloatField(null=True)),
+                ("updated_at", models.FloatField(db_index=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("rag_backend", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="log_count",
+            field=models.IntegerField(default=0),
+        ),
+    ]
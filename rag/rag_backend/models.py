@@ -1,3 +1,19 @@
 from django.db import models
 
-# Create your models here.
+
+class Task(models.Model):
+    """Persisted state of a document ingestion task, see task_store.DatabaseTaskStore"""
+
+    task_id = models.CharField(max_length=64, primary_key=True)
+    file_path = models.TextField()
+    status = models.CharField(max_length=16, db_index=True)
+    progress = models.IntegerField(default=0)
+    logs = models.JSONField(default=list)
+    log_count = models.IntegerField(default=0)
+    result = models.JSONField(null=True)
+    error = models.TextField(null=True)
+    stages = models.JSONField(null=True)
+    trace = models.JSONField(null=True)
+    start_time = models.FloatField()
+    end_time = models.FloatField(null=True)
+    updated_at = models.FloatField(db_index=True)
@@ -0,0 +1,163 @@
+"""
+Long-lived RAGAnything service for the Django backend
+
+LightRAG storages, locks and HTTP clients are bound to the event loop they were
+created on, so every coroutine touching the RAG instance has to run on one loop
+that outlives individual requests. RAGService owns that loop in a background
+thread; sync code submits work and blocks on the result, async views await it
+without blocking their own loop, and concurrent requests are multiplexed on the
+shared loop.
+"""
+
+import asyncio
+import atexit
+import concurrent.futures
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class RAGService:
+    """Owns a RAGAnything instance and the event loop all its coroutines run on"""
+
+    def __init__(self, rag_factory):
+        """
+        Args:
+            rag_factory: Callable building the RAGAnything instance, called once
+        """
+        self._rag_factory = rag_factory
+        self._rag = None
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+        atexit.register(self.shutdown)
+
+    @property
+    def rag(self):
+        """The RAGAnything instance, built on first use"""
+        self._ensure_started()
+        return self._rag
+
+    @property
+    def started(self) -> bool:
+        return self._rag is not None
+
+    def _ensure_started(self):
+        if self._rag is not None:
+            return
+        with self._lock:
+            if self._rag is not None:
+                return
+            rag = self._rag_factory()
+            # The storages must be finalized on the service loop, not by the
+            # instance's own exit hook on a fresh loop
+            atexit.unregister(rag.close)
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(
+                target=self._loop.run_forever, name="rag-service-loop", daemon=True
+            )
+            self._thread.start()
+            self._rag = rag
+            logger.info("RAG service started")
+
+    def submit(self, coro_func, *args, **kwargs) -> concurrent.futures.Future:
+        """
+        Schedule a coroutine function on the service loop
+
+        The coroutine runs in a copy of the caller's context, so context
+        variables such as the active ingestion trace carry over.
+
+        Args:
+            coro_func: Coroutine function called with the RAG instance first
+            *args, **kwargs: Further arguments for coro_func
+
+        Returns:
+            concurrent.futures.Future: Future of the coroutine's result
+        """
+        rag = self.rag
+        return asyncio.run_coroutine_threadsafe(
+            coro_func(rag, *args, **kwargs), self._loop
+        )
+
+    def run(self, coro_func, *args, timeout: float = None, **kwargs):
+        """Run a coroutine function on the service loop and wait for its result (sync callers)"""
+        return self.submit(coro_func, *args, **kwargs).result(timeout)
+
+    async def arun(self, coro_func, *args, **kwargs):
+        """Run a coroutine function on the service loop from another event loop (async views)"""
+        if not self.started:
+            # Building the instance imports LightRAG; keep that off the caller's loop
+            await asyncio.to_thread(self._ensure_started)
+        return await asyncio.wrap_future(self.submit(coro_func, *args, **kwargs))
+
+    async def astream(self, agen_func, *args, **kwargs):
+        """
+        Iterate an async generator function on the service loop from another event loop
+
+        Items are handed over as they are produced; closing the consumer
+        cancels the producer.
+
+        Args:
+            agen_func: Async generator function called with the RAG instance first
+            *args, **kwargs: Further arguments for agen_func
+
+        Yields:
+            The items produced by agen_func
+        """
+        if not self.started:
+            await asyncio.to_thread(self._ensure_started)
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        done = object()
+
+        async def produce(rag):
+            try:
+                async for item in agen_func(rag, *args, **kwargs):
+                    loop.call_soon_threadsafe(queue.put_nowait, (item, None))
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, (done, e))
+            else:
+                loop.call_soon_threadsafe(queue.put_nowait, (done, None))
+
+        future = self.submit(produce)
+        try:
+            while True:
+                item, error = await queue.get()
+                if item is done:
+                    if error is not None:
+                        raise error
+                    return
+                yield item
+        finally:
+            future.cancel()
+
+    def shutdown(self, timeout: float = 30.0):
+        """Finalize the RAG storages on the service loop and stop it"""
+        with self._lock:
+            if self._rag is None:
+                return
+            rag, self._rag = self._rag, None
+            try:
+                asyncio.run_coroutine_threadsafe(
+                    rag.finalize_storages(), self._loop
+                ).result(timeout)
+            except Exception as e:
+                logger.warning(f"Failed to finalize RAG storages: {e}")
+            try:
+                asyncio.run_coroutine_threadsafe(
+                    _cancel_pending_tasks(), self._loop
+                ).result(timeout)
+            except Exception as e:
+                logger.warning(f"Failed to cancel pending RAG tasks: {e}")
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout)
+            self._loop.close()
+
+
+async def _cancel_pending_tasks():
+    """Cancel the tasks still running on the loop, e.g. background watchers"""
+    tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,149 @@
+"""
+In-process publish/subscribe of ingestion task events
+
+Tasks running in this process publish their status changes, progress, log
+lines and ingestion stage transitions as they happen; the task_events view
+subscribes per task and streams them to the client as server-sent events.
+LightRAG's pipeline_status messages are polled by a single watcher on the RAG
+service loop while anyone is subscribed. The pipeline status is shared by every
+document, so its messages are only forwarded, to that task's subscribers, while
+a single task of this process is processing.
+"""
+
+import asyncio
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Events a subscriber can fall behind by before new ones are dropped
+MAX_PENDING_EVENTS = 1000
+
+
+class TaskEventBroker:
+    """Fans out task events published from any thread to asyncio subscribers"""
+
+    def __init__(self):
+        self._subscribers = {}
+        """Task id -> set of (loop, queue) of its subscribers."""
+
+        self._processing = set()
+        """Ids of the tasks of this process that are processing."""
+
+        self._lock = threading.Lock()
+        self._watching_pipeline = False
+
+    def subscribe(self, task_id) -> asyncio.Queue:
+        """Subscribe the running event loop to a task's events"""
+        queue = asyncio.Queue(MAX_PENDING_EVENTS)
+        with self._lock:
+            self._subscribers.setdefault(task_id, set()).add(
+                (asyncio.get_running_loop(), queue)
+            )
+        return queue
+
+    def unsubscribe(self, task_id, queue: asyncio.Queue):
+        with self._lock:
+            subscribers = self._subscribers.get(task_id, set())
+            subscribers.difference_update(
+                {entry for entry in subscribers if entry[1] is queue}
+            )
+            if not subscribers:
+                self._subscribers.pop(task_id, None)
+
+    def publish(self, task_id, event: str, data: dict):
+        """Deliver an event to the task's subscribers; safe to call from any thread"""
+        with self._lock:
+            if event == "status":
+                if data["status"] == "processing":
+                    self._processing.add(task_id)
+                else:
+                    self._processing.discard(task_id)
+            subscribers = list(self._subscribers.get(task_id, ()))
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(_deliver, queue, (event, data))
+            except RuntimeError:
+                # The subscriber's loop has been closed
+                self.unsubscribe(task_id, queue)
+
+    @property
+    def pipeline_owner(self):
+        """Id of the only task processing in this process, or None"""
+        with self._lock:
+            if len(self._processing) == 1:
+                return next(iter(self._processing))
+        return None
+
+    @property
+    def has_subscribers(self) -> bool:
+        return bool(self._subscribers)
+
+    def watch_pipeline_status(self, service, interval: float = 1.0):
+        """
+        Start the pipeline_status watcher on the service loop, unless it runs
+        already or nobody is subscribed
+
+        Called when a stream subscribes and when a task starts processing, as
+        the service may not have started yet when the stream subscribes.
+        """
+        with self._lock:
+            if self._watching_pipeline or not self._subscribers or not service.started:
+                return
+            self._watching_pipeline = True
+        service.submit(self._watch_pipeline_status, interval)
+
+    async def _watch_pipeline_status(self, rag, interval: float):
+        from lightrag.kg.shared_storage import get_namespace_data
+
+        last_message = None
+        last_owner = None
+        try:
+            while True:
+                with self._lock:
+                    # Stop under the lock, so a subscriber arriving now starts a
+                    # new watcher instead of relying on this one
+                    if not self._subscribers:
+                        self._watching_pipeline = False
+                        return
+                message = None
+                # LightRAG and its shared pipeline status are set up with the
+                # first document or query
+                if rag.lightrag is not None:
+                    try:
+                        pipeline_status = await get_namespace_data("pipeline_status")
+                        message = pipeline_status.get("latest_message")
+                    except Exception as e:
+                        logger.debug(f"Could not read pipeline_status: {e}")
+                owner = self.pipeline_owner
+                if message and message != last_message:
+                    last_message = message
+                    # The message was written since the last poll; it is only
+                    # known to be the owner's if the owner processed alone
+                    # throughout
+                    if owner is not None and owner == last_owner:
+                        self.publish(
+                            owner,
+                            "pipeline",
+                            {
+                                "busy": bool(pipeline_status.get("busy")),
+                                "job_name": pipeline_status.get("job_name"),
+                                "message": message,
+                            },
+                        )
+                last_owner = owner
+                await asyncio.sleep(interval)
+        except BaseException:
+            with self._lock:
+                self._watching_pipeline = False
+            raise
+
+
+def _deliver(queue: asyncio.Queue, item):
+    try:
+        queue.put_nowait(item)
+    except asyncio.QueueFull:
+        pass
+
+
+TASK_EVENTS = TaskEventBroker()
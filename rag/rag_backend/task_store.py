@@ -0,0 +1,412 @@
+"""
+Task store for document ingestion tasks
+
+Tasks are created and updated by the process running them and read by the
+status views of any process. Each task keeps only its latest log entries in a
+ring buffer, and tasks not updated for longer than the TTL are evicted.
+
+RAG_TASK_STORE selects the backend:
+    database  Tasks are persisted in the Django database (the Task model), so
+              they survive restarts and are visible to every worker process
+    memory    Tasks live in the process' memory only
+"""
+
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+from .task_events import TASK_EVENTS
+
+logger = logging.getLogger(__name__)
+
+
+class TaskStatus:
+    PENDING = "pending"
+    PROCESSING = "processing"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+FINISHED_STATUSES = (TaskStatus.COMPLETED, TaskStatus.FAILED)
+
+
+class ProcessingTask:
+    def __init__(self, task_id, file_path, log_limit=200):
+        self.store = None
+        self.task_id = task_id
+        self.file_path = file_path
+        self.status = TaskStatus.PENDING
+        self.progress = 0
+        self.logs = deque(maxlen=log_limit)
+        self.log_count = 0
+        self.result = None
+        self.error = None
+        self.start_time = time.time()
+        self.end_time = None
+        self.updated_at = self.start_time
+        self.trace = None
+        self._stages = None
+
+    @property
+    def status(self):
+        return self._status
+
+    @status.setter
+    def status(self, status):
+        self._status = status
+        self.emit("status", {"status": status})
+
+    def emit(self, event, data):
+        """Publish an event to the task's stream subscribers"""
+        # Snapshots read back from a store are not published
+        if self.store is not None:
+            TASK_EVENTS.publish(self.task_id, event, data)
+
+    def add_log(self, message):
+        timestamp = time.strftime("%H:%M:%S")
+        log_entry = f"[{timestamp}] {message}"
+        self.logs.append(log_entry)
+        self.log_count += 1
+        print(log_entry)  # Also print to console
+        self.emit("log", {"index": self.log_count - 1, "message": log_entry})
+        self.save()
+
+    def update_progress(self, progress, message=None):
+        self.progress = progress
+        self.emit("progress", {"progress": progress})
+        if message:
+            self.add_log(f"Progress: {progress}% - {message}")
+        else:
+            self.save()
+
+    def complete(self, result=None):
+        self.progress = 100
+        self.result = result
+        self.end_time = time.time()
+        self.status = TaskStatus.COMPLETED
+        self.add_log("Processing completed successfully!")
+        self.emit("end", self.summary())
+
+    def fail(self, error):
+        self.error = str(error)
+        self.end_time = time.time()
+        self.status = TaskStatus.FAILED
+        self.add_log(f"Processing failed: {error}")
+        self.emit("end", self.summary())
+
+    def get_duration(self):
+        """Get processing duration, handling None end_time"""
+        if self.end_time is None:
+            return time.time() - self.start_time
+        return self.end_time - self.start_time
+
+    def summary(self):
+        """Status, progress, outcome and stage timings, without the logs"""
+        data = {
+            "status": self.status,
+            "progress": self.progress,
+            "duration": self.get_duration(),
+        }
+        if self.result:
+            data["result"] = self.result
+        if self.error:
+            data["error"] = self.error
+        if self.stages:
+            data["stages"] = self.stages
+        return data
+
+    @property
+    def finished(self):
+        return self.status in FINISHED_STATUSES
+
+    @property
+    def stages(self):
+        """Per-stage timing summary of the ingestion trace, if any"""
+        if self.trace is not None:
+            return self.trace.summary()
+        return self._stages
+
+    def save(self):
+        """Persist the task's current state in its store"""
+        self.updated_at = time.time()
+        if self.store is not None:
+            self.store.save(self)
+
+    def to_record(self):
+        """Task state as a dict of Task model fields"""
+        return {
+            "task_id": self.task_id,
+            "file_path": self.file_path,
+            "status": self.status,
+            "progress": self.progress,
+            "logs": list(self.logs),
+            "log_count": self.log_count,
+            "result": self.result,
+            "error": self.error,
+            "stages": self.stages,
+            # The full trace is stored once, when the task has finished
+            "trace": (
+                self.trace.to_dict()
+                if self.trace is not None and self.finished
+                else None
+            ),
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "updated_at": self.updated_at,
+        }
+
+    @classmethod
+    def from_record(cls, record, log_limit=200):
+        """Rebuild a read-only snapshot of a task from its Task model fields"""
+        task = cls(record["task_id"], record["file_path"], log_limit=log_limit)
+        task.status = record["status"]
+        task.progress = record["progress"]
+        task.logs.extend(record["logs"] or [])
+        task.log_count = record["log_count"]
+        task.result = record["result"]
+        task.error = record["error"]
+        task.start_time = record["start_time"]
+        task.end_time = record["end_time"]
+        task.updated_at = record["updated_at"]
+        task._stages = record["stages"]
+        if record["trace"]:
+            from raganything.tracing import IngestionTrace
+
+            task.trace = IngestionTrace.from_dict(record["trace"])
+        return task
+
+
+class TaskStore:
+    """Base class of task stores"""
+
+    def __init__(self, ttl: float = 86400.0, log_limit: int = 200):
+        """
+        Args:
+            ttl: Seconds after its last update a task is evicted
+            log_limit: Log entries kept per task
+        """
+        self.ttl = ttl
+        self.log_limit = log_limit
+
+    def create(self, task_id, file_path) -> ProcessingTask:
+        """Create and store a pending task"""
+        task = ProcessingTask(task_id, file_path, log_limit=self.log_limit)
+        task.store = self
+        task.save()
+        return task
+
+    def save(self, task: ProcessingTask):
+        raise NotImplementedError
+
+    def get(self, task_id) -> ProcessingTask:
+        """Get a task, or None if it does not exist or was evicted"""
+        raise NotImplementedError
+
+    def delete(self, task_id):
+        raise NotImplementedError
+
+    def status_counts(self) -> dict:
+        """Number of stored tasks per status"""
+        raise NotImplementedError
+
+
+class MemoryTaskStore(TaskStore):
+    """Tasks kept in the process' memory"""
+
+    def __init__(self, ttl: float = 86400.0, log_limit: int = 200):
+        super().__init__(ttl, log_limit)
+        self._tasks = {}
+        self._lock = threading.Lock()
+
+    def save(self, task):
+        with self._lock:
+            if task.task_id not in self._tasks:
+                self._evict_expired()
+            self._tasks[task.task_id] = task
+
+    def get(self, task_id):
+        return self._tasks.get(task_id)
+
+    def delete(self, task_id):
+        with self._lock:
+            self._tasks.pop(task_id, None)
+
+    def status_counts(self):
+        counts = {}
+        for task in list(self._tasks.values()):
+            counts[task.status] = counts.get(task.status, 0) + 1
+        return counts
+
+    def _evict_expired(self):
+        cutoff = time.time() - self.ttl
+        expired = [
+            task_id for task_id, task in self._tasks.items() if task.updated_at < cutoff
+        ]
+        for task_id in expired:
+            del self._tasks[task_id]
+
+
+class DatabaseTaskStore(TaskStore):
+    """
+    Tasks persisted in the Django database
+
+    Tasks are updated from the RAG service event loop, where Django does not
+    allow synchronous queries, and may log many times per second, so saves
+    only mark the task dirty and a writer thread persists the latest state of
+    each dirty task. Tasks running in this process are served from memory.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 86400.0,
+        log_limit: int = 200,
+        eviction_interval: float = 300.0,
+    ):
+        super().__init__(ttl, log_limit)
+        self.eviction_interval = eviction_interval
+        self._live = {}
+        """Task id -> task running in this process."""
+
+        self._dirty = {}
+        """Task id -> record to write, or None to delete the task."""
+
+        self._writing = {}
+        """Batch of dirty records the writer thread is writing."""
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._flushed = threading.Condition(self._lock)
+        self._writer = None
+        self._closed = False
+        atexit.register(self.close)
+
+    def save(self, task):
+        record = task.to_record()
+        with self._lock:
+            if task.finished:
+                self._live.pop(task.task_id, None)
+            else:
+                self._live[task.task_id] = task
+            self._dirty[task.task_id] = record
+            self._start_writer()
+        self._wakeup.set()
+
+    def get(self, task_id):
+        from .models import Task
+
+        task = self._live.get(task_id)
+        if task is not None:
+            return task
+        # Saves not written yet take precedence over the database
+        for pending in (self._dirty, self._writing):
+            if task_id in pending:
+                record = pending[task_id]
+                break
+        else:
+            record = (
+                Task.objects.filter(pk=task_id, updated_at__gte=time.time() - self.ttl)
+                .values()
+                .first()
+            )
+        if record is None:
+            return None
+        return ProcessingTask.from_record(record, log_limit=self.log_limit)
+
+    def delete(self, task_id):
+        with self._lock:
+            self._live.pop(task_id, None)
+            self._dirty[task_id] = None
+            self._start_writer()
+        self._wakeup.set()
+
+    def status_counts(self):
+        from django.db.models import Count
+        from .models import Task
+
+        rows = (
+            Task.objects.filter(updated_at__gte=time.time() - self.ttl)
+            .values("status")
+            .annotate(count=Count("task_id"))
+        )
+        return {row["status"]: row["count"] for row in rows}
+
+    def flush(self, timeout: float = 10.0):
+        """Wait until every pending save has been written"""
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            while (self._dirty or self._writing) and self._writer is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._flushed.wait(remaining):
+                    return
+
+    def close(self):
+        """Write pending saves and stop the writer thread"""
+        self.flush()
+        self._closed = True
+        self._wakeup.set()
+
+    def _start_writer(self):
+        # Called with the lock held; the writer starts with the first save
+        if self._writer is None and not self._closed:
+            self._writer = threading.Thread(
+                target=self._write_loop, name="task-store-writer", daemon=True
+            )
+            self._writer.start()
+
+    def _write_loop(self):
+        from django.db import close_old_connections
+
+        last_eviction = 0.0
+        while not self._closed:
+            self._wakeup.wait(self.eviction_interval)
+            self._wakeup.clear()
+            with self._lock:
+                batch = self._writing = self._dirty
+                self._dirty = {}
+            try:
+                if batch:
+                    self._write(batch)
+                if time.monotonic() - last_eviction >= self.eviction_interval:
+                    self._evict_expired()
+                    last_eviction = time.monotonic()
+            except Exception as e:
+                logger.error(f"Failed to persist {len(batch)} tasks: {e}")
+                close_old_connections()
+            with self._lock:
+                self._writing = {}
+                self._flushed.notify_all()
+
+    def _write(self, batch):
+        from django.db import transaction
+        from .models import Task
+
+        with transaction.atomic():
+            for task_id, record in batch.items():
+                if record is None:
+                    Task.objects.filter(pk=task_id).delete()
+                else:
+                    Task.objects.update_or_create(pk=task_id, defaults=record)
+
+    def _evict_expired(self):
+        from .models import Task
+
+        deleted, _ = Task.objects.filter(updated_at__lt=time.time() - self.ttl).delete()
+        if deleted:
+            logger.info(f"Evicted {deleted} expired tasks")
+
+
+def create_task_store() -> TaskStore:
+    """Create the task store selected by RAG_TASK_STORE (default: database)"""
+    backend = os.getenv("RAG_TASK_STORE", "database").strip().lower()
+    ttl = float(os.getenv("RAG_TASK_TTL", "86400"))
+    log_limit = int(os.getenv("RAG_TASK_LOG_LIMIT", "200"))
+    if backend == "memory":
+        return MemoryTaskStore(ttl=ttl, log_limit=log_limit)
+    if backend == "database":
+        return DatabaseTaskStore(ttl=ttl, log_limit=log_limit)
+    raise ValueError(
+        f"Unknown RAG_TASK_STORE {backend!r}, expected 'database' or 'memory'"
+    )
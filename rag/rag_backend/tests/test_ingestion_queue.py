@@ -0,0 +1,164 @@
+"""
+Tests for the bounded ingestion job queue
+"""
+
+import threading
+
+import pytest
+
+from rag_backend.ingestion_queue import (
+    IngestionQueue,
+    QueueClosed,
+    QueueFull,
+    file_content_hash,
+)
+
+
+class RecordingHandler:
+    """Job handler recording the jobs it ran; jobs named "block" wait for release()"""
+
+    def __init__(self):
+        self.ran = []
+        self.started = threading.Event()
+        self._release = threading.Event()
+
+    def __call__(self, name):
+        if name == "block":
+            self.started.set()
+            self._release.wait(10)
+        if name == "fail":
+            raise RuntimeError("job failed")
+        self.ran.append(name)
+
+    def release(self):
+        self._release.set()
+
+
+@pytest.fixture
+def handler():
+    handler = RecordingHandler()
+    yield handler
+    handler.release()
+
+
+def test_jobs_run_in_priority_order(handler):
+    queue = IngestionQueue(handler, workers=1)
+    queue.submit("job-0", ("block",))
+    assert handler.started.wait(5)
+
+    queue.submit("job-1", ("low",), priority="low")
+    queue.submit("job-2", ("normal",))
+    queue.submit("job-3", ("high",), priority="high")
+    queue.submit("job-4", ("normal-2",))
+    assert queue.pending == 4
+
+    handler.release()
+    queue.shutdown(timeout=5)
+    assert handler.ran == ["block", "high", "normal", "normal-2", "low"]
+
+
+def test_duplicate_submission_returns_active_job(handler):
+    queue = IngestionQueue(handler, workers=1)
+    assert queue.submit("job-1", ("block",), keys=("a.pdf", "hash-a")) == "job-1"
+    assert handler.started.wait(5)
+
+    # Running job, matched by path or by content hash
+    assert queue.submit("job-2", ("a",), keys=("a.pdf",)) == "job-1"
+    assert queue.submit("job-3", ("a",), keys=("copy.pdf", "hash-a")) == "job-1"
+    # Queued job
+    assert queue.submit("job-4", ("b",), keys=("b.pdf",)) == "job-4"
+    assert queue.submit("job-5", ("b",), keys=("b.pdf",)) == "job-4"
+    assert queue.pending == 1
+
+    handler.release()
+    queue.shutdown(timeout=5)
+    assert handler.ran == ["block", "b"]
+
+
+def test_finished_jobs_release_their_keys(handler):
+    queue = IngestionQueue(handler, workers=1)
+    queue.submit("job-1", ("fail",), keys=("a.pdf",))
+    queue.submit("job-2", ("b",), keys=("b.pdf",))
+    queue.shutdown(timeout=5)
+    # A failing job does not stop its worker
+    assert handler.ran == ["b"]
+    assert queue._active_keys == {}
+
+
+def test_full_queue_rejects_jobs(handler):
+    queue = IngestionQueue(handler, workers=1, max_size=2)
+    queue.submit("job-0", ("block",))
+    assert handler.started.wait(5)
+
+    # The running job does not count against max_size
+    queue.submit("job-1", ("a",), keys=("a.pdf",))
+    queue.submit("job-2", ("b",))
+    with pytest.raises(QueueFull):
+        queue.submit("job-3", ("c",))
+    # A duplicate is answered even when the queue is full
+    assert queue.submit("job-4", ("a",), keys=("a.pdf",)) == "job-1"
+
+    handler.release()
+    queue.shutdown(timeout=5)
+    assert handler.ran == ["block", "a", "b"]
+
+
+def test_unknown_priority_is_rejected(handler):
+    queue = IngestionQueue(handler)
+    with pytest.raises(ValueError):
+        queue.submit("job-1", ("a",), priority="urgent")
+    assert queue.pending == 0
+
+
+def test_shutdown_drains_queue_and_closes_it(handler):
+    queue = IngestionQueue(handler, workers=2)
+    for i in range(6):
+        queue.submit(f"job-{i}", (f"doc-{i}",))
+
+    queue.shutdown(timeout=5)
+
+    assert sorted(handler.ran) == [f"doc-{i}" for i in range(6)]
+    assert queue.pending == 0
+    with pytest.raises(QueueClosed):
+        queue.submit("job-6", ("doc-6",))
+
+
+def test_shutdown_without_jobs_starts_no_workers(handler):
+    queue = IngestionQueue(handler)
+    queue.shutdown(timeout=1)
+    assert queue._threads == []
+    with pytest.raises(QueueClosed):
+        queue.submit("job-1", ("a",))
+
+
+def test_file_content_hash_matches_for_identical_files(tmp_path):
+    first = tmp_path / "a.pdf"
+    copy = tmp_path / "copy.pdf"
+    other = tmp_path / "b.pdf"
+    first.write_bytes(b"%PDF-1.4 same content")
+    copy.write_bytes(b"%PDF-1.4 same content")
+    other.write_bytes(b"%PDF-1.4 other content")
+
+    assert file_content_hash(str(first), chunk_size=4) == file_content_hash(str(copy))
+    assert file_content_hash(str(first)) != file_content_hash(str(other))
+
+
+def test_precheck_answers_without_queueing(handler):
+    queue = IngestionQueue(handler, workers=1, max_size=1)
+    assert queue.precheck(keys=("a.pdf",)) is None
+    assert queue.pending == 0
+
+    queue.submit("job-0", ("block",), keys=("a.pdf",))
+    assert handler.started.wait(5)
+    queue.submit("job-1", ("b",))
+
+    assert queue.precheck(keys=("a.pdf",)) == "job-0"
+    with pytest.raises(QueueFull):
+        queue.precheck(keys=("c.pdf",))
+    with pytest.raises(ValueError):
+        queue.precheck(priority="urgent")
+
+    handler.release()
+    queue.shutdown(timeout=5)
+    with pytest.raises(QueueClosed):
+        queue.precheck()
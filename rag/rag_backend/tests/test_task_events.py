@@ -0,0 +1,140 @@
+"""
+Tests for the task event broker
+"""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+
+from rag_backend.task_events import TaskEventBroker
+
+
+class FakeRAG:
+    lightrag = object()
+
+
+class FakeService:
+    """RAGService stand-in running submitted coroutines on the test loop"""
+
+    def __init__(self):
+        self.started = False
+        self.watchers = []
+
+    def submit(self, coro_func, *args):
+        self.watchers.append(asyncio.ensure_future(coro_func(FakeRAG(), *args)))
+
+
+@pytest_asyncio.fixture
+async def pipeline_status():
+    shared_storage = pytest.importorskip("lightrag.kg.shared_storage")
+    shared_storage.set_default_workspace("")
+    shared_storage.initialize_share_data()
+    await shared_storage.initialize_pipeline_status()
+    status = await shared_storage.get_namespace_data("pipeline_status")
+    yield status
+    status["latest_message"] = ""
+
+
+def drain(queue):
+    events = []
+    while not queue.empty():
+        events.append(queue.get_nowait())
+    return events
+
+
+@pytest.mark.asyncio
+async def test_events_reach_only_the_task_subscribers():
+    broker = TaskEventBroker()
+    queue_a = broker.subscribe("task-a")
+    queue_b = broker.subscribe("task-b")
+
+    broker.publish("task-a", "progress", {"progress": 10})
+    await asyncio.sleep(0)
+
+    assert drain(queue_a) == [("progress", {"progress": 10})]
+    assert drain(queue_b) == []
+
+    broker.unsubscribe("task-a", queue_a)
+    broker.unsubscribe("task-b", queue_b)
+    assert not broker.has_subscribers
+
+
+def test_pipeline_owner_is_the_only_processing_task():
+    broker = TaskEventBroker()
+    assert broker.pipeline_owner is None
+
+    broker.publish("task-a", "status", {"status": "processing"})
+    assert broker.pipeline_owner == "task-a"
+    broker.publish("task-b", "status", {"status": "processing"})
+    assert broker.pipeline_owner is None
+    broker.publish("task-a", "status", {"status": "completed"})
+    assert broker.pipeline_owner == "task-b"
+    broker.publish("task-b", "status", {"status": "failed"})
+    assert broker.pipeline_owner is None
+
+
+@pytest.mark.asyncio
+async def test_pipeline_messages_go_to_the_task_processing_alone(pipeline_status):
+    broker = TaskEventBroker()
+    queue_a = broker.subscribe("task-a")
+    queue_b = broker.subscribe("task-b")
+    broker.publish("task-a", "status", {"status": "processing"})
+    broker.publish("task-b", "status", {"status": "processing"})
+    watcher = asyncio.create_task(broker._watch_pipeline_status(FakeRAG(), 0.01))
+
+    # Both tasks processing: the message could be either's
+    pipeline_status["latest_message"] = "Chunk 1 of 3 extracted"
+    await asyncio.sleep(0.1)
+    broker.publish("task-b", "status", {"status": "completed"})
+    await asyncio.sleep(0.1)
+    # task-a is processing alone now
+    pipeline_status["latest_message"] = "Chunk 2 of 3 extracted"
+    await asyncio.sleep(0.1)
+
+    broker.unsubscribe("task-a", queue_a)
+    broker.unsubscribe("task-b", queue_b)
+    await asyncio.wait_for(watcher, 1)
+
+    pipeline_events = [data for event, data in drain(queue_a) if event == "pipeline"]
+    assert [data["message"] for data in pipeline_events] == ["Chunk 2 of 3 extracted"]
+    assert all(event != "pipeline" for event, _ in drain(queue_b))
+
+
+@pytest.mark.asyncio
+async def test_watcher_starts_once_the_service_has_started(pipeline_status):
+    broker = TaskEventBroker()
+    service = FakeService()
+
+    # Nobody subscribed yet
+    service.started = True
+    broker.watch_pipeline_status(service, interval=0.01)
+    assert service.watchers == []
+
+    # The stream subscribes before the worker has started the service
+    service.started = False
+    queue = broker.subscribe("task-a")
+    broker.watch_pipeline_status(service, interval=0.01)
+    assert service.watchers == []
+
+    # The task starts processing on the started service
+    service.started = True
+    broker.publish("task-a", "status", {"status": "processing"})
+    broker.watch_pipeline_status(service, interval=0.01)
+    broker.watch_pipeline_status(service, interval=0.01)
+    assert len(service.watchers) == 1
+
+    await asyncio.sleep(0.1)
+    pipeline_status["latest_message"] = "Chunk 1 of 3 extracted"
+    await asyncio.sleep(0.1)
+    broker.unsubscribe("task-a", queue)
+    await asyncio.wait_for(service.watchers[0], 1)
+
+    assert ("pipeline", "Chunk 1 of 3 extracted") in [
+        (event, data.get("message")) for event, data in drain(queue)
+    ]
+    # The watcher stopped with the last subscriber, and a new one can start
+    broker.subscribe("task-b")
+    broker.watch_pipeline_status(service, interval=0.01)
+    assert len(service.watchers) == 2
+    service.watchers[1].cancel()
@@ -0,0 +1,194 @@
+"""
+Tests for the ingestion task stores
+"""
+
+import time
+
+import pytest
+
+from rag_backend.task_store import (
+    DatabaseTaskStore,
+    MemoryTaskStore,
+    ProcessingTask,
+    TaskStatus,
+)
+
+
+@pytest.fixture(scope="module")
+def database(tmp_path_factory):
+    """Migrate a throwaway SQLite database instead of the project's"""
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.db import connections
+
+    connections["default"].close()
+    original_name = settings.DATABASES["default"]["NAME"]
+    settings.DATABASES["default"]["NAME"] = str(
+        tmp_path_factory.mktemp("db") / "tasks.sqlite3"
+    )
+    call_command("migrate", verbosity=0)
+    yield
+    connections["default"].close()
+    settings.DATABASES["default"]["NAME"] = original_name
+
+
+@pytest.fixture
+def db_store(database):
+    from rag_backend.models import Task
+
+    store = DatabaseTaskStore(ttl=60, log_limit=3)
+    yield store
+    store.close()
+    Task.objects.all().delete()
+
+
+def age(task, seconds):
+    """Pretend the task was last updated `seconds` ago"""
+    task.updated_at = time.time() - seconds
+
+
+# ProcessingTask
+
+
+def test_logs_keep_only_the_latest_entries():
+    task = ProcessingTask("task-1", "a.pdf", log_limit=3)
+    for i in range(5):
+        task.add_log(f"step {i}")
+
+    assert task.log_count == 5
+    assert [entry.split("] ", 1)[1] for entry in task.logs] == [
+        "step 2",
+        "step 3",
+        "step 4",
+    ]
+
+
+def test_record_round_trip():
+    task = ProcessingTask("task-1", "a.pdf", log_limit=3)
+    task.status = TaskStatus.PROCESSING
+    for i in range(4):
+        task.add_log(f"step {i}")
+    task.update_progress(40)
+    task.fail("parser crashed")
+
+    record = task.to_record()
+    restored = ProcessingTask.from_record(record, log_limit=3)
+
+    assert restored.to_record() == record
+    assert restored.status == TaskStatus.FAILED
+    assert restored.finished
+    assert restored.log_count == 5
+    assert len(restored.logs) == 3
+    # Snapshots are read-only and publish no events
+    assert restored.store is None
+
+
+def test_record_round_trip_with_trace():
+    from raganything import tracing
+
+    task = ProcessingTask("task-1", "a.pdf")
+    with tracing.ingestion_trace("a.pdf", task_id="task-1") as trace:
+        with tracing.trace_span("parse_document", cached=False):
+            pass
+    task.trace = trace
+    task.complete({"file_path": "a.pdf"})
+
+    restored = ProcessingTask.from_record(task.to_record())
+
+    exported = trace.to_dict()
+    restored_export = restored.trace.to_dict()
+    # Span durations are exported rounded, which can shift the rounded total
+    assert restored_export.pop("duration") == pytest.approx(
+        exported.pop("duration"), abs=2e-6
+    )
+    assert restored_export == exported
+    assert restored.stages == task.stages
+    assert "parse_document" in restored.stages
+
+
+# MemoryTaskStore
+
+
+def test_memory_store_evicts_expired_tasks():
+    store = MemoryTaskStore(ttl=60)
+    old = store.create("task-1", "a.pdf")
+    fresh = store.create("task-2", "b.pdf")
+    age(old, 120)
+
+    # Expired tasks are dropped when a new task is stored
+    assert store.get("task-1") is old
+    store.create("task-3", "c.pdf")
+
+    assert store.get("task-1") is None
+    assert store.get("task-2") is fresh
+    assert store.status_counts() == {TaskStatus.PENDING: 2}
+
+
+def test_memory_store_updates_keep_tasks_alive():
+    store = MemoryTaskStore(ttl=60)
+    task = store.create("task-1", "a.pdf")
+    age(task, 120)
+    task.add_log("still running")
+
+    store.create("task-2", "b.pdf")
+    assert store.get("task-1") is task
+
+
+# DatabaseTaskStore
+
+
+def test_database_store_serves_running_tasks_from_memory(db_store):
+    task = db_store.create("task-1", "a.pdf")
+    task.status = TaskStatus.PROCESSING
+    task.add_log("parsing")
+
+    assert db_store.get("task-1") is task
+
+
+def test_database_store_persists_finished_tasks(db_store):
+    from rag_backend.models import Task
+
+    task = db_store.create("task-1", "a.pdf")
+    task.status = TaskStatus.PROCESSING
+    for i in range(5):
+        task.add_log(f"step {i}")
+    task.complete({"file_path": "a.pdf"})
+    db_store.flush()
+
+    row = Task.objects.get(pk="task-1")
+    assert row.status == TaskStatus.COMPLETED
+    assert row.log_count == 6
+    assert len(row.logs) == 3
+
+    snapshot = db_store.get("task-1")
+    assert snapshot is not task
+    assert snapshot.to_record() == task.to_record()
+    assert db_store.status_counts() == {TaskStatus.COMPLETED: 1}
+
+
+def test_database_store_hides_and_evicts_expired_tasks(db_store):
+    from rag_backend.models import Task
+
+    task = db_store.create("task-1", "a.pdf")
+    task.complete()
+    db_store.create("task-2", "b.pdf").complete()
+    db_store.flush()
+    Task.objects.filter(pk="task-1").update(updated_at=time.time() - 120)
+
+    assert db_store.get("task-1") is None
+    assert db_store.status_counts() == {TaskStatus.COMPLETED: 1}
+
+    db_store._evict_expired()
+    assert list(Task.objects.values_list("task_id", flat=True)) == ["task-2"]
+
+
+def test_database_store_delete(db_store):
+    from rag_backend.models import Task
+
+    db_store.create("task-1", "a.pdf").complete()
+    db_store.flush()
+    db_store.delete("task-1")
+
+    assert db_store.get("task-1") is None
+    db_store.flush()
+    assert not Task.objects.filter(pk="task-1").exists()
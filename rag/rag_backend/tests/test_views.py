@@ -0,0 +1,116 @@
+"""
+Tests for the document submission view
+"""
+
+import asyncio
+import json
+
+import pytest
+from django.test import AsyncRequestFactory
+
+from rag_backend import views
+from rag_backend.ingestion_queue import IngestionQueue
+from rag_backend.task_store import MemoryTaskStore
+from rag_backend.tests.test_ingestion_queue import RecordingHandler
+
+
+@pytest.fixture
+def handler():
+    handler = RecordingHandler()
+    yield handler
+    handler.release()
+
+
+@pytest.fixture
+def queue(monkeypatch, handler):
+    queue = IngestionQueue(
+        lambda task_id, *args: handler(task_id), workers=1, max_size=1
+    )
+    monkeypatch.setattr(views, "INGESTION_QUEUE", queue)
+    monkeypatch.setattr(views, "TASK_STORE", MemoryTaskStore())
+    yield queue
+    handler.release()
+    queue.shutdown(timeout=5)
+
+
+@pytest.fixture
+def hashed(monkeypatch):
+    """Paths of the files the view hashed"""
+    hashed = []
+
+    def file_content_hash(file_path):
+        hashed.append(file_path)
+        return f"hash-of-{file_path}"
+
+    monkeypatch.setattr(views, "file_content_hash", file_content_hash)
+    return hashed
+
+
+def submit(file_path, **data):
+    request = AsyncRequestFactory().post(
+        "/process_document/", {"file_path": str(file_path), **data}
+    )
+    response = asyncio.run(views.process_document(request))
+    return response.status_code, json.loads(response.content)
+
+
+@pytest.fixture
+def files(tmp_path):
+    paths = []
+    for name in ("a.pdf", "b.pdf", "c.pdf"):
+        path = tmp_path / name
+        path.write_bytes(name.encode())
+        paths.append(path)
+    return paths
+
+
+def test_duplicate_path_is_answered_without_hashing(queue, handler, hashed, files):
+    queue.submit("busy", ("block",))
+    assert handler.started.wait(5)
+
+    status, first = submit(files[0])
+    assert status == 200
+    assert hashed == [str(files[0])]
+
+    status, duplicate = submit(files[0])
+    assert status == 200
+    assert duplicate["task_id"] == first["task_id"]
+    assert hashed == [str(files[0])]
+
+
+def test_full_queue_is_answered_without_hashing(queue, handler, hashed, files):
+    # Keep the only worker busy so the next job waits in the queue
+    queue.submit("busy", ("block",))
+    assert handler.started.wait(5)
+    assert submit(files[0])[0] == 200
+    hashed.clear()
+
+    status, body = submit(files[1])
+
+    assert status == 429
+    assert "full" in body["error"]
+    assert hashed == []
+    assert views.TASK_STORE.status_counts() == {"pending": 1}
+
+
+def test_duplicate_content_is_matched_by_hash(
+    queue, handler, hashed, files, monkeypatch
+):
+    monkeypatch.setattr(views, "file_content_hash", lambda file_path: "same-content")
+    # The content is only hashed when the queue has room
+    queue.max_size = 2
+    queue.submit("busy", ("block",))
+    assert handler.started.wait(5)
+
+    status, first = submit(files[0])
+    status, copy = submit(files[1])
+
+    assert status == 200
+    assert copy["task_id"] == first["task_id"]
+    assert views.TASK_STORE.status_counts() == {"pending": 1}
+
+
+def test_unknown_priority_is_rejected(queue, hashed, files):
+    status, body = submit(files[0], priority="urgent")
+    assert status == 400
+    assert hashed == []
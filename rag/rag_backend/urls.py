@@ -6,6 +6,10 @@ app_name = 'rag_backend'
 urlpatterns = [
     path('process_document/', views.process_document, name='process_document'),
     path('task_status/<str:task_id>/', views.task_status, name='task_status'),
+    path('task_trace/<str:task_id>/', views.task_trace, name='task_trace'),
+    path('task_events/<str:task_id>/', views.task_events, name='task_events'),
     path('query_document/', views.query_document, name='query_document'),
+    path('query_stream/', views.query_stream, name='query_stream'),
     path('clear_cache/', views.clear_cache, name='clear_cache'),
+    path('metrics/', views.metrics, name='metrics'),
 ]
\ No newline at end of file
@@ -4,30 +4,30 @@ from django.views.decorators.csrf import csrf_exempt
 import os
 from dotenv import load_dotenv
 import asyncio
-import threading
+import json
 import time
 import uuid
 import logging
-from raganything import RAGAnything, RAGAnythingConfig
-from lightrag.llm.openai import openai_complete_if_cache, openai_embed
-from lightrag.utils import EmbeddingFunc
 
 # Load environment variables
 load_dotenv()
 API_KEY = os.getenv("OPENAI_API_KEY")
 BASE_URL = "https://api.openai.com/v1"
 
-# RAGAnything config (can be customized)
-config = RAGAnythingConfig(
-	working_dir="./rag_storage",
-	parser="mineru",
-	parse_method="auto",
-	enable_image_processing=True,
-	enable_table_processing=True,
-	enable_equation_processing=True,
-)
+from .ingestion_queue import IngestionQueue, QueueClosed, QueueFull, file_content_hash
+from .service import RAGService
+from .task_events import TASK_EVENTS
+from .task_store import TaskStatus, create_task_store
+
+# Seconds between task store polls of an event stream with nothing pushed;
+# also keeps idle connections alive through proxies
+TASK_EVENTS_POLL_INTERVAL = float(os.getenv("RAG_TASK_EVENTS_POLL", "2"))
 
 def llm_model_func(prompt, system_prompt=None, history_messages=[], **kwargs):
+	from lightrag.llm.openai import openai_complete_if_cache
+	from raganything.metrics import TokenUsageMetrics
+
+	kwargs.setdefault("token_tracker", TokenUsageMetrics("llm"))
 	return openai_complete_if_cache(
 		"gpt-4o-mini",
 		prompt,
@@ -39,6 +39,11 @@ def llm_model_func(prompt, system_prompt=None, history_messages=[], **kwargs):
 	)
 
 def vision_model_func(prompt, system_prompt=None, history_messages=[], image_data=None, messages=None, **kwargs):
+	from lightrag.llm.openai import openai_complete_if_cache
+	from raganything.metrics import TokenUsageMetrics
+
+	if messages or image_data:
+		kwargs.setdefault("token_tracker", TokenUsageMetrics("vlm"))
 	if messages:
 		return openai_complete_if_cache(
 			"gpt-4o",
@@ -73,87 +78,68 @@ def vision_model_func(prompt, system_prompt=None, history_messages=[], image_dat
 	else:
 		return llm_model_func(prompt, system_prompt, history_messages, **kwargs)
 
-embedding_func = EmbeddingFunc(
-	embedding_dim=3072,
-	max_token_size=8192,
-	func=lambda texts: openai_embed(
-		texts,
-		model="text-embedding-3-large",
-		api_key=API_KEY,
-		base_url=BASE_URL,
-	),
-)
+def build_rag():
+	"""Build the RAGAnything instance served by RAG_SERVICE"""
+	from raganything import RAGAnything, RAGAnythingConfig
+	from lightrag.llm.openai import openai_embed
+	from lightrag.utils import EmbeddingFunc
 
-rag = RAGAnything(
-	config=config,
-	llm_model_func=llm_model_func,
-	vision_model_func=vision_model_func,
-	embedding_func=embedding_func,
-)
+	# RAGAnything config (can be customized)
+	config = RAGAnythingConfig(
+		working_dir="./rag_storage",
+		parser="mineru",
+		parse_method="auto",
+		enable_image_processing=True,
+		enable_table_processing=True,
+		enable_equation_processing=True,
+	)
 
-# Global task storage for tracking background jobs
-TASK_STORAGE = {}
-
-class TaskStatus:
-	PENDING = "pending"
-	PROCESSING = "processing" 
-	COMPLETED = "completed"
-	FAILED = "failed"
-
-class ProcessingTask:
-	def __init__(self, task_id, file_path):
-		self.task_id = task_id
-		self.file_path = file_path
-		self.status = TaskStatus.PENDING
-		self.progress = 0
-		self.logs = []
-		self.result = None
-		self.error = None
-		self.start_time = time.time()
-		self.end_time = None
-		
-	def add_log(self, message):
-		timestamp = time.strftime("%H:%M:%S")
-		log_entry = f"[{timestamp}] {message}"
-		self.logs.append(log_entry)
-		print(log_entry)  # Also print to console
-		
-	def update_progress(self, progress, message=None):
-		self.progress = progress
-		if message:
-			self.add_log(f"Progress: {progress}% - {message}")
-			
-	def complete(self, result=None):
-		self.status = TaskStatus.COMPLETED
-		self.progress = 100
-		self.result = result
-		self.end_time = time.time()
-		self.add_log("Processing completed successfully!")
-		
-	def fail(self, error):
-		self.status = TaskStatus.FAILED
-		self.error = str(error)
-		self.end_time = time.time()
-		self.add_log(f"Processing failed: {error}")
-		
-	def get_duration(self):
-		"""Get processing duration, handling None end_time"""
-		if self.end_time is None:
-			return time.time() - self.start_time
-		return self.end_time - self.start_time
+	embedding_func = EmbeddingFunc(
+		embedding_dim=3072,
+		max_token_size=8192,
+		func=lambda texts: openai_embed(
+			texts,
+			model="text-embedding-3-large",
+			api_key=API_KEY,
+			base_url=BASE_URL,
+		),
+	)
+
+	return RAGAnything(
+		config=config,
+		llm_model_func=llm_model_func,
+		vision_model_func=vision_model_func,
+		embedding_func=embedding_func,
+	)
+
+# RAGAnything and LightRAG are imported when the RAG instance is first needed,
+# so Django workers and management commands start without loading them. All
+# RAG coroutines run on the service's long-lived event loop, shared by every
+# request and background task
+RAG_SERVICE = RAGService(build_rag)
+
+def get_rag():
+	"""Return the shared RAGAnything instance, building it on first use"""
+	return RAG_SERVICE.rag
+
+# Task store for tracking background jobs, selected by RAG_TASK_STORE;
+# created before the ingestion queue so it is flushed after the queue drains
+TASK_STORE = create_task_store()
 
 def process_document_async(task_id, file_path, output_dir, parse_method):
 	"""Background processing function"""
-	task = TASK_STORAGE[task_id]
+	from raganything.tracing import ingestion_trace
+
+	task = TASK_STORE.get(task_id)
 	try:
 		task.status = TaskStatus.PROCESSING
 		task.add_log(f"Starting document processing: {os.path.basename(file_path)}")
 		task.update_progress(5, "Initializing RAG pipeline...")
 		
-		# Capture stdout to detect cached vs new processing
-		original_logs_count = len(task.logs)
-		
-		async def run_processing():
+		async def run_processing(rag):
+			# A stream opened right after the upload subscribed before the service
+			# had started and could not start the pipeline_status watcher then
+			TASK_EVENTS.watch_pipeline_status(RAG_SERVICE)
 			task.update_progress(10, "Processing document with RAGAnything...")
 			task.add_log("Checking if document is already processed...")
 			
@@ -164,11 +150,26 @@ def process_document_async(task_id, file_path, output_dir, parse_method):
 			)
 			task.update_progress(95, "Finalizing processing...")
 			
-		# Run the async processing
-		asyncio.run(run_processing())
+		# Run the processing on the shared loop, collecting its timing spans on the task
+		with ingestion_trace(file_path, task_id=task_id) as trace:
+			task.trace = trace
+			trace.listeners.append(
+				lambda phase, span: task.emit("stage", {
+					"phase": phase,
+					"name": span.name,
+					"duration": round(span.duration, 6) if phase == "end" else None,
+					"error": span.error,
+					# Parser progress, e.g. MinerU's {stage, current, total, percent}
+					"progress": span.attributes.get("progress") if phase == "progress" else None,
+				})
+			)
+			RAG_SERVICE.run(run_processing)
 		
-		# Determine if this was cached or new processing
-		was_cached = any("already exists" in log or "cached" in log.lower() for log in task.logs[original_logs_count:])
+		# Determine if this was cached or new processing from the parse span
+		was_cached = any(
+			span.name == "parse_document" and span.attributes.get("cached")
+			for span in trace.spans
+		)
 		processing_type = "Cached document - used existing results" if was_cached else "New document - full processing completed"
 		
 		task.add_log(f"Processing type: {processing_type}")
@@ -184,12 +185,49 @@ def process_document_async(task_id, file_path, output_dir, parse_method):
 	except Exception as e:
 		task.fail(e)
 
+# Documents are ingested by a fixed worker pool rather than a thread per request;
+# created after RAG_SERVICE so the queue drains before the service stops at exit
+INGESTION_QUEUE = IngestionQueue(
+	process_document_async,
+	workers=int(os.getenv("INGESTION_WORKERS", "2")),
+	max_size=int(os.getenv("INGESTION_QUEUE_SIZE", "32")),
+)
+
+def _queue_rejection(error):
+	"""Response for a job the ingestion queue did not accept"""
+	if isinstance(error, QueueFull):
+		response = JsonResponse({"error": str(error)}, status=429)
+		response["Retry-After"] = "30"
+		return response
+	if isinstance(error, QueueClosed):
+		return JsonResponse({"error": str(error)}, status=503)
+	return JsonResponse({"error": str(error)}, status=400)
+
+async def _duplicate_response(queued_id):
+	from asgiref.sync import sync_to_async
+
+	queued = await sync_to_async(TASK_STORE.get)(queued_id)
+	return JsonResponse({
+		"task_id": queued_id,
+		"status": queued.status if queued else TaskStatus.PENDING,
+		"message": "Identical document is already queued or processing"
+	})
+
 @csrf_exempt
-def process_document(request):
+async def process_document(request):
+	"""Queue a document for ingestion
+
+	Duplicates by path and a full queue are answered before the file is read.
+	The file is then hashed in a thread of its own, so large uploads do not hold
+	up the sync views sharing the server's sync thread.
+	"""
+	from asgiref.sync import sync_to_async
+
 	if request.method == "POST":
 		file_path = request.POST.get("file_path")
 		output_dir = request.POST.get("output_dir", "./output")
 		parse_method = request.POST.get("parse_method", "auto")
+		priority = request.POST.get("priority", "normal")
 		
 		if not file_path:
 			return JsonResponse({"error": "file_path is required"}, status=400)
@@ -197,25 +235,42 @@ def process_document(request):
 		if not os.path.exists(file_path):
 			return JsonResponse({"error": f"File not found: {file_path}"}, status=400)
 		
+		# Identical submissions are deduplicated by path and by content
+		path_key = f"path:{os.path.realpath(file_path)}"
+		try:
+			queued_id = INGESTION_QUEUE.precheck(keys=(path_key,), priority=priority)
+		except (ValueError, QueueFull, QueueClosed) as e:
+			return _queue_rejection(e)
+		if queued_id is not None:
+			return await _duplicate_response(queued_id)
+		
+		content_hash = await sync_to_async(file_content_hash, thread_sensitive=False)(file_path)
+		
 		# Generate unique task ID
 		task_id = str(uuid.uuid4())
 		
-		# Create and store task
-		task = ProcessingTask(task_id, file_path)
-		TASK_STORAGE[task_id] = task
+		# Create and store task before queueing it, a worker may pick it up at once
+		task = TASK_STORE.create(task_id, file_path)
+		try:
+			queued_id = INGESTION_QUEUE.submit(
+				task_id,
+				(task_id, file_path, output_dir, parse_method),
+				keys=(path_key, f"sha256:{content_hash}"),
+				priority=priority,
+			)
+		except (ValueError, QueueFull, QueueClosed) as e:
+			TASK_STORE.delete(task_id)
+			return _queue_rejection(e)
 		
-		# Start background processing
-		thread = threading.Thread(
-			target=process_document_async,
-			args=(task_id, file_path, output_dir, parse_method)
-		)
-		thread.daemon = True
-		thread.start()
+		if queued_id != task_id:
+			TASK_STORE.delete(task_id)
+			return await _duplicate_response(queued_id)
 		
+		task.add_log(f"Queued with {priority} priority ({INGESTION_QUEUE.pending} jobs waiting)")
 		return JsonResponse({
 			"task_id": task_id,
-			"status": "processing",
-			"message": "Document processing started in background"
+			"status": TaskStatus.PENDING,
+			"message": "Document queued for processing"
 		})
 		
 	return JsonResponse({"error": "POST required"}, status=405)
@@ -224,7 +279,7 @@ def process_document(request):
 def task_status(request, task_id):
 	"""Get status and logs for a processing task"""
 	if request.method == "GET":
-		task = TASK_STORAGE.get(task_id)
+		task = TASK_STORE.get(task_id)
 		if not task:
 			return JsonResponse({"error": "Task not found"}, status=404)
 			
@@ -232,7 +287,7 @@ def task_status(request, task_id):
 			"task_id": task_id,
 			"status": task.status,
 			"progress": task.progress,
-			"logs": task.logs[-50:],  # Return last 50 log entries
+			"logs": list(task.logs)[-50:],  # Return last 50 log entries
 			"file_path": os.path.basename(task.file_path),
 			"start_time": task.start_time,
 		}
@@ -249,10 +304,146 @@ def task_status(request, task_id):
 		if task.error:
 			response_data["error"] = task.error
 			
+		if task.stages:
+			response_data["stages"] = task.stages
+			
 		return JsonResponse(response_data)
 		
 	return JsonResponse({"error": "GET required"}, status=405)
 
+def _sse(event, data, event_id=None):
+	"""Format one server-sent event"""
+	lines = f"id: {event_id}\n" if event_id is not None else ""
+	return f"{lines}event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+async def _task_event_stream(task_id):
+	"""Yield a task's events as server-sent events until it finishes
+
+	Events of tasks running in this process are pushed as they happen. Tasks
+	running in another worker process are followed by polling the task store
+	and sending what changed.
+	"""
+	from asgiref.sync import sync_to_async
+
+	# Subscribe before taking the snapshot so no event falls in between
+	queue = TASK_EVENTS.subscribe(task_id)
+	TASK_EVENTS.watch_pipeline_status(RAG_SERVICE)
+	event_ids = iter(range(1 << 62))
+	try:
+		task = await sync_to_async(TASK_STORE.get)(task_id)
+		if task is None:
+			yield _sse("end", {"error": "Task not found"}, next(event_ids))
+			return
+		snapshot = task.summary()
+		snapshot.update(
+			task_id=task_id,
+			file_path=os.path.basename(task.file_path),
+			logs=list(task.logs)[-50:],
+		)
+		yield _sse("snapshot", snapshot, next(event_ids))
+		if task.finished:
+			yield _sse("end", task.summary(), next(event_ids))
+			return
+
+		log_count, progress, status = task.log_count, task.progress, task.status
+		while True:
+			try:
+				event, data = await asyncio.wait_for(queue.get(), TASK_EVENTS_POLL_INTERVAL)
+			except asyncio.TimeoutError:
+				event, data = None, None
+
+			if event == "log":
+				if data["index"] < log_count:
+					continue
+				log_count = data["index"] + 1
+			elif event == "progress":
+				progress = data["progress"]
+			elif event == "status":
+				status = data["status"]
+			if event is not None:
+				yield _sse(event, data, next(event_ids))
+				if event == "end":
+					return
+				continue
+
+			# Nothing pushed: catch up from the store in case the task runs elsewhere
+			task = await sync_to_async(TASK_STORE.get)(task_id)
+			if task is None:
+				yield _sse("end", {"error": "Task expired"}, next(event_ids))
+				return
+			new_logs = min(task.log_count - log_count, len(task.logs))
+			for offset, message in enumerate(list(task.logs)[len(task.logs) - new_logs:]):
+				index = task.log_count - new_logs + offset
+				yield _sse("log", {"index": index, "message": message}, next(event_ids))
+			log_count = max(log_count, task.log_count)
+			if task.progress != progress:
+				progress = task.progress
+				yield _sse("progress", {"progress": progress}, next(event_ids))
+			if task.status != status:
+				status = task.status
+				yield _sse("status", {"status": status}, next(event_ids))
+			if task.finished:
+				yield _sse("end", task.summary(), next(event_ids))
+				return
+			if new_logs <= 0:
+				yield ": keep-alive\n\n"
+	finally:
+		TASK_EVENTS.unsubscribe(task_id, queue)
+
+async def task_events(request, task_id):
+	"""Stream a task's progress, status, log lines and stage transitions as server-sent events
+
+	Needs the ASGI server; under WSGI Django buffers async streams until they end.
+	"""
+	from asgiref.sync import sync_to_async
+	from django.http import StreamingHttpResponse
+
+	if request.method == "GET":
+		if await sync_to_async(TASK_STORE.get)(task_id) is None:
+			return JsonResponse({"error": "Task not found"}, status=404)
+		response = StreamingHttpResponse(_task_event_stream(task_id), content_type="text/event-stream")
+		response["Cache-Control"] = "no-cache"
+		response["X-Accel-Buffering"] = "no"
+		return response
+		
+	return JsonResponse({"error": "GET required"}, status=405)
+
+@csrf_exempt
+def task_trace(request, task_id):
+	"""Get the ingestion timing trace of a task as JSON or OpenTelemetry span records"""
+	if request.method == "GET":
+		task = TASK_STORE.get(task_id)
+		if not task:
+			return JsonResponse({"error": "Task not found"}, status=404)
+		if not task.trace:
+			return JsonResponse({"error": "No trace recorded for this task"}, status=404)
+			
+		if request.GET.get("format") == "otel":
+			return JsonResponse({"spans": task.trace.to_otel()})
+		return JsonResponse(task.trace.to_dict())
+		
+	return JsonResponse({"error": "GET required"}, status=405)
+
+def metrics(request):
+	"""Expose task queue, RAG pipeline and cache metrics in the Prometheus text format"""
+	from django.http import HttpResponse
+	from raganything.metrics import REGISTRY, render_gauges
+
+	status_counts = {
+		status: 0
+		for status in (TaskStatus.PENDING, TaskStatus.PROCESSING, TaskStatus.COMPLETED, TaskStatus.FAILED)
+	}
+	status_counts.update(TASK_STORE.status_counts())
+
+	text = render_gauges(
+		"rag_backend_tasks",
+		"Document processing tasks by status; pending plus processing is the queue depth.",
+		[({"status": status}, count) for status, count in status_counts.items()],
+	)
+	# Do not build the RAG instance just to be scraped
+	text += RAG_SERVICE.rag.render_metrics() if RAG_SERVICE.started else REGISTRY.render()
+	return HttpResponse(text, content_type="text/plain; version=0.0.4; charset=utf-8")
+
 @csrf_exempt
 def clear_cache(request):
 	"""Clear RAG processing cache to force fresh processing"""
@@ -280,14 +471,15 @@ def clear_cache(request):
 	return JsonResponse({"error": "POST required"}, status=405)
 
 @csrf_exempt
-def query_document(request):
+async def query_document(request):
+	"""Answer a query on the shared RAG loop; concurrent queries are multiplexed there"""
 	if request.method == "POST":
 		query = request.POST.get("query")
 		mode = request.POST.get("mode", "hybrid")
 		multimodal_content = request.POST.get("multimodal_content")
 		if not query:
 			return JsonResponse({"error": "query is required"}, status=400)
-		async def run():
+		async def run(rag):
 			if multimodal_content:
 				import json
 				try:
@@ -298,6 +490,53 @@ def query_document(request):
 			else:
 				result = await rag.aquery(query, mode=mode)
 			return {"result": result}
-		response = asyncio.run(run())
+		response = await RAG_SERVICE.arun(run)
 		return JsonResponse(response)
 	return JsonResponse({"error": "POST required"}, status=405)
+
+@csrf_exempt
+async def query_stream(request):
+	"""Stream the answer to a query as server-sent events while the model generates it
+
+	Sends "chunk" events with the answer text, then "end" with the time to the
+	first chunk, or "error". Needs the ASGI server; under WSGI Django buffers
+	the stream until it ends.
+	"""
+	from django.http import StreamingHttpResponse
+
+	if request.method == "POST":
+		query = request.POST.get("query")
+		mode = request.POST.get("mode", "hybrid")
+		multimodal_content = request.POST.get("multimodal_content")
+		if not query:
+			return JsonResponse({"error": "query is required"}, status=400)
+		mm_content = None
+		if multimodal_content:
+			try:
+				mm_content = json.loads(multimodal_content)
+			except Exception:
+				mm_content = []
+
+		async def events():
+			started = time.perf_counter()
+			first_chunk_seconds = None
+			try:
+				async for chunk in RAG_SERVICE.astream(
+					lambda rag: rag.aquery_stream(query, mode=mode, multimodal_content=mm_content)
+				):
+					if first_chunk_seconds is None:
+						first_chunk_seconds = time.perf_counter() - started
+					yield _sse("chunk", {"text": chunk})
+			except Exception as e:
+				yield _sse("error", {"error": str(e)})
+				return
+			yield _sse("end", {
+				"first_chunk_seconds": first_chunk_seconds,
+				"total_seconds": time.perf_counter() - started,
+			})
+
+		response = StreamingHttpResponse(events(), content_type="text/event-stream")
+		response["Cache-Control"] = "no-cache"
+		response["X-Accel-Buffering"] = "no"
+		return response
+	return JsonResponse({"error": "POST required"}, status=405)
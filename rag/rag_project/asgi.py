@@ -2,6 +2,8 @@
 ASGI config for rag_project project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it with an ASGI server, e.g. ``uvicorn rag_project.asgi:application``, so
+the async query view runs without a thread per request.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -85,7 +85,8 @@ def process_file(request):
         
         try:
             resp = requests.post(backend_url, data=payload)
-            return JsonResponse(resp.json())
+            # Keep the backend's status, e.g. 429 when the ingestion queue is full
+            return JsonResponse(resp.json(), status=resp.status_code)
         except Exception as e:
             return JsonResponse({'error': str(e)}, status=500)
     